@@ -0,0 +1,76 @@
+"""
+Compares fetching candles with db.fetch_candles() (a binary COPY) to the
+peewee SELECT it replaced, on the Postgres database of the project's config.
+Run it from the root of a Jesse project while Postgres is running:
+
+    python benchmarks/fetch_candles.py [days] [repeats]
+
+The candles are stored under a throwaway exchange name and deleted at the end.
+"""
+import sys
+import time
+
+import numpy as np
+
+from jesse.models import Candle, CandleCoverage
+from jesse.services import db
+
+EXCHANGE = 'Benchmark COPY'
+SYMBOL = 'BTC-USDT'
+
+
+def generate_candles(count: int) -> np.ndarray:
+    rng = np.random.default_rng(1)
+    closes = 100 + rng.normal(0, 0.1, count).cumsum()
+    opens = np.concatenate(([100], closes[:-1]))
+    return np.column_stack((
+        1_600_000_000_000 + np.arange(count) * 60_000, opens, closes,
+        np.maximum(opens, closes) + rng.random(count), np.minimum(opens, closes) - rng.random(count),
+        rng.random(count) * 100
+    ))
+
+
+def select_candles(start: int, finish: int) -> np.ndarray:
+    # the way candles were fetched before fetch_candles()
+    return np.array(tuple(Candle.select(
+        Candle.timestamp, Candle.open, Candle.close, Candle.high, Candle.low, Candle.volume
+    ).where(
+        Candle.timestamp.between(start, finish),
+        Candle.exchange == EXCHANGE,
+        Candle.symbol == SYMBOL
+    ).order_by(Candle.timestamp.asc()).tuples()))
+
+
+def best_of(repeats: int, func, *args) -> tuple:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def run(days: int, repeats: int) -> None:
+    candles = generate_candles(days * 1440)
+    start, finish = int(candles[0][0]), int(candles[-1][0])
+
+    db.copy_candles(EXCHANGE, SYMBOL, candles)
+    try:
+        select_time, selected = best_of(repeats, select_candles, start, finish)
+        copy_time, copied = best_of(repeats, db.fetch_candles, EXCHANGE, SYMBOL, start, finish)
+    finally:
+        Candle.delete().where(Candle.exchange == EXCHANGE).execute()
+        CandleCoverage.delete().where(CandleCoverage.exchange == EXCHANGE).execute()
+
+    np.testing.assert_equal(copied, selected)
+
+    print(f'{len(candles)} candles ({days} days), best of {repeats}:')
+    print(f'SELECT: {select_time:.3f}s')
+    print(f'COPY:   {copy_time:.3f}s ({select_time / copy_time:.1f}x faster)')
+
+
+if __name__ == '__main__':
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 365,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    )
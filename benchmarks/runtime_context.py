@@ -0,0 +1,48 @@
+"""
+Times the helper calls that the backtest simulator makes for each candle,
+reading the config (as before) and inside jh.frozen_runtime_context():
+
+    python benchmarks/runtime_context.py [candles]
+
+No database is needed: the app runs the way it does in unit tests, where
+get_config() doesn't cache either.
+"""
+import sys
+import timeit
+
+from jesse.config import config
+
+# must be set before the store is imported, so it doesn't connect to the database
+config['app']['is_unit_testing'] = True
+config['app']['trading_mode'] = 'backtest'
+
+import jesse.helpers as jh
+from jesse.store import store
+
+
+def per_candle_calls() -> None:
+    jh.is_collecting_data()
+    jh.now_to_timestamp()
+    jh.now_to_timestamp()
+    jh.is_debugging()
+    jh.is_live()
+    jh.is_live()
+    jh.is_paper_trading()
+    jh.is_debuggable('order_submission')
+    jh.is_backtesting()
+    jh.should_execute_silently()
+    jh.get_config('env.logging.max_logs', 1000)
+
+
+def run(candles: int) -> None:
+    config_time = min(timeit.repeat(per_candle_calls, number=candles, repeat=5))
+    with jh.frozen_runtime_context():
+        frozen_time = min(timeit.repeat(per_candle_calls, number=candles, repeat=5))
+
+    print(f'{candles} candles, best of 5:')
+    print(f'config: {config_time / candles * 1e6:.2f} us/candle')
+    print(f'frozen: {frozen_time / candles * 1e6:.2f} us/candle ({config_time / frozen_time:.0f}x faster)')
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
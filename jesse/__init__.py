@@ -258,6 +258,59 @@ def import_candles(exchange: str, symbol: str, start_date: str, skip_confirmatio
     db.close_connection()
 
 
+@cli.command()
+@click.argument('exchange', required=True, type=str)
+@click.argument('symbol', required=True, type=str)
+@click.argument('paths', required=True, nargs=-1, type=click.Path(exists=True))
+@click.option('--chunk-rows', default=100_000, show_default=True,
+              help='Number of rows that are read and stored at a time.')
+def import_file(exchange: str, symbol: str, paths: tuple, chunk_rows: int) -> None:
+    """
+    imports 1m candles from CSV or ZIP files such as Binance's data dumps
+    """
+    validate_cwd()
+    from jesse.config import config
+    config['app']['trading_mode'] = 'import-candles'
+
+    register_custom_exception_handler()
+
+    from jesse.services import db
+
+    from jesse.modes import import_file_mode
+
+    import_file_mode.run(exchange, symbol, list(paths), chunk_rows)
+
+    db.close_connection()
+
+
+@cli.command()
+@click.argument('start_date', required=True, type=str)
+@click.argument('pairs', required=False, nargs=-1, type=str)
+@click.option('--workers', default=None, type=int,
+              help='Number of concurrent requests. Requests to each exchange are still rate-limited.')
+def import_candles_bulk(start_date: str, pairs: tuple, workers: int) -> None:
+    """
+    imports historical candles of many pairs at once. Enter pairs as "EXCHANGE:SYMBOL"
+    or none to update the ones that have been imported before
+    """
+    validate_cwd()
+    from jesse.config import config
+    config['app']['trading_mode'] = 'import-candles'
+
+    register_custom_exception_handler()
+
+    from jesse.services import db
+
+    from jesse.modes.import_candles_mode import bulk
+
+    if any(':' not in p for p in pairs):
+        raise click.BadParameter('pairs must be like "Binance:BTC-USDT"')
+
+    bulk.run([tuple(p.rsplit(':', 1)) for p in pairs], start_date, workers)
+
+    db.close_connection()
+
+
 @cli.command()
 @click.argument('start_date', required=True, type=str)
 @click.argument('finish_date', required=True, type=str)
@@ -319,8 +372,13 @@ def backtest(start_date: str, finish_date: str, debug: bool, csv: bool, json: bo
 )
 @click.option('--csv/--no-csv', default=False, help='Outputs a CSV file of all DNAs on completion.')
 @click.option('--json/--no-json', default=False, help='Outputs a JSON file of all DNAs on completion.')
+@click.option(
+    '--engine', default='genetics', show_default=True,
+    type=click.Choice(['genetics', 'successive-halving', 'tpe'], case_sensitive=False),
+    help='The search algorithm. successive-halving scores all candidates on short slices of the training period first and only backtests the best ones on the full period. tpe (Tree-structured Parzen Estimator) picks each batch of candidates based on the previous results and needs far fewer backtests than genetics.'
+)
 def optimize(start_date: str, finish_date: str, optimal_total: int, cpu: int, debug: bool, csv: bool,
-             json: bool) -> None:
+             json: bool, engine: str) -> None:
     """
     tunes the hyper-parameters of your strategy
     """
@@ -335,7 +393,7 @@ def optimize(start_date: str, finish_date: str, optimal_total: int, cpu: int, de
 
     from jesse.modes.optimize_mode import optimize_mode
 
-    optimize_mode(start_date, finish_date, optimal_total, cpu, csv, json)
+    optimize_mode(start_date, finish_date, optimal_total, cpu, csv, json, engine.lower())
 
 
 @cli.command()
@@ -7,10 +7,14 @@ config = {
             'postgres_port': 5432,
             'postgres_username': 'jesse_user',
             'postgres_password': 'password',
+            # size of the connection pool (each thread that uses the database takes one)
+            'postgres_max_connections': 8,
         },
 
         'caching': {
-            'driver': 'pickle'
+            'driver': 'pickle',
+            # disk budget of the cache. The least recently used items are removed when it's exceeded
+            'max_size_mb': 2048,
         },
 
         'logging': {
@@ -24,6 +28,8 @@ config = {
             'shorter_period_candles': False,
             'trading_candles': True,
             'balance_update': True,
+            # the number of info and error logs that are kept in memory (older ones are dropped)
+            'max_logs': 1000,
         },
 
         'exchanges': {
@@ -235,6 +241,10 @@ config = {
         'data': {
             # The minimum number of warmup candles that is loaded before each session.
             'warmup_candles_num': 240,
+
+            # Keeps a copy of the candles in memory-mapped files inside storage/candles
+            # which are much faster to load than the database.
+            'candle_store': True,
         }
     },
 
@@ -72,3 +72,11 @@ class exchanges:
     BINANCE_FUTURES = 'Binance Futures'
     TESTNET_BINANCE_FUTURES = 'Testnet Binance Futures'
     SANDBOX = 'Sandbox'
+
+
+class route_events:
+    OPEN_POSITION = 'route-open-position'
+    CLOSE_POSITION = 'route-close-position'
+    INCREASED_POSITION = 'route-increased-position'
+    REDUCED_POSITION = 'route-reduced-position'
+    CANCELED = 'route-canceled'
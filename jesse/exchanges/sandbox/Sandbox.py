@@ -71,7 +71,7 @@ class Sandbox(Exchange):
             o.cancel()
 
         if not jh.is_unit_testing():
-            store.orders.storage[f'{self.name}-{symbol}'].clear()
+            store.orders.clear_orders(self.name, symbol)
 
     def cancel_order(self, symbol: str, order_id: str) -> None:
         store.orders.get_order_by_id(self.name, symbol, order_id).cancel()
@@ -1,10 +1,12 @@
 import hashlib
+import itertools
 import math
 import os
 import random
 import string
 import sys
 import uuid
+from contextlib import contextmanager
 from typing import List, Tuple, Union, Any
 from pprint import pprint
 import arrow
@@ -14,6 +16,61 @@ import numpy as np
 CACHED_CONFIG = dict()
 
 
+class RuntimeContext:
+    """
+    The answers of the helpers that check the mode (is_backtesting(), is_live(),
+    is_debuggable(), etc.) read from the config once. While a context is frozen
+    by frozen_runtime_context(), those helpers return its attributes instead of
+    going through the nested config dicts on every call.
+    """
+    __slots__ = (
+        'trading_mode', 'is_backtesting', 'is_collecting_data', 'is_importing_candles', 'is_livetrading',
+        'is_paper_trading', 'is_live', 'is_optimizing', 'is_unit_testing', 'is_debugging', 'logging',
+        'should_execute_silently', 'uses_store_time', 'store', 'config_cache',
+    )
+
+    def __init__(self) -> None:
+        from jesse.config import config
+        from jesse.store import store
+
+        self.trading_mode = config['app']['trading_mode']
+        self.is_backtesting = self.trading_mode == 'backtest'
+        self.is_collecting_data = self.trading_mode == 'collect'
+        self.is_importing_candles = self.trading_mode == 'import-candles'
+        self.is_livetrading = self.trading_mode == 'livetrade'
+        self.is_paper_trading = self.trading_mode == 'papertrade'
+        self.is_live = self.is_livetrading or self.is_paper_trading
+        self.is_optimizing = self.trading_mode == 'optimize'
+        self.is_unit_testing = "pytest" in sys.modules or config['app']['is_unit_testing']
+        self.is_debugging = config['app']['debug_mode']
+        self.logging = dict(config['env']['logging'])
+        self.should_execute_silently = self.is_optimizing or self.is_unit_testing
+        # whether now_to_timestamp() returns the time of the store instead of the clock
+        self.uses_store_time = not (self.is_live or self.is_collecting_data or self.is_importing_candles)
+        self.store = store
+        # get_config() values, which are cached even when unit testing while the context is frozen
+        self.config_cache = {}
+
+
+# the frozen RuntimeContext, if any
+RUNTIME_CONTEXT: Union[RuntimeContext, None] = None
+
+
+@contextmanager
+def frozen_runtime_context():
+    """
+    Freezes the mode and the config that the helpers read for the duration of the
+    with block. Only use it around code during which the config doesn't change.
+    """
+    global RUNTIME_CONTEXT
+    previous_context = RUNTIME_CONTEXT
+    RUNTIME_CONTEXT = RuntimeContext()
+    try:
+        yield RUNTIME_CONTEXT
+    finally:
+        RUNTIME_CONTEXT = previous_context
+
+
 def app_currency() -> str:
     from jesse.routes import router
     return quote_asset(router.routes[0].symbol)
@@ -140,6 +197,24 @@ def dna_to_hp(strategy_hp, dna: str):
     return hp
 
 
+def dna_to_routes_hp(routes_hp: list, dna: str) -> list:
+    """
+    splits a DNA that is made of one block of genes per route (used when
+    optimizing multiple routes) and converts each block into hyperparameters.
+    Routes without hyperparameters get None.
+    """
+    routes = []
+    start = 0
+    for strategy_hp in routes_hp:
+        if len(strategy_hp):
+            routes.append(dna_to_hp(strategy_hp, dna[start:start + len(strategy_hp)]))
+        else:
+            routes.append(None)
+        start += len(strategy_hp)
+
+    return routes
+
+
 def dump_exception() -> None:
     """
     a useful debugging helper
@@ -203,7 +278,46 @@ def format_currency(num: float) -> str:
 
 
 def generate_unique_id() -> str:
-    return str(uuid.uuid4())
+    """
+    returns a uuid4 string. Except in live trading, where ids have to be unique
+    across sessions, ids are a random prefix that's picked once per process
+    followed by a counter, which is still a valid uuid4 but much cheaper than
+    reading os.urandom() for every strategy, position and order of a backtest.
+    """
+    if is_live():
+        return str(uuid.uuid4())
+
+    return f'{_UNIQUE_ID_PREFIX}{next(_UNIQUE_ID_COUNTER):012x}'
+
+
+def generate_unique_ids(count: int) -> List[str]:
+    """
+    returns count random uuid4 strings with one os.urandom() call, for when
+    many rows are stored at once (like imported candles)
+    """
+    data = np.frombuffer(os.urandom(16 * count), dtype=np.uint8).reshape(count, 16).copy()
+    # the version (4) and the variant (RFC 4122) bits
+    data[:, 6] = data[:, 6] & 0x0f | 0x40
+    data[:, 8] = data[:, 8] & 0x3f | 0x80
+    h = data.tobytes().hex()
+
+    return [
+        f'{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}'
+        for i in range(0, 32 * count, 32)
+    ]
+
+
+def _reset_unique_id_prefix() -> None:
+    global _UNIQUE_ID_PREFIX
+    # the first four groups of a random uuid4, so the last one can be the counter
+    _UNIQUE_ID_PREFIX = str(uuid.uuid4())[:24]
+
+
+_UNIQUE_ID_PREFIX = None
+_UNIQUE_ID_COUNTER = itertools.count()
+_reset_unique_id_prefix()
+# processes that are forked (like the ones of the optimize mode) need their own prefix
+os.register_at_fork(after_in_child=_reset_unique_id_prefix)
 
 
 def get_arrow(timestamp: int) -> arrow.arrow.Arrow:
@@ -253,18 +367,26 @@ def get_config(keys: str, default: Any = None) -> Any:
     if not str:
         raise ValueError('keys string cannot be empty')
 
+    if RUNTIME_CONTEXT is not None:
+        if keys not in RUNTIME_CONTEXT.config_cache:
+            RUNTIME_CONTEXT.config_cache[keys] = _read_config(keys, default)
+        return RUNTIME_CONTEXT.config_cache[keys]
+
     if is_unit_testing() or keys not in CACHED_CONFIG:
-        if os.environ.get(keys.upper().replace(".", "_").replace(" ", "_")) is not None:
-            CACHED_CONFIG[keys] = os.environ.get(keys.upper().replace(".", "_").replace(" ", "_"))
-        else:
-            from functools import reduce
-            from jesse.config import config
-            CACHED_CONFIG[keys] = reduce(lambda d, k: d.get(k, default) if isinstance(d, dict) else default,
-                                         keys.split("."), config)
+        CACHED_CONFIG[keys] = _read_config(keys, default)
 
     return CACHED_CONFIG[keys]
 
 
+def _read_config(keys: str, default: Any = None) -> Any:
+    if os.environ.get(keys.upper().replace(".", "_").replace(" ", "_")) is not None:
+        return os.environ.get(keys.upper().replace(".", "_").replace(" ", "_"))
+
+    from functools import reduce
+    from jesse.config import config
+    return reduce(lambda d, k: d.get(k, default) if isinstance(d, dict) else default, keys.split("."), config)
+
+
 def get_strategy_class(strategy_name: str):
     from pydoc import locate
 
@@ -296,45 +418,63 @@ def insert_list(index: int, item, arr: list) -> list:
 
 
 def is_backtesting() -> bool:
+    if RUNTIME_CONTEXT is not None:
+        return RUNTIME_CONTEXT.is_backtesting
     from jesse.config import config
     return config['app']['trading_mode'] == 'backtest'
 
 
 def is_collecting_data() -> bool:
+    if RUNTIME_CONTEXT is not None:
+        return RUNTIME_CONTEXT.is_collecting_data
     from jesse.config import config
     return config['app']['trading_mode'] == 'collect'
 
 
 def is_debuggable(debug_item) -> bool:
+    if RUNTIME_CONTEXT is not None:
+        return RUNTIME_CONTEXT.is_debugging and RUNTIME_CONTEXT.logging[debug_item]
     from jesse.config import config
     return is_debugging() and config['env']['logging'][debug_item]
 
 
 def is_debugging() -> bool:
+    if RUNTIME_CONTEXT is not None:
+        return RUNTIME_CONTEXT.is_debugging
     from jesse.config import config
     return config['app']['debug_mode']
 
 
 def is_importing_candles() -> bool:
+    if RUNTIME_CONTEXT is not None:
+        return RUNTIME_CONTEXT.is_importing_candles
     from jesse.config import config
     return config['app']['trading_mode'] == 'import-candles'
 
 
 def is_live() -> bool:
+    if RUNTIME_CONTEXT is not None:
+        return RUNTIME_CONTEXT.is_live
     return is_livetrading() or is_paper_trading()
 
 
 def is_livetrading() -> bool:
+    if RUNTIME_CONTEXT is not None:
+        return RUNTIME_CONTEXT.is_livetrading
     from jesse.config import config
     return config['app']['trading_mode'] == 'livetrade'
 
 
 def is_optimizing() -> bool:
+    if RUNTIME_CONTEXT is not None:
+        return RUNTIME_CONTEXT.is_optimizing
     from jesse.config import config
     return config['app']['trading_mode'] == 'optimize'
 
 
 def is_paper_trading() -> bool:
+    if RUNTIME_CONTEXT is not None:
+        return RUNTIME_CONTEXT.is_paper_trading
     from jesse.config import config
     return config['app']['trading_mode'] == 'papertrade'
 
@@ -345,6 +485,8 @@ def is_test_driving() -> bool:
 
 
 def is_unit_testing() -> bool:
+    if RUNTIME_CONTEXT is not None:
+        return RUNTIME_CONTEXT.is_unit_testing
     from jesse.config import config
     # config['app']['is_unit_testing'] is only set in the live plugin unit tests
     return "pytest" in sys.modules or config['app']['is_unit_testing']
@@ -413,6 +555,11 @@ def now() -> int:
 
 
 def now_to_timestamp() -> int:
+    if RUNTIME_CONTEXT is not None:
+        if RUNTIME_CONTEXT.uses_store_time:
+            return RUNTIME_CONTEXT.store.app.time
+        return arrow.utcnow().int_timestamp * 1000
+
     if not (is_live() or is_collecting_data() or is_importing_candles()):
         from jesse.store import store
         return store.app.time
@@ -626,6 +773,8 @@ def secure_hash(msg: str) -> str:
 
 
 def should_execute_silently() -> bool:
+    if RUNTIME_CONTEXT is not None:
+        return RUNTIME_CONTEXT.should_execute_silently
     return is_optimizing() or is_unit_testing()
 
 
@@ -1 +1,2 @@
 from .dynamic_numpy_array import DynamicNumpyArray
+from .price_trigger_index import PriceTriggerIndex
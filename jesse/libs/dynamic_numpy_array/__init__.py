@@ -56,8 +56,8 @@ class DynamicNumpyArray:
     def append(self, item: np.ndarray) -> None:
         self.index += 1
 
-        # expand if the arr is almost full
-        if self.index != 0 and (self.index + 1) % self.bucket_size == 0:
+        # expand if the arr is almost full (items might have been deleted, so count the free space)
+        if self.index + 1 >= len(self.array):
             new_bucket = np.zeros(self.shape)
             self.array = np.concatenate((self.array, new_bucket), axis=0)
 
@@ -73,6 +73,21 @@ class DynamicNumpyArray:
 
         self.array[self.index] = item
 
+    def delete(self, i: int) -> None:
+        """
+        removes the item at index i and moves the ones after it back by one
+        """
+        if i < 0:
+            i = (self.index + 1) - abs(i)
+
+        # validation
+        if i > self.index or i < 0:
+            raise IndexError('list assignment index out of range')
+
+        self.array[i:self.index] = self.array[i + 1:self.index + 1]
+        self.array[self.index] = 0
+        self.index -= 1
+
     def get_last_item(self):
         # validation
         if self.index == -1:
@@ -90,6 +105,16 @@ class DynamicNumpyArray:
 
         return self.array[self.index - past_index]
 
+    def copy(self) -> 'DynamicNumpyArray':
+        """
+        returns an independent copy of the array
+        """
+        arr = DynamicNumpyArray(self.shape, self.drop_at)
+        arr.index = self.index
+        arr.array = self.array.copy()
+        arr.bucket_size = self.bucket_size
+        return arr
+
     def flush(self) -> None:
         self.index = -1
         self.array = np.zeros(self.shape)
@@ -0,0 +1,56 @@
+import numpy as np
+
+
+class PriceTriggerIndex:
+    """
+    Price Trigger Index
+
+    Finds the next candle whose low drops to (or whose high rises to) a price
+    without going through the candles one by one. The lowest low and the
+    highest high of each block of candles are kept, so only the blocks that
+    can contain such a candle are looked into.
+    """
+
+    def __init__(self, candles: np.ndarray, block_size: int = 64):
+        self.lows = np.ascontiguousarray(candles[:, 4])
+        self.highs = np.ascontiguousarray(candles[:, 3])
+        self.length = len(candles)
+        self.block_size = block_size
+
+        padding = -self.length % block_size
+        self.block_lows = np.append(self.lows, np.full(padding, np.inf)).reshape(-1, block_size).min(axis=1)
+        self.block_highs = np.append(self.highs, np.full(padding, -np.inf)).reshape(-1, block_size).max(axis=1)
+
+    def next_low_at_or_below(self, start: int, price: float) -> int:
+        """
+        returns the index of the first candle from start on whose low is at or
+        below price, or the number of candles if there isn't any
+        """
+        return self._next(self.lows, self.block_lows, start, lambda values: values <= price)
+
+    def next_high_at_or_above(self, start: int, price: float) -> int:
+        """
+        returns the index of the first candle from start on whose high is at or
+        above price, or the number of candles if there isn't any
+        """
+        return self._next(self.highs, self.block_highs, start, lambda values: values >= price)
+
+    def _next(self, values: np.ndarray, blocks: np.ndarray, start: int, matches) -> int:
+        if start >= self.length:
+            return self.length
+
+        # the rest of the block that start is in
+        block = start // self.block_size
+        end = min((block + 1) * self.block_size, self.length)
+        found = np.flatnonzero(matches(values[start:end]))
+        if len(found):
+            return start + int(found[0])
+
+        # the first block after it that has a matching candle
+        found = np.flatnonzero(matches(blocks[block + 1:]))
+        if not len(found):
+            return self.length
+        block += 1 + int(found[0])
+
+        start = block * self.block_size
+        return start + int(np.flatnonzero(matches(values[start:start + self.block_size]))[0])
@@ -0,0 +1,37 @@
+import peewee
+
+import jesse.helpers as jh
+from jesse.services.db import db
+
+
+class CandleCoverage(peewee.Model):
+    """
+    A run of contiguous 1m candles that exist in the candle table. Kept up to
+    date by jesse.services.candle_coverage whenever candles are stored.
+    """
+    id = peewee.UUIDField(primary_key=True)
+    exchange = peewee.CharField()
+    symbol = peewee.CharField()
+    # timestamps of the first and the last candles of the run
+    start = peewee.BigIntegerField()
+    finish = peewee.BigIntegerField()
+
+    class Meta:
+        database = db
+        indexes = (
+            (('exchange', 'symbol', 'start'), True),
+        )
+
+    def __init__(self, attributes: dict = None, **kwargs) -> None:
+        peewee.Model.__init__(self, attributes=attributes, **kwargs)
+
+        if attributes is None:
+            attributes = {}
+
+        for a, value in attributes.items():
+            setattr(self, a, value)
+
+
+if not jh.is_unit_testing():
+    # create the table
+    CandleCoverage.create_table()
@@ -6,43 +6,49 @@ from jesse.config import config
 from jesse.services.db import db
 
 
-class CompletedTrade(peewee.Model):
-    """A trade is made when a position is opened AND closed."""
-
-    id = peewee.UUIDField(primary_key=True)
-    strategy_name = peewee.CharField()
-    symbol = peewee.CharField()
-    exchange = peewee.CharField()
-    type = peewee.CharField()
-    timeframe = peewee.CharField()
-    entry_price = peewee.FloatField(default=np.nan)
-    exit_price = peewee.FloatField(default=np.nan)
-    take_profit_at = peewee.FloatField(default=np.nan)
-    stop_loss_at = peewee.FloatField(default=np.nan)
-    qty = peewee.FloatField(default=np.nan)
-    opened_at = peewee.BigIntegerField()
-    closed_at = peewee.BigIntegerField()
-    entry_candle_timestamp = peewee.BigIntegerField()
-    exit_candle_timestamp = peewee.BigIntegerField()
-    leverage = peewee.IntegerField()
-
-    orders = []
-
-    class Meta:
-        database = db
-        indexes = ((('strategy_name', 'exchange', 'symbol'), False),)
+class CompletedTrade:
+    """
+    A trade is made when a position is opened AND closed.
+
+    Trades live in memory as plain objects with __slots__; they're converted to
+    CompletedTradeModel only when they're stored in the database (in live mode).
+    """
+    __slots__ = (
+        'id', 'strategy_name', 'symbol', 'exchange', 'type', 'timeframe', 'entry_price', 'exit_price',
+        'take_profit_at', 'stop_loss_at', 'qty', 'opened_at', 'closed_at', 'entry_candle_timestamp',
+        'exit_candle_timestamp', 'leverage', 'orders',
+    )
+    _attribute_names = frozenset(__slots__)
 
     def __init__(self, attributes: dict = None, **kwargs) -> None:
-        peewee.Model.__init__(self, attributes=attributes, **kwargs)
+        self.id = None
+        self.strategy_name = None
+        self.symbol = None
+        self.exchange = None
+        self.type = None
+        self.timeframe = None
+        self.entry_price = np.nan
+        self.exit_price = np.nan
+        self.take_profit_at = np.nan
+        self.stop_loss_at = np.nan
+        self.qty = np.nan
+        self.opened_at = None
+        self.closed_at = None
+        self.entry_candle_timestamp = None
+        self.exit_candle_timestamp = None
+        self.leverage = None
+        self.orders = []
 
         if attributes is None:
             attributes = {}
 
-        for a, value in attributes.items():
-            setattr(self, a, value)
+        for a, value in {**kwargs, **attributes}.items():
+            # other keys, such as the extra columns of a database row, are ignored
+            if a in self._attribute_names:
+                setattr(self, a, value)
 
     def toJSON(self) -> dict:
-        orders = [o.__dict__ for o in self.orders]
+        orders = [o.to_dict() for o in self.orders]
         return {
             "id": self.id,
             "strategy_name": self.strategy_name,
@@ -131,6 +137,34 @@ class CompletedTrade(peewee.Model):
         return (self.closed_at - self.opened_at) / 1000
 
 
+class CompletedTradeModel(peewee.Model):
+    """
+    The database table of completed trades
+    """
+    id = peewee.UUIDField(primary_key=True)
+    strategy_name = peewee.CharField()
+    symbol = peewee.CharField()
+    exchange = peewee.CharField()
+    type = peewee.CharField()
+    timeframe = peewee.CharField()
+    entry_price = peewee.FloatField(default=np.nan)
+    exit_price = peewee.FloatField(default=np.nan)
+    take_profit_at = peewee.FloatField(default=np.nan)
+    stop_loss_at = peewee.FloatField(default=np.nan)
+    qty = peewee.FloatField(default=np.nan)
+    opened_at = peewee.BigIntegerField()
+    closed_at = peewee.BigIntegerField()
+    entry_candle_timestamp = peewee.BigIntegerField()
+    exit_candle_timestamp = peewee.BigIntegerField()
+    leverage = peewee.IntegerField()
+
+    class Meta:
+        database = db
+        # the table that the model had when it was named CompletedTrade
+        table_name = 'completedtrade'
+        indexes = ((('strategy_name', 'exchange', 'symbol'), False),)
+
+
 if not jh.is_unit_testing():
     # create the table
-    CompletedTrade.create_table()
+    CompletedTradeModel.create_table()
@@ -58,3 +58,15 @@ class Exchange(ABC):
     @abstractmethod
     def charge_fee(self, amount: float) -> None:
         pass
+
+    def track_position(self, position) -> None:
+        """
+        called for each position of the store, which are the ones whose updates count
+        """
+        pass
+
+    def on_position_update(self, position) -> None:
+        """
+        called when the price, size, or entry price of a position changes
+        """
+        pass
@@ -6,7 +6,6 @@ from jesse.enums import sides, order_types
 from jesse.exceptions import InsufficientMargin
 from jesse.libs import DynamicNumpyArray
 from jesse.models import Order
-from jesse.services import selectors
 from .Exchange import Exchange
 
 
@@ -33,6 +32,20 @@ class FuturesExchange(Exchange):
         self.futures_leverage_mode = futures_leverage_mode
         self.futures_leverage = futures_leverage
 
+        # running totals so available_margin() doesn't have to go through all positions and orders:
+        # the sum of qty * price of the open buy and sell orders of each asset
+        self._buy_orders_sum = {}
+        self._sell_orders_sum = {}
+        # the margin that open orders of each asset take, and their total
+        self._orders_margins = {}
+        self._orders_margin = 0
+        # unrealized PNL minus total cost of each open position (by id), and their total
+        self._positions_credits = {}
+        self._positions_credit = 0
+        # ids of the positions of the store that are settled in the settlement currency, and their base assets
+        self._tracked_positions = set()
+        self._traded_assets = set()
+
         for item in starting_assets:
             self.buy_orders[item['asset']] = DynamicNumpyArray((10, 2))
             self.sell_orders[item['asset']] = DynamicNumpyArray((10, 2))
@@ -62,52 +75,87 @@ class FuturesExchange(Exchange):
         return self.assets[self.settlement_currency]
 
     def available_margin(self, symbol: str = '') -> float:
-        # a temp which gets added to per each asset (remember that all future assets use the same currency for settlement)
-        temp_credits = self.assets[self.settlement_currency]
-
-        # we need to consider buy and sell orders of ALL pairs
-        # also, consider the value of all open positions
-        for asset in self.assets:
-            if asset == self.settlement_currency:
-                continue
-
-            position = selectors.get_position(self.name, f"{asset}-{self.settlement_currency}")
-            if position is None:
-                continue
-
-            if position.is_open:
-                # add unrealized PNL
-                temp_credits += position.pnl
-
-            # only which of these has actual values, so we can count all of them!
-            sum_buy_orders = (self.buy_orders[asset][:][:, 0] * self.buy_orders[asset][:][:, 1]).sum()
-            sum_sell_orders = (self.sell_orders[asset][:][:, 0] * self.sell_orders[asset][:][:, 1]).sum()
-
-            if position.is_open:
-                temp_credits -= position.total_cost
-
-            # Subtract the amount we paid for open orders. Notice that this does NOT include
-            # reduce_only orders so either sum_buy_orders or sum_sell_orders is zero. We also
-            # care about the cost we actually paid for it which takes into account the leverage
-            temp_credits -= max(
-                abs(sum_buy_orders) / self.futures_leverage, abs(sum_sell_orders) / self.futures_leverage
-            )
+        # all future assets use the same currency for settlement, so the unrealized PNL and
+        # the cost of open positions and orders of ALL pairs are considered
+        temp_credits = self.assets[self.settlement_currency] + self._positions_credit - self._orders_margin
 
         # count in the leverage
         return temp_credits * self.futures_leverage
 
+    def track_position(self, position) -> None:
+        # only positions that are settled in the settlement currency count
+        if jh.quote_asset(position.symbol) != self.settlement_currency:
+            return
+
+        self._tracked_positions.add(position.id)
+        self._traded_assets.add(jh.base_asset(position.symbol))
+
+    def on_position_update(self, position) -> None:
+        if position.id not in self._tracked_positions:
+            return
+
+        old_credit = self._positions_credits.pop(position.id, 0)
+        if position.is_open and position.current_price is not None and position.entry_price is not None:
+            new_credit = position.pnl - position.total_cost
+            self._positions_credits[position.id] = new_credit
+            self._positions_credit += new_credit - old_credit
+        elif self._positions_credits:
+            self._positions_credit -= old_credit
+        else:
+            # so rounding errors don't pile up
+            self._positions_credit = 0
+
+    def _update_orders_margin(self, asset: str) -> None:
+        """
+        Updates the margin that open orders of the asset take, and their total
+        """
+        # Orders of assets without a position aren't traded
+        if asset not in self._traded_assets:
+            return
+
+        # Notice that reduce_only orders aren't included so either the sum of buy orders or
+        # sell orders is zero. We also care about the cost we actually paid for it which
+        # takes into account the leverage.
+        old_margin = self._orders_margins.get(asset, 0)
+        new_margin = max(
+            abs(self._buy_orders_sum.get(asset, 0)), abs(self._sell_orders_sum.get(asset, 0))
+        ) / self.futures_leverage
+        self._orders_margins[asset] = new_margin
+        self._orders_margin += new_margin - old_margin
+
+    def _add_order(self, orders: DynamicNumpyArray, sums: dict, asset: str, order: Order) -> None:
+        orders.append(np.array([order.qty, order.price]))
+        sums[asset] = sums.get(asset, 0) + order.qty * order.price
+
+    def _remove_order(self, orders: DynamicNumpyArray, sums: dict, asset: str, order: Order) -> None:
+        for index, item in enumerate(orders):
+            if item[0] == order.qty and item[1] == order.price:
+                # item is a view of the row which delete() overwrites
+                size = item[0] * item[1]
+                orders.delete(index)
+                # so rounding errors don't pile up
+                sums[asset] = sums.get(asset, 0) - size if len(orders) else 0
+                break
+
     def charge_fee(self, amount: float) -> None:
         fee_amount = abs(amount) * self.fee_rate
         new_balance = self.assets[self.settlement_currency] - fee_amount
-        logger.info(
-            f'Charged {round(fee_amount, 2)} as fee. Balance for {self.settlement_currency} on {self.name} changed from {round(self.assets[self.settlement_currency], 2)} to {round(new_balance, 2)}'
-        )
+        if jh.is_debuggable('balance_update'):
+            logger.info(
+                'Charged %s as fee. Balance for %s on %s changed from %s to %s',
+                round(fee_amount, 2), self.settlement_currency, self.name,
+                round(self.assets[self.settlement_currency], 2), round(new_balance, 2)
+            )
         self.assets[self.settlement_currency] = new_balance
 
     def add_realized_pnl(self, realized_pnl: float) -> None:
         new_balance = self.assets[self.settlement_currency] + realized_pnl
-        logger.info(
-            f'Added realized PNL of {round(realized_pnl, 2)}. Balance for {self.settlement_currency} on {self.name} changed from {round(self.assets[self.settlement_currency], 2)} to {round(new_balance, 2)}')
+        if jh.is_debuggable('balance_update'):
+            logger.info(
+                'Added realized PNL of %s. Balance for %s on %s changed from %s to %s',
+                round(realized_pnl, 2), self.settlement_currency, self.name,
+                round(self.assets[self.settlement_currency], 2), round(new_balance, 2)
+            )
         self.assets[self.settlement_currency] = new_balance
 
     def on_order_submission(self, order: Order, skip_market_order: bool = True) -> None:
@@ -133,9 +181,10 @@ class FuturesExchange(Exchange):
 
         if not order.is_reduce_only:
             if order.side == sides.BUY:
-                self.buy_orders[base_asset].append(np.array([order.qty, order.price]))
+                self._add_order(self.buy_orders[base_asset], self._buy_orders_sum, base_asset, order)
             else:
-                self.sell_orders[base_asset].append(np.array([order.qty, order.price]))
+                self._add_order(self.sell_orders[base_asset], self._sell_orders_sum, base_asset, order)
+            self._update_orders_margin(base_asset)
 
     def on_order_execution(self, order: Order) -> None:
         base_asset = jh.base_asset(order.symbol)
@@ -145,17 +194,10 @@ class FuturesExchange(Exchange):
 
         if not order.is_reduce_only:
             if order.side == sides.BUY:
-                # find and set order to [0, 0] (same as removing it)
-                for index, item in enumerate(self.buy_orders[base_asset]):
-                    if item[0] == order.qty and item[1] == order.price:
-                        self.buy_orders[base_asset][index] = np.array([0, 0])
-                        break
+                self._remove_order(self.buy_orders[base_asset], self._buy_orders_sum, base_asset, order)
             else:
-                # find and set order to [0, 0] (same as removing it)
-                for index, item in enumerate(self.sell_orders[base_asset]):
-                    if item[0] == order.qty and item[1] == order.price:
-                        self.sell_orders[base_asset][index] = np.array([0, 0])
-                        break
+                self._remove_order(self.sell_orders[base_asset], self._sell_orders_sum, base_asset, order)
+            self._update_orders_margin(base_asset)
 
     def on_order_cancellation(self, order: Order) -> None:
         base_asset = jh.base_asset(order.symbol)
@@ -164,14 +206,7 @@ class FuturesExchange(Exchange):
         # self.available_assets[quote_asset] += order.qty * order.price
         if not order.is_reduce_only:
             if order.side == sides.BUY:
-                # find and set order to [0, 0] (same as removing it)
-                for index, item in enumerate(self.buy_orders[base_asset]):
-                    if item[0] == order.qty and item[1] == order.price:
-                        self.buy_orders[base_asset][index] = np.array([0, 0])
-                        break
+                self._remove_order(self.buy_orders[base_asset], self._buy_orders_sum, base_asset, order)
             else:
-                # find and set order to [0, 0] (same as removing it)
-                for index, item in enumerate(self.sell_orders[base_asset]):
-                    if item[0] == order.qty and item[1] == order.price:
-                        self.sell_orders[base_asset][index] = np.array([0, 0])
-                        break
+                self._remove_order(self.sell_orders[base_asset], self._sell_orders_sum, base_asset, order)
+            self._update_orders_margin(base_asset)
@@ -0,0 +1,39 @@
+import peewee
+
+import jesse.helpers as jh
+from jesse.services.db import db
+
+
+class ImportCheckpoint(peewee.Model):
+    """
+    The progress of importing the candles of an exchange and symbol so that
+    interrupted or later imports can continue from where the last one stopped
+    """
+    id = peewee.UUIDField(primary_key=True)
+    exchange = peewee.CharField()
+    symbol = peewee.CharField()
+    # the first candle that the exchange has for the symbol, if it's later than the requested start
+    first_timestamp = peewee.BigIntegerField(null=True)
+    # the last candle of the last chunk that was stored
+    last_timestamp = peewee.BigIntegerField(null=True)
+    updated_at = peewee.BigIntegerField()
+
+    class Meta:
+        database = db
+        indexes = (
+            (('exchange', 'symbol'), True),
+        )
+
+    def __init__(self, attributes: dict = None, **kwargs) -> None:
+        peewee.Model.__init__(self, attributes=attributes, **kwargs)
+
+        if attributes is None:
+            attributes = {}
+
+        for a, value in attributes.items():
+            setattr(self, a, value)
+
+
+if not jh.is_unit_testing():
+    # create the table
+    ImportCheckpoint.create_table()
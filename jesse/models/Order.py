@@ -10,42 +10,50 @@ from jesse.services.notifier import notify
 from jesse.enums import order_statuses, order_flags
 
 
-class Order(Model):
-    # id generated by Jesse for database usage
-    id = UUIDField(primary_key=True)
-    trade_id = UUIDField(index=True)
-
-    # id generated by market, used in live-trade mode
-    exchange_id = CharField()
-    # some exchanges might require even further info
-    vars = JSONField(default={})
-
-    symbol = CharField()
-    exchange = CharField()
-    side = CharField()
-    type = CharField()
-    flag = CharField(null=True)
-    qty = FloatField()
-    price = FloatField(default=np.nan)
-    status = CharField(default=order_statuses.ACTIVE)
-    created_at = BigIntegerField()
-    executed_at = BigIntegerField(null=True)
-    canceled_at = BigIntegerField(null=True)
-    role = CharField(null=True)
-    submitted_via = None
-
-    class Meta:
-        database = db
-        indexes = ((('exchange', 'symbol'), False),)
+class Order:
+    """
+    Orders live in memory as plain objects with __slots__ which are much
+    cheaper to create than peewee models. They're converted to OrderModel
+    only when they're stored in the database (in live mode).
+    """
+    __slots__ = (
+        # id generated by Jesse for database usage
+        'id', 'trade_id',
+        # id generated by market, used in live-trade mode
+        'exchange_id',
+        # some exchanges might require even further info
+        'vars',
+        'symbol', 'exchange', 'side', 'type', 'flag', 'qty', 'price', 'status', 'created_at', 'executed_at',
+        'canceled_at', 'role', 'submitted_via',
+    )
+    _attribute_names = frozenset(__slots__)
 
     def __init__(self, attributes: dict = None, **kwargs) -> None:
-        Model.__init__(self, attributes=attributes, **kwargs)
+        self.id = None
+        self.trade_id = None
+        self.exchange_id = None
+        self.vars = {}
+        self.symbol = None
+        self.exchange = None
+        self.side = None
+        self.type = None
+        self.flag = None
+        self.qty = None
+        self.price = np.nan
+        self.status = order_statuses.ACTIVE
+        self.created_at = None
+        self.executed_at = None
+        self.canceled_at = None
+        self.role = None
+        self.submitted_via = None
 
         if attributes is None:
             attributes = {}
 
-        for a, value in attributes.items():
-            setattr(self, a, value)
+        for a, value in {**kwargs, **attributes}.items():
+            # other keys, such as the extra columns of a database row, are ignored
+            if a in self._attribute_names:
+                setattr(self, a, value)
 
         if self.created_at is None:
             self.created_at = jh.now_to_timestamp()
@@ -54,7 +62,8 @@ class Order(Model):
             self.notify_submission()
         if jh.is_debuggable('order_submission'):
             logger.info(
-                f'{"QUEUED" if self.is_queued else "SUBMITTED"} order: {self.symbol}, {self.type}, {self.side}, {self.qty}, ${round(self.price, 2)}'
+                '%s order: %s, %s, %s, %s, $%s',
+                'QUEUED' if self.is_queued else 'SUBMITTED', self.symbol, self.type, self.side, self.qty, round(self.price, 2)
             )
 
         # handle exchange balance for ordered asset
@@ -105,7 +114,6 @@ class Order(Model):
     def is_close(self) -> bool:
         return self.flag == order_flags.CLOSE
 
-    @property
     def to_dict(self) -> dict:
         return {
             'id': self.id,
@@ -133,7 +141,7 @@ class Order(Model):
         if not silent:
             if jh.is_debuggable('order_cancellation'):
                 logger.info(
-                    f'CANCELED order: {self.symbol}, {self.type}, {self.side}, {self.qty}, ${round(self.price, 2)}'
+                    'CANCELED order: %s, %s, %s, %s, $%s', self.symbol, self.type, self.side, self.qty, round(self.price, 2)
                 )
             if jh.is_live() and config['env']['notifications']['events']['cancelled_orders']:
                 notify(
@@ -155,7 +163,7 @@ class Order(Model):
             # log
             if jh.is_debuggable('order_execution'):
                 logger.info(
-                    f'EXECUTED order: {self.symbol}, {self.type}, {self.side}, {self.qty}, ${round(self.price, 2)}'
+                    'EXECUTED order: %s, %s, %s, %s, $%s', self.symbol, self.type, self.side, self.qty, round(self.price, 2)
                 )
             # notify
             if jh.is_live() and config['env']['notifications']['events']['executed_orders']:
@@ -173,6 +181,34 @@ class Order(Model):
         e.on_order_execution(self)
 
 
+class OrderModel(Model):
+    """
+    The database table of orders
+    """
+    id = UUIDField(primary_key=True)
+    trade_id = UUIDField(index=True)
+    exchange_id = CharField()
+    vars = JSONField(default={})
+    symbol = CharField()
+    exchange = CharField()
+    side = CharField()
+    type = CharField()
+    flag = CharField(null=True)
+    qty = FloatField()
+    price = FloatField(default=np.nan)
+    status = CharField(default=order_statuses.ACTIVE)
+    created_at = BigIntegerField()
+    executed_at = BigIntegerField(null=True)
+    canceled_at = BigIntegerField(null=True)
+    role = CharField(null=True)
+
+    class Meta:
+        database = db
+        # the table that the model had when it was named Order
+        table_name = 'order'
+        indexes = ((('exchange', 'symbol'), False),)
+
+
 if not jh.is_unit_testing():
     # create the table
-    Order.create_table()
+    OrderModel.create_table()
@@ -15,6 +15,7 @@ from jesse.utils import sum_floats, subtract_floats
 class Position:
     def __init__(self, exchange_name: str, symbol: str, attributes: dict = None) -> None:
         self.id = jh.generate_unique_id()
+        self._stored_liquidation_price = np.nan
         self.entry_price = None
         self.exit_price = None
         self.current_price = None
@@ -38,6 +39,48 @@ class Position:
         for a in attributes:
             setattr(self, a, attributes[a])
 
+    # the exchange is told about changes of these, so it can keep its available margin up to date
+    @property
+    def current_price(self) -> float:
+        return self._current_price
+
+    @current_price.setter
+    def current_price(self, value: float) -> None:
+        self._current_price = value
+        self._notify_exchange()
+
+    @property
+    def qty(self) -> float:
+        return self._qty
+
+    @qty.setter
+    def qty(self, value: float) -> None:
+        self._qty = value
+        self._notify_exchange()
+        self._store_liquidation_price()
+
+    @property
+    def entry_price(self) -> float:
+        return self._entry_price
+
+    @entry_price.setter
+    def entry_price(self, value: float) -> None:
+        self._entry_price = value
+        self._notify_exchange()
+        self._store_liquidation_price()
+
+    def _notify_exchange(self) -> None:
+        # the exchange isn't set yet while __init__() sets the defaults
+        exchange = self.__dict__.get('exchange')
+        if exchange is not None:
+            exchange.on_position_update(self)
+
+    def _store_liquidation_price(self) -> None:
+        # the liquidation price only changes when the position is opened, increased,
+        # reduced or closed, so it's calculated then instead of every time it's needed
+        if self.__dict__.get('exchange') is not None:
+            self._stored_liquidation_price = self._calculate_liquidation_price()
+
     @property
     def mark_price(self) -> float:
         if not jh.is_live():
@@ -181,6 +224,13 @@ class Position:
         if jh.is_livetrading():
             return self._liquidation_price
 
+        return self._stored_liquidation_price
+
+    def _calculate_liquidation_price(self) -> Union[float, np.float64]:
+        # while attributes are set one by one, the entry price might not be set yet
+        if self.is_close or self.entry_price is None:
+            return np.nan
+
         if self.mode in ['cross', 'spot']:
             return np.nan
 
@@ -73,12 +73,14 @@ class SpotExchange(Exchange):
         temp_new_quote_available_asset = self.available_assets[quote_asset]
         if jh.is_debuggable('balance_update') and temp_old_quote_available_asset != temp_new_quote_available_asset:
             logger.info(
-                f'Available balance for {quote_asset} on {self.name} changed from {round(temp_old_quote_available_asset, 2)} to {round(temp_new_quote_available_asset, 2)}'
+                'Available balance for %s on %s changed from %s to %s',
+                quote_asset, self.name, round(temp_old_quote_available_asset, 2), round(temp_new_quote_available_asset, 2)
             )
         temp_new_base_available_asset = self.available_assets[base_asset]
         if jh.is_debuggable('balance_update') and temp_old_base_available_asset != temp_new_base_available_asset:
             logger.info(
-                f'Available balance for {base_asset} on {self.name} changed from {round(temp_old_base_available_asset, 2)} to {round(temp_new_base_available_asset, 2)}'
+                'Available balance for %s on %s changed from %s to %s',
+                base_asset, self.name, round(temp_old_base_available_asset, 2), round(temp_new_base_available_asset, 2)
             )
 
     def on_order_execution(self, order: Order) -> None:
@@ -108,23 +110,27 @@ class SpotExchange(Exchange):
         temp_new_quote_asset = self.assets[quote_asset]
         if jh.is_debuggable('balance_update') and temp_old_quote_asset != temp_new_quote_asset:
             logger.info(
-                f'Balance for {quote_asset} on {self.name} changed from {round(temp_old_quote_asset, 2)} to {round(temp_new_quote_asset, 2)}'
+                'Balance for %s on %s changed from %s to %s',
+                quote_asset, self.name, round(temp_old_quote_asset, 2), round(temp_new_quote_asset, 2)
             )
         temp_new_quote_available_asset = self.available_assets[quote_asset]
         if jh.is_debuggable('balance_update') and temp_old_quote_available_asset != temp_new_quote_available_asset:
             logger.info(
-                f'Balance for {quote_asset} on {self.name} changed from {round(temp_old_quote_available_asset, 2)} to {round(temp_new_quote_available_asset, 2)}'
+                'Balance for %s on %s changed from %s to %s',
+                quote_asset, self.name, round(temp_old_quote_available_asset, 2), round(temp_new_quote_available_asset, 2)
             )
 
         temp_new_base_asset = self.assets[base_asset]
         if jh.is_debuggable('balance_update') and temp_old_base_asset != temp_new_base_asset:
             logger.info(
-                f'Balance for {base_asset} on {self.name} changed from {round(temp_old_base_asset, 2)} to {round(temp_new_base_asset, 2)}'
+                'Balance for %s on %s changed from %s to %s',
+                base_asset, self.name, round(temp_old_base_asset, 2), round(temp_new_base_asset, 2)
             )
         temp_new_base_available_asset = self.available_assets[base_asset]
         if jh.is_debuggable('balance_update') and temp_old_base_available_asset != temp_new_base_available_asset:
             logger.info(
-                f'Balance for {base_asset} on {self.name} changed from {round(temp_old_base_available_asset, 2)} to {round(temp_new_base_available_asset, 2)}'
+                'Balance for %s on %s changed from %s to %s',
+                base_asset, self.name, round(temp_old_base_available_asset, 2), round(temp_new_base_available_asset, 2)
             )
 
     def on_order_cancellation(self, order: Order) -> None:
@@ -144,10 +150,12 @@ class SpotExchange(Exchange):
         temp_new_quote_available_asset = self.available_assets[quote_asset]
         if jh.is_debuggable('balance_update') and temp_old_quote_available_asset != temp_new_quote_available_asset:
             logger.info(
-                f'Available balance for {quote_asset} on {self.name} changed from {round(temp_old_quote_available_asset, 2)} to {round(temp_new_quote_available_asset, 2)}'
+                'Available balance for %s on %s changed from %s to %s',
+                quote_asset, self.name, round(temp_old_quote_available_asset, 2), round(temp_new_quote_available_asset, 2)
             )
         temp_new_base_available_asset = self.available_assets[base_asset]
         if jh.is_debuggable('balance_update') and temp_old_base_available_asset != temp_new_base_available_asset:
             logger.info(
-                f'Available balance for {base_asset} on {self.name} changed from {round(temp_old_base_available_asset, 2)} to {round(temp_new_base_available_asset, 2)}'
+                'Available balance for %s on %s changed from %s to %s',
+                base_asset, self.name, round(temp_old_base_available_asset, 2), round(temp_new_base_available_asset, 2)
             )
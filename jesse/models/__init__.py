@@ -1,6 +1,8 @@
 from .Candle import Candle
+from .CandleCoverage import CandleCoverage
 from .CompletedTrade import CompletedTrade
 from .Exchange import Exchange
+from .ImportCheckpoint import ImportCheckpoint
 from .FuturesExchange import FuturesExchange
 from .Order import Order
 from .Position import Position
@@ -1,16 +1,25 @@
-import threading
-
 import numpy as np
+import pydash
 
 import jesse.helpers as jh
 from jesse.models.Candle import Candle
-from jesse.models.CompletedTrade import CompletedTrade
+from jesse.models.CompletedTrade import CompletedTrade, CompletedTradeModel
 from jesse.models.DailyBalance import DailyBalance
-from jesse.models.Order import Order
+from jesse.models.Order import Order, OrderModel
 from jesse.models.Orderbook import Orderbook
 from jesse.models.Ticker import Ticker
 from jesse.models.Trade import Trade
+from jesse.services import candle_coverage
 from jesse.services import logger
+from jesse.services.db_writer import db_writer
+
+
+def _update_candle_coverage(rows: list) -> None:
+    for (exchange, symbol), candles in pydash.group_by(rows, lambda r: (r['exchange'], r['symbol'])).items():
+        candle_coverage.add(exchange, symbol, [c['timestamp'] for c in candles])
+
+
+db_writer.after_insert[Candle] = _update_candle_coverage
 
 
 def store_candle_into_db(exchange: str, symbol: str, candle: np.ndarray) -> None:
@@ -26,17 +35,10 @@ def store_candle_into_db(exchange: str, symbol: str, candle: np.ndarray) -> None
         'volume': candle[5]
     }
 
-    def async_save() -> None:
-        Candle.insert(**d).on_conflict_ignore().execute()
-        print(
-            jh.color(
-                f"candle: {jh.timestamp_to_time(d['timestamp'])}-{exchange}-{symbol}: {candle}",
-                'blue'
-            )
-        )
+    db_writer.put(Candle, d, ignore_conflicts=True)
 
-    # async call
-    threading.Thread(target=async_save).start()
+    if jh.is_debugging():
+        print(jh.color(f"candle: {jh.timestamp_to_time(d['timestamp'])}-{exchange}-{symbol}: {candle}", 'blue'))
 
 
 def store_ticker_into_db(exchange: str, symbol: str, ticker: np.ndarray) -> None:
@@ -52,14 +54,10 @@ def store_ticker_into_db(exchange: str, symbol: str, ticker: np.ndarray) -> None
         'exchange': exchange,
     }
 
-    def async_save() -> None:
-        Ticker.insert(**d).on_conflict_ignore().execute()
-        print(
-            jh.color(f'ticker: {jh.timestamp_to_time(d["timestamp"])}-{exchange}-{symbol}: {ticker}', 'yellow')
-        )
+    db_writer.put(Ticker, d, ignore_conflicts=True)
 
-    # async call
-    threading.Thread(target=async_save).start()
+    if jh.is_debugging():
+        print(jh.color(f'ticker: {jh.timestamp_to_time(d["timestamp"])}-{exchange}-{symbol}: {ticker}', 'yellow'))
 
 
 def store_completed_trade_into_db(completed_trade: CompletedTrade) -> None:
@@ -81,13 +79,10 @@ def store_completed_trade_into_db(completed_trade: CompletedTrade) -> None:
         'leverage': completed_trade.leverage,
     }
 
-    def async_save() -> None:
-        CompletedTrade.insert(**d).execute()
-        if jh.is_debugging():
-            logger.info(f'Stored the completed trade record for {completed_trade.exchange}-{completed_trade.symbol}-{completed_trade.strategy_name} into database.')
+    db_writer.put(CompletedTradeModel, d)
 
-    # async call
-    threading.Thread(target=async_save).start()
+    if jh.is_debugging():
+        logger.info(f'Stored the completed trade record for {completed_trade.exchange}-{completed_trade.symbol}-{completed_trade.strategy_name} into database.')
 
 
 def store_order_into_db(order: Order) -> None:
@@ -111,25 +106,18 @@ def store_order_into_db(order: Order) -> None:
         'role': order.role,
     }
 
-    def async_save() -> None:
-        Order.insert(**d).execute()
-        if jh.is_debugging():
-            logger.info(f'Stored the executed order record for {order.exchange}-{order.symbol} into database.')
+    db_writer.put(OrderModel, d)
 
-    # async call
-    threading.Thread(target=async_save).start()
+    if jh.is_debugging():
+        logger.info(f'Stored the executed order record for {order.exchange}-{order.symbol} into database.')
 
 
 def store_daily_balance_into_db(daily_balance: dict) -> None:
     return
-    def async_save():
-        DailyBalance.insert(**daily_balance).execute()
-        if jh.is_debugging():
-            logger.info(f'Stored daily portfolio balance record into the database: {daily_balance["asset"]} => {jh.format_currency(round(daily_balance["balance"], 2))}'
-            )
+    db_writer.put(DailyBalance, daily_balance)
 
-    # async call
-    threading.Thread(target=async_save).start()
+    if jh.is_debugging():
+        logger.info(f'Stored daily portfolio balance record into the database: {daily_balance["asset"]} => {jh.format_currency(round(daily_balance["balance"], 2))}')
 
 
 def store_trade_into_db(exchange: str, symbol: str, trade: np.ndarray) -> None:
@@ -146,17 +134,10 @@ def store_trade_into_db(exchange: str, symbol: str, trade: np.ndarray) -> None:
         'exchange': exchange,
     }
 
-    def async_save() -> None:
-        Trade.insert(**d).on_conflict_ignore().execute()
-        print(
-            jh.color(
-                f'trade: {jh.timestamp_to_time(d["timestamp"])}-{exchange}-{symbol}: {trade}',
-                'green'
-            )
-        )
+    db_writer.put(Trade, d, ignore_conflicts=True)
 
-    # async call
-    threading.Thread(target=async_save).start()
+    if jh.is_debugging():
+        print(jh.color(f'trade: {jh.timestamp_to_time(d["timestamp"])}-{exchange}-{symbol}: {trade}', 'green'))
 
 
 def store_orderbook_into_db(exchange: str, symbol: str, orderbook: np.ndarray) -> None:
@@ -169,8 +150,9 @@ def store_orderbook_into_db(exchange: str, symbol: str, orderbook: np.ndarray) -
         'exchange': exchange,
     }
 
-    def async_save() -> None:
-        Orderbook.insert(**d).on_conflict_ignore().execute()
+    db_writer.put(Orderbook, d, ignore_conflicts=True)
+
+    if jh.is_debugging():
         print(
             jh.color(
                 f'orderbook: {jh.timestamp_to_time(d["timestamp"])}-{exchange}-{symbol}: [{orderbook[0][0][0]}, {orderbook[0][0][1]}], [{orderbook[1][0][0]}, {orderbook[1][0][1]}]',
@@ -178,9 +160,6 @@ def store_orderbook_into_db(exchange: str, symbol: str, orderbook: np.ndarray) -
             )
         )
 
-    # async call
-    threading.Thread(target=async_save).start()
-
 
 def fetch_candles_from_db(exchange: str, symbol: str, start_date: int, finish_date: int) -> tuple:
     return tuple(
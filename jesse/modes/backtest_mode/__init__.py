@@ -1,5 +1,5 @@
 import time
-from typing import Dict, Union
+from typing import Dict, Union, List
 
 import arrow
 import click
@@ -13,7 +13,8 @@ import jesse.services.selectors as selectors
 import jesse.services.table as table
 from jesse import exceptions
 from jesse.config import config
-from jesse.enums import timeframes, order_types, order_roles, order_flags
+from jesse.enums import order_types, order_roles, order_flags
+from jesse.libs import PriceTriggerIndex
 from jesse.models import Candle, Order, Position
 from jesse.modes.utils import save_daily_portfolio_balance
 from jesse.routes import router
@@ -22,10 +23,16 @@ from jesse.services import logger
 from jesse.services import quantstats
 from jesse.services import report
 from jesse.services.cache import cache
-from jesse.services.candle import generate_candle_from_one_minutes, print_candle, candle_includes_price, split_candle
+from jesse.services.candle_store import candle_store
+from jesse.services.db import fetch_candles
+from jesse.services.event_bus import event_bus
+from jesse.services.candle import generate_candle_from_one_minutes, generate_candles_from_one_minutes, print_candle, candle_includes_price, split_candle, \
+    find_gaps
 from jesse.services.file import store_logs
 from jesse.services.validators import validate_routes
 from jesse.store import store
+from jesse.store.route_handle import RouteHandle
+from jesse.strategies import VectorizedStrategy
 
 
 def run(start_date: str, finish_date: str, candles: Dict[str, Dict[str, Union[str, np.ndarray]]] = None,
@@ -147,57 +154,76 @@ def load_candles(start_date_str: str, finish_date_str: str) -> Dict[str, Dict[st
     if finish_date > arrow.utcnow().int_timestamp * 1000:
         raise ValueError("Can't load candle data from the future!")
 
-    # load and add required warm-up candles for backtest
-    if jh.is_backtesting():
-        for c in config['app']['considering_candles']:
-            required_candles.inject_required_candles_to_store(
-                required_candles.load_required_candles(c[0], c[1], start_date_str, finish_date_str),
-                c[0],
-                c[1]
-            )
-
-    # download candles for the duration of the backtest
     candles = {}
     for c in config['app']['considering_candles']:
         exchange, symbol = c[0], c[1]
 
         key = jh.key(exchange, symbol)
 
-        cache_key = f"{start_date_str}-{finish_date_str}-{key}"
-        cached_value = cache.get_value(cache_key)
-        # if cache exists
-        # not cached, get and cache for later calls in the next 5 minutes
-        # fetch from database
-        candles_tuple = cached_value or Candle.select(
-                Candle.timestamp, Candle.open, Candle.close, Candle.high, Candle.low,
-                Candle.volume
-            ).where(
-                Candle.timestamp.between(start_date, finish_date),
-                Candle.exchange == exchange,
-                Candle.symbol == symbol
-            ).order_by(Candle.timestamp.asc()).tuples()
-        # validate that there are enough candles for selected period
-        required_candles_count = (finish_date - start_date) / 60_000
-        if len(candles_tuple) == 0 or candles_tuple[-1][0] != finish_date or candles_tuple[0][0] != start_date:
-            raise exceptions.CandleNotFoundInDatabase(
-                f'Not enough candles for {symbol}. Try running "jesse import-candles"')
-        elif len(candles_tuple) != required_candles_count + 1:
-            raise exceptions.CandleNotFoundInDatabase(
-                f'There are missing candles between {start_date_str} => {finish_date_str}')
-
-        # cache it for near future calls
-        cache.set_value(cache_key, tuple(candles_tuple), expire_seconds=60 * 60 * 24 * 7)
+        if jh.is_backtesting():
+            # the warm-up and the backtest candles are loaded at once and split afterwards
+            warmup_candles, candles_array = required_candles.load_candles_with_warmup(
+                exchange, symbol, start_date_str, finish_date_str
+            )
+            required_candles.inject_required_candles_to_store(warmup_candles, exchange, symbol)
+        else:
+            # the candle store is the fastest source, then comes the cache and then the database
+            candles_array = candle_store.get(exchange, symbol, start_date, finish_date)
+
+            if candles_array is None:
+                candles_array = _load_candles_from_database(exchange, symbol, start_date, finish_date,
+                                                            start_date_str, finish_date_str)
+                candle_store.store(exchange, symbol, candles_array)
 
         candles[key] = {
             'exchange': exchange,
             'symbol': symbol,
-            'candles': np.array(candles_tuple)
+            'candles': candles_array
         }
 
     return candles
 
 
-def simulator(candles: Dict[str, Dict[str, Union[str, np.ndarray]]], hyperparameters: dict = None) -> None:
+def _load_candles_from_database(exchange: str, symbol: str, start_date: int, finish_date: int, start_date_str: str,
+                                finish_date_str: str) -> np.ndarray:
+    cache_key = f"{start_date_str}-{finish_date_str}-{jh.key(exchange, symbol)}"
+    cached_value = cache.get_value(cache_key)
+    # if cache exists
+    if isinstance(cached_value, np.ndarray):
+        return cached_value
+
+    # not cached, fetch from database
+    candles = fetch_candles(exchange, symbol, start_date, finish_date)
+    # validate that there are enough candles for selected period
+    if len(candles) == 0 or candles[-1][0] != finish_date or candles[0][0] != start_date:
+        raise exceptions.CandleNotFoundInDatabase(
+            f'Not enough candles for {symbol}. Try running "jesse import-candles"')
+    elif len(find_gaps(candles[:, 0], start_date, finish_date)):
+        raise exceptions.CandleNotFoundInDatabase(
+            f'There are missing candles between {start_date_str} => {finish_date_str}')
+
+    # cache it for near future calls
+    cache.set_value(cache_key, candles, expire_seconds=60 * 60 * 24 * 7)
+
+    return candles
+
+
+def simulator(candles: Dict[str, Dict[str, Union[str, np.ndarray]]],
+              hyperparameters: Union[dict, List[dict]] = None) -> None:
+    """
+    :param candles: the candles of all the routes
+    :param hyperparameters: either one dict of hyperparameters for all the
+    routes, or a list with one dict (or None) per route (used for optimizing
+    multiple routes)
+    """
+    # the mode and the config don't change during a simulation, so the
+    # helpers that check them don't need to read the config every time
+    with jh.frozen_runtime_context():
+        _simulate(candles, hyperparameters)
+
+
+def _simulate(candles: Dict[str, Dict[str, Union[str, np.ndarray]]],
+              hyperparameters: Union[dict, List[dict]] = None) -> None:
     begin_time_track = time.time()
     key = f"{config['app']['considering_candles'][0][0]}-{config['app']['considering_candles'][0][1]}"
     first_candles_set = candles[key]['candles']
@@ -207,7 +233,8 @@ def simulator(candles: Dict[str, Dict[str, Union[str, np.ndarray]]], hyperparame
     store.app.time = first_candles_set[0][0]
 
     # initiate strategies
-    for r in router.routes:
+    event_bus.reset()
+    for index, r in enumerate(router.routes):
         StrategyClass = jh.get_strategy_class(r.strategy_name)
 
         try:
@@ -225,14 +252,19 @@ def simulator(candles: Dict[str, Dict[str, Union[str, np.ndarray]]], hyperparame
         r.strategy.symbol = r.symbol
         r.strategy.timeframe = r.timeframe
 
-        # inject hyper parameters (used for optimize_mode)
+        # hyper parameters sent within the optimize mode
+        if isinstance(hyperparameters, list):
+            hp = hyperparameters[index]
+        else:
+            hp = hyperparameters
+
         # convert DNS string into hyperparameters
-        if r.dna and hyperparameters is None:
-            hyperparameters = jh.dna_to_hp(r.strategy.hyperparameters(), r.dna)
+        if r.dna and hp is None:
+            hp = jh.dna_to_hp(r.strategy.hyperparameters(), r.dna)
 
-        # inject hyperparameters sent within the optimize mode
-        if hyperparameters is not None:
-            r.strategy.hp = hyperparameters
+        # inject hyper parameters
+        if hp is not None:
+            r.strategy.hp = hp
 
         # init few objects that couldn't be initiated in Strategy __init__
         # it also injects hyperparameters into self.hp in case the route does not uses any DNAs
@@ -243,58 +275,77 @@ def simulator(candles: Dict[str, Dict[str, Union[str, np.ndarray]]], hyperparame
     # add initial balance
     save_daily_portfolio_balance()
 
+    # look up everything that stays the same during the simulation once instead
+    # of every minute, so the cost per route remains small with many routes
+    store.resolve_route_handles()
+    candles_sets = [(c['candles'], store.route_handles[(c['exchange'], c['symbol'])]) for c in candles.values()]
+    bigger_timeframes = [
+        (timeframe, jh.timeframe_to_one_minutes(timeframe))
+        for timeframe in config['app']['considering_timeframes'] if timeframe != '1m'
+    ]
+    routes = [(r, jh.timeframe_to_one_minutes(r.timeframe)) for r in router.routes]
+    # only positions in the isolated mode get liquidated (for now)
+    liquidation_schedules = {
+        handle.key: _LiquidationSchedule(c['candles'])
+        for c, (_, handle) in zip(candles.values(), candles_sets)
+        if handle.position is not None and handle.position.mode == 'isolated'
+    }
+    for r in router.routes:
+        r.strategy.route_handle = store.route_handles[(r.exchange, r.symbol)]
+        if isinstance(r.strategy, VectorizedStrategy):
+            r.strategy._prepare_signals(_get_route_candles(r, candles[jh.key(r.exchange, r.symbol)]['candles']))
+    print_shorter_period_candles = jh.is_debuggable('shorter_period_candles')
+    print_trading_candles = jh.is_debuggable('trading_candles')
+    update_progressbar = not jh.is_debugging() and not jh.should_execute_silently()
+
     with click.progressbar(length=length, label='Executing simulation...') as progressbar:
         for i in range(length):
             # update time
             store.app.time = first_candles_set[i][0] + 60_000
 
             # add candles
-            for j in candles:
-                short_candle = candles[j]['candles'][i]
+            for candles_set, handle in candles_sets:
+                short_candle = candles_set[i]
                 if i != 0:
-                    previous_short_candle = candles[j]['candles'][i - 1]
+                    previous_short_candle = candles_set[i - 1]
                     short_candle = _get_fixed_jumped_candle(previous_short_candle, short_candle)
-                exchange = candles[j]['exchange']
-                symbol = candles[j]['symbol']
 
-                store.candles.add_candle(short_candle, exchange, symbol, '1m', with_execution=False,
-                                         with_generation=False)
+                store.candles.add_candle(short_candle, handle.exchange_name, handle.symbol, '1m',
+                                         with_execution=False, with_generation=False, storage=handle.candles['1m'])
 
                 # print short candle
-                if jh.is_debuggable('shorter_period_candles'):
-                    print_candle(short_candle, True, symbol)
+                if print_shorter_period_candles:
+                    print_candle(short_candle, True, handle.symbol)
 
-                _simulate_price_change_effect(short_candle, exchange, symbol)
+                _simulate_price_change_effect(short_candle, handle)
 
-                # generate and add candles for bigger timeframes
-                for timeframe in config['app']['considering_timeframes']:
-                    # for 1m, no work is needed
-                    if timeframe == '1m':
-                        continue
-
-                    count = jh.timeframe_to_one_minutes(timeframe)
-                    # until = count - ((i + 1) % count)
+                # other candles can't reach the liquidation price, so they aren't checked
+                schedule = liquidation_schedules.get(handle.key)
+                if schedule is not None and schedule.should_check(i, handle.position):
+                    _check_for_liquidations(short_candle, handle)
 
+                # generate and add candles for bigger timeframes
+                for timeframe, count in bigger_timeframes:
                     if (i + 1) % count == 0:
                         generated_candle = generate_candle_from_one_minutes(
                             timeframe,
-                            candles[j]['candles'][(i - (count - 1)):(i + 1)])
-                        store.candles.add_candle(generated_candle, exchange, symbol, timeframe, with_execution=False,
-                                                 with_generation=False)
+                            candles_set[(i - (count - 1)):(i + 1)])
+                        store.candles.add_candle(generated_candle, handle.exchange_name, handle.symbol, timeframe,
+                                                 with_execution=False, with_generation=False,
+                                                 storage=handle.candles[timeframe])
 
             # update progressbar
-            if not jh.is_debugging() and not jh.should_execute_silently() and i % 60 == 0:
+            if update_progressbar and i % 60 == 0:
                 progressbar.update(60)
 
             # now that all new generated candles are ready, execute
-            for r in router.routes:
-                count = jh.timeframe_to_one_minutes(r.timeframe)
+            for r, count in routes:
                 # 1m timeframe
-                if r.timeframe == timeframes.MINUTE_1:
+                if count == 1:
                     r.strategy._execute()
                 elif (i + 1) % count == 0:
                     # print candle
-                    if jh.is_debuggable('trading_candles'):
+                    if print_trading_candles:
                         print_candle(store.candles.get_current_candle(r.exchange, r.symbol, r.timeframe), False,
                                      r.symbol)
                     r.strategy._execute()
@@ -339,60 +390,111 @@ def _get_fixed_jumped_candle(previous_candle: np.ndarray, candle: np.ndarray) ->
     return candle
 
 
-def _simulate_price_change_effect(real_candle: np.ndarray, exchange: str, symbol: str) -> None:
-    orders = store.orders.get_orders(exchange, symbol)
+def _get_fixed_jumped_candles(candles: np.ndarray) -> np.ndarray:
+    """
+    returns a copy of the candles with _get_fixed_jumped_candle() applied to
+    each of them (except the first one), the way the simulator adds them
+    """
+    candles = candles.copy()
+    previous_closes = candles[:-1, 2]
+    rest = candles[1:]
+
+    jumped_up = previous_closes < rest[:, 1]
+    jumped_down = previous_closes > rest[:, 1]
+    rest[jumped_up, 4] = np.minimum(previous_closes[jumped_up], rest[jumped_up, 4])
+    rest[jumped_down, 3] = np.maximum(previous_closes[jumped_down], rest[jumped_down, 3])
+    rest[:, 1] = previous_closes
 
+    return candles
+
+
+def _get_route_candles(r, one_minute_candles: np.ndarray) -> np.ndarray:
+    """
+    returns all the candles that the route will have by the end of the
+    simulation: the warm-up candles that are in the store already followed
+    by the ones that the simulation is going to add
+    """
+    handle = store.route_handles[(r.exchange, r.symbol)]
+    one_minute_candles = _get_fixed_jumped_candles(one_minute_candles)
+    if r.timeframe != '1m':
+        one_minute_candles = generate_candles_from_one_minutes(r.timeframe, one_minute_candles)
+
+    return np.concatenate((handle.candles[r.timeframe][:], one_minute_candles))
+
+
+def _simulate_price_change_effect(real_candle: np.ndarray, handle: RouteHandle) -> None:
     current_temp_candle = real_candle.copy()
-    executed_order = False
 
     while True:
-        if len(orders) == 0:
-            executed_order = False
-        else:
-            for index, order in enumerate(orders):
-                if index == len(orders) - 1 and not order.is_active:
-                    executed_order = False
-
-                if not order.is_active:
-                    continue
-
-                if candle_includes_price(current_temp_candle, order.price):
-                    storable_temp_candle, current_temp_candle = split_candle(current_temp_candle, order.price)
-                    store.candles.add_candle(
-                        storable_temp_candle, exchange, symbol, '1m',
-                        with_execution=False,
-                        with_generation=False
-                    )
-                    p = selectors.get_position(exchange, symbol)
-                    p.current_price = storable_temp_candle[2]
-
-                    executed_order = True
-
-                    order.execute()
-
-                    # break from the for loop, we'll try again inside the while
-                    # loop with the new current_temp_candle
-                    break
-                else:
-                    executed_order = False
-
-        if not executed_order:
-            # add/update the real_candle to the store so we can move on
-            store.candles.add_candle(
-                real_candle, exchange, symbol, '1m',
-                with_execution=False,
-                with_generation=False
-            )
-            p = selectors.get_position(exchange, symbol)
-            if p:
-                p.current_price = real_candle[2]
+        # of the orders inside the rest of the candle, the first submitted one is executed first
+        orders = store.orders.active_orders_within(handle.key, current_temp_candle[4], current_temp_candle[3])
+        if not len(orders):
             break
 
-    _check_for_liquidations(real_candle, exchange, symbol)
+        order = orders[0]
+        storable_temp_candle, current_temp_candle = split_candle(current_temp_candle, order.price)
+        store.candles.add_candle(
+            storable_temp_candle, handle.exchange_name, handle.symbol, '1m',
+            with_execution=False,
+            with_generation=False,
+            storage=handle.candles['1m']
+        )
+        handle.position.current_price = storable_temp_candle[2]
 
+        order.execute()
+
+    # add/update the real_candle to the store so we can move on
+    store.candles.add_candle(
+        real_candle, handle.exchange_name, handle.symbol, '1m',
+        with_execution=False,
+        with_generation=False,
+        storage=handle.candles['1m']
+    )
+    if handle.position:
+        handle.position.current_price = real_candle[2]
 
-def _check_for_liquidations(candle: np.ndarray, exchange: str, symbol: str) -> None:
-    p: Position = selectors.get_position(exchange, symbol)
+
+class _LiquidationSchedule:
+    """
+    Tells at which 1m candles the liquidation price of a position has to be
+    checked: the ones whose low (of long positions) or high (of short ones)
+    reaches it. The next one is looked up in a PriceTriggerIndex of the
+    candles whenever the liquidation price changes.
+    """
+    __slots__ = ('index', 'price', 'check_at')
+
+    def __init__(self, one_minute_candles: np.ndarray) -> None:
+        # the simulator fixes the jumped candles before it checks them
+        self.index = PriceTriggerIndex(_get_fixed_jumped_candles(one_minute_candles))
+        # the liquidation price that check_at was found for
+        self.price = _UNKNOWN_LIQUIDATION_PRICE
+        self.check_at = 0
+
+    def should_check(self, i: int, p: Position) -> bool:
+        price = p.liquidation_price
+        # NaN doesn't equal itself
+        if not (price == self.price or (price != price and self.price != self.price)):
+            self.price = price
+            if price != price:
+                self.check_at = self.index.length
+            elif p.type == 'long':
+                self.check_at = self.index.next_low_at_or_below(i, price)
+            else:
+                self.check_at = self.index.next_high_at_or_above(i, price)
+
+        if i < self.check_at:
+            return False
+
+        # look for the next one after this candle
+        self.price = _UNKNOWN_LIQUIDATION_PRICE
+        return True
+
+
+_UNKNOWN_LIQUIDATION_PRICE = object()
+
+
+def _check_for_liquidations(candle: np.ndarray, handle: RouteHandle) -> None:
+    p: Position = handle.position
 
     if not p:
         return
@@ -407,8 +509,8 @@ def _check_for_liquidations(candle: np.ndarray, exchange: str, symbol: str) -> N
         # create the market order that is used as the liquidation order
         order = Order({
             'id': jh.generate_unique_id(),
-            'symbol': symbol,
-            'exchange': exchange,
+            'symbol': handle.symbol,
+            'exchange': handle.exchange_name,
             'side': closing_order_side,
             'type': order_types.MARKET,
             'flag': order_flags.REDUCE_ONLY,
@@ -421,6 +523,6 @@ def _check_for_liquidations(candle: np.ndarray, exchange: str, symbol: str) -> N
 
         store.app.total_liquidations += 1
 
-        logger.info(f'{p.symbol} liquidated at {p.liquidation_price}')
+        logger.info('%s liquidated at %s', p.symbol, p.liquidation_price)
 
         order.execute()
@@ -5,28 +5,20 @@ from typing import Dict, List, Any, Union
 
 import arrow
 import click
-import pydash
+import numpy as np
 
 import jesse.helpers as jh
 from jesse.exceptions import CandleNotFoundInExchange
-from jesse.models import Candle
 from jesse.modes.import_candles_mode.drivers import drivers
 from jesse.modes.import_candles_mode.drivers.interface import CandleExchange
-from jesse.services.db import store_candles
+from jesse.services import candle_coverage
+from jesse.services import import_checkpoint
+from jesse.services.candle_store import candle_store
+from jesse.services.db import store_candles_array, fetch_candles
 
 
 def run(exchange: str, symbol: str, start_date_str: str, skip_confirmation: bool = False) -> None:
-    try:
-        start_timestamp = jh.arrow_to_timestamp(arrow.get(start_date_str, 'YYYY-MM-DD'))
-    except:
-        raise ValueError('start_date must be a string representing a date before today. ex: 2020-01-17')
-
-    # more start_date validations
-    today = arrow.utcnow().floor('day').int_timestamp * 1000
-    if start_timestamp == today:
-        raise ValueError("Today's date is not accepted. start_date must be a string a representing date BEFORE today.")
-    elif start_timestamp > today:
-        raise ValueError("Future's date is not accepted. start_date must be a string a representing date BEFORE today.")
+    start_timestamp = _validate_start_date(start_date_str)
 
     # We just call this to throw a exception in case of a symbol without dash
     jh.quote_asset(symbol)
@@ -52,6 +44,21 @@ def run(exchange: str, symbol: str, start_date_str: str, skip_confirmation: bool
         click.confirm(
             f'Importing {days_count} days candles from "{exchange}" for "{symbol}". Duplicates will be skipped. All good?', abort=True, default=True)
 
+    # the ranges of the candles that are already in the database
+    existing_ranges = candle_coverage.get(exchange, symbol)
+
+    # continue from where the last import stopped
+    resume_timestamp = import_checkpoint.resume_timestamp(
+        import_checkpoint.get(exchange, symbol), start_timestamp, existing_ranges
+    )
+    if resume_timestamp > start_timestamp:
+        print(jh.color(f'Continuing from {jh.timestamp_to_time(resume_timestamp)[:16]} where the last import stopped', 'yellow'))
+        start_date = arrow.get(resume_timestamp / 1000)
+        loop_length = int((jh.now_to_timestamp() - resume_timestamp) / 60_000 / driver.count) + 1
+
+    # the thread that stores the previous chunk
+    store_thread = None
+
     with click.progressbar(length=loop_length, label='Importing candles...') as progressbar:
         for _ in range(candles_count):
             temp_start_timestamp = start_date.int_timestamp * 1000
@@ -62,12 +69,7 @@ def run(exchange: str, symbol: str, start_date_str: str, skip_confirmation: bool
                 break
 
             # prevent duplicates calls to boost performance
-            count = Candle.select().where(
-                Candle.timestamp.between(temp_start_timestamp, temp_end_timestamp),
-                Candle.symbol == symbol,
-                Candle.exchange == exchange
-            ).count()
-            already_exists = count == driver.count
+            already_exists = candle_coverage.covers(existing_ranges, temp_start_timestamp, temp_end_timestamp)
 
             if not already_exists:
                 # it's today's candles if temp_end_timestamp < now
@@ -75,11 +77,11 @@ def run(exchange: str, symbol: str, start_date_str: str, skip_confirmation: bool
                     temp_end_timestamp = arrow.utcnow().floor('minute').int_timestamp * 1000 - 60000
 
                 # fetch from market
-                candles = driver.fetch(symbol, temp_start_timestamp)
+                candles = _candles_to_array(driver.fetch(symbol, temp_start_timestamp))
 
                 # check if candles have been returned and check those returned start with the right timestamp.
                 # Sometimes exchanges just return the earliest possible candles if the start date doesn't exist.
-                if not len(candles) or arrow.get(candles[0]['timestamp'] / 1000) > start_date:
+                if not len(candles) or arrow.get(candles[0][0] / 1000) > start_date:
                     click.clear()
                     first_existing_timestamp = driver.get_starting_time(symbol)
 
@@ -96,7 +98,7 @@ def run(exchange: str, symbol: str, start_date_str: str, skip_confirmation: bool
                         # if so, get those, if not, download from that exchange.
                         if driver.backup_exchange is not None:
                             candles = _get_candles_from_backup_exchange(
-                                exchange, driver.backup_exchange, symbol, temp_start_timestamp, temp_end_timestamp
+                                driver.backup_exchange, symbol, temp_start_timestamp, temp_end_timestamp
                             )
 
                     else:
@@ -105,17 +107,25 @@ def run(exchange: str, symbol: str, start_date_str: str, skip_confirmation: bool
                             click.confirm(
                                 f'First present candle is since {jh.timestamp_to_time(first_existing_timestamp)[:10]}. Would you like to continue?', abort=True, default=True)
 
-                        run(exchange, symbol, jh.timestamp_to_time(first_existing_timestamp)[:10], True)
-                        return
+                        # remember it so that the next imports start from there right away
+                        start_date = jh.timestamp_to_arrow(first_existing_timestamp).floor('day')
+                        import_checkpoint.save_first_timestamp(exchange, symbol, start_date.int_timestamp * 1000)
+                        continue
 
                 # fill absent candles (if there's any)
                 candles = _fill_absent_candles(candles, temp_start_timestamp, temp_end_timestamp)
 
-                # store in the database
+                # keep a copy in the candle store which is much faster to load than the database
+                candle_store.store(exchange, symbol, candles)
+
+                # store in the database. Chunks are stored one at a time so that the checkpoint stays in order
+                if store_thread is not None:
+                    store_thread.join()
                 if skip_confirmation:
-                    store_candles(candles)
+                    _store_chunk(exchange, symbol, candles)
                 else:
-                    threading.Thread(target=store_candles, args=[candles]).start()
+                    store_thread = threading.Thread(target=_store_chunk, args=[exchange, symbol, candles])
+                    store_thread.start()
 
             # add as much as driver's count to the temp_start_time
             start_date = start_date.shift(minutes=driver.count)
@@ -126,35 +136,38 @@ def run(exchange: str, symbol: str, start_date_str: str, skip_confirmation: bool
             if not already_exists:
                 time.sleep(driver.sleep_time)
 
+    if store_thread is not None:
+        store_thread.join()
+
+
+def _store_chunk(exchange: str, symbol: str, candles: np.ndarray) -> None:
+    store_candles_array(exchange, symbol, candles)
+    import_checkpoint.save_progress(exchange, symbol, candles[-1][0])
+
+
+def _validate_start_date(start_date_str: str) -> int:
+    try:
+        start_timestamp = jh.arrow_to_timestamp(arrow.get(start_date_str, 'YYYY-MM-DD'))
+    except:
+        raise ValueError('start_date must be a string representing a date before today. ex: 2020-01-17')
+
+    # more start_date validations
+    today = arrow.utcnow().floor('day').int_timestamp * 1000
+    if start_timestamp == today:
+        raise ValueError("Today's date is not accepted. start_date must be a string a representing date BEFORE today.")
+    elif start_timestamp > today:
+        raise ValueError("Future's date is not accepted. start_date must be a string a representing date BEFORE today.")
+
+    return start_timestamp
+
 
-def _get_candles_from_backup_exchange(exchange: str, backup_driver: CandleExchange, symbol: str, start_timestamp: int,
-                                      end_timestamp: int) -> List[Dict[str, Union[str, Any]]]:
-    total_candles = []
+def _get_candles_from_backup_exchange(backup_driver: CandleExchange, symbol: str, start_timestamp: int,
+                                      end_timestamp: int) -> np.ndarray:
     # try fetching from database first
-    backup_candles = Candle.select(
-        Candle.timestamp, Candle.open, Candle.close, Candle.high, Candle.low,
-        Candle.volume
-    ).where(
-        Candle.timestamp.between(start_timestamp, end_timestamp),
-        Candle.exchange == backup_driver.name,
-        Candle.symbol == symbol).order_by(Candle.timestamp.asc()).tuples()
+    backup_candles = fetch_candles(backup_driver.name, symbol, start_timestamp, end_timestamp)
     already_exists = len(backup_candles) == (end_timestamp - start_timestamp) / 60_000 + 1
     if already_exists:
-        # loop through them and set new ID and exchange
-        for c in backup_candles:
-            total_candles.append({
-                'id': jh.generate_unique_id(),
-                'symbol': symbol,
-                'exchange': exchange,
-                'timestamp': c[0],
-                'open': c[1],
-                'close': c[2],
-                'high': c[3],
-                'low': c[4],
-                'volume': c[5]
-            })
-
-        return total_candles
+        return backup_candles
 
     # try fetching from market now
     days_count = jh.date_diff_in_days(jh.timestamp_to_arrow(start_timestamp), jh.timestamp_to_arrow(end_timestamp))
@@ -164,6 +177,7 @@ def _get_candles_from_backup_exchange(exchange: str, backup_driver: CandleExchan
         days_count = math.ceil(days_count)
     candles_count = days_count * 1440
     start_date = jh.timestamp_to_arrow(start_timestamp).floor('day')
+    existing_ranges = candle_coverage.get(backup_driver.name, symbol)
     for _ in range(candles_count):
         temp_start_timestamp = start_date.int_timestamp * 1000
         temp_end_timestamp = temp_start_timestamp + (backup_driver.count - 1) * 60000
@@ -173,12 +187,7 @@ def _get_candles_from_backup_exchange(exchange: str, backup_driver: CandleExchan
             break
 
         # prevent duplicates
-        count = Candle.select().where(
-            Candle.timestamp.between(temp_start_timestamp, temp_end_timestamp),
-            Candle.symbol == symbol,
-            Candle.exchange == backup_driver.name
-        ).count()
-        already_exists = count == backup_driver.count
+        already_exists = candle_coverage.covers(existing_ranges, temp_start_timestamp, temp_end_timestamp)
 
         if not already_exists:
             # it's today's candles if temp_end_timestamp < now
@@ -186,7 +195,7 @@ def _get_candles_from_backup_exchange(exchange: str, backup_driver: CandleExchan
                 temp_end_timestamp = arrow.utcnow().floor('minute').int_timestamp * 1000 - 60000
 
             # fetch from market
-            candles = backup_driver.fetch(symbol, temp_start_timestamp)
+            candles = _candles_to_array(backup_driver.fetch(symbol, temp_start_timestamp))
 
             if not len(candles):
                 raise CandleNotFoundInExchange(
@@ -198,7 +207,7 @@ def _get_candles_from_backup_exchange(exchange: str, backup_driver: CandleExchan
             candles = _fill_absent_candles(candles, temp_start_timestamp, temp_end_timestamp)
 
             # store in the database
-            store_candles(candles)
+            store_candles_array(backup_driver.name, symbol, candles)
 
         # add as much as driver's count to the temp_start_time
         start_date = start_date.shift(minutes=backup_driver.count)
@@ -210,82 +219,50 @@ def _get_candles_from_backup_exchange(exchange: str, backup_driver: CandleExchan
     # now try fetching from database again. Why? because we might have fetched more
     # than what's needed, but we only want as much was requested. Don't worry, the next
     # request will probably fetch from database and there won't be any waste!
-    backup_candles = Candle.select(
-        Candle.timestamp, Candle.open, Candle.close, Candle.high, Candle.low,
-        Candle.volume
-    ).where(
-        Candle.timestamp.between(start_timestamp, end_timestamp),
-        Candle.exchange == backup_driver.name,
-        Candle.symbol == symbol).order_by(Candle.timestamp.asc()).tuples()
+    backup_candles = fetch_candles(backup_driver.name, symbol, start_timestamp, end_timestamp)
     already_exists = len(backup_candles) == (end_timestamp - start_timestamp) / 60_000 + 1
     if already_exists:
-        # loop through them and set new ID and exchange
-        for c in backup_candles:
-            total_candles.append({
-                'id': jh.generate_unique_id(),
-                'symbol': symbol,
-                'exchange': exchange,
-                'timestamp': c[0],
-                'open': c[1],
-                'close': c[2],
-                'high': c[3],
-                'low': c[4],
-                'volume': c[5]
-            })
-
-        return total_candles
-
-
-def _fill_absent_candles(temp_candles: List[Dict[str, Union[str, Any]]], start_timestamp: int, end_timestamp: int) -> List[Dict[str, Union[str, Any]]]:
-    if not temp_candles:
+        return backup_candles
+
+
+def _candles_to_array(candles: List[Dict[str, Union[str, Any]]]) -> np.ndarray:
+    return np.array(
+        [[c['timestamp'], c['open'], c['close'], c['high'], c['low'], c['volume']] for c in candles],
+        dtype=np.float64
+    ).reshape(-1, 6)
+
+
+def _fill_absent_candles(temp_candles: np.ndarray, start_timestamp: int, end_timestamp: int) -> np.ndarray:
+    """
+    returns one candle for every minute from start_timestamp to end_timestamp.
+    Absent candles get the close of the previous candle (or the open of the
+    first one if they come before it) as their prices and a volume of 0.
+    """
+    # the backup exchange returns None when it doesn't have the candles either
+    if temp_candles is None or not len(temp_candles):
         raise CandleNotFoundInExchange(
             f'No candles exists in the market for this day: {jh.timestamp_to_time(start_timestamp)[:10]} \n'
             'Try another start_date'
         )
 
-    symbol = temp_candles[0]['symbol']
-    exchange = temp_candles[0]['exchange']
-    candles = []
-    first_candle = temp_candles[0]
-    started = False
-    loop_length = ((end_timestamp - start_timestamp) / 60000) + 1
-
-    for _ in range(int(loop_length)):
-        candle_for_timestamp = pydash.find(
-            temp_candles, lambda c: c['timestamp'] == start_timestamp)
-
-        if candle_for_timestamp is None:
-            if started:
-                last_close = candles[-1]['close']
-                candles.append({
-                    'id': jh.generate_unique_id(),
-                    'symbol': symbol,
-                    'exchange': exchange,
-                    'timestamp': start_timestamp,
-                    'open': last_close,
-                    'high': last_close,
-                    'low': last_close,
-                    'close': last_close,
-                    'volume': 0
-                })
-            else:
-                candles.append({
-                    'id': jh.generate_unique_id(),
-                    'symbol': symbol,
-                    'exchange': exchange,
-                    'timestamp': start_timestamp,
-                    'open': first_candle['open'],
-                    'high': first_candle['open'],
-                    'low': first_candle['open'],
-                    'close': first_candle['open'],
-                    'volume': 0
-                })
-        # candle is present
-        else:
-            started = True
-            candles.append(candle_for_timestamp)
-
-        start_timestamp += 60000
-    return candles
+    count = int((end_timestamp - start_timestamp) / 60000) + 1
+    rows = (temp_candles[:, 0] - start_timestamp) // 60000
+    present = (rows >= 0) & (rows < count) & (temp_candles[:, 0] % 60000 == start_timestamp % 60000)
+
+    candles = np.zeros((count, 6))
+    candles[:, 0] = start_timestamp + np.arange(count) * 60000
+    candles[rows[present].astype(int), 1:] = temp_candles[present, 1:]
 
+    is_present = np.zeros(count, dtype=bool)
+    is_present[rows[present].astype(int)] = True
+    if is_present.all():
+        return candles
 
+    # the index of the last present candle for every row
+    previous = np.maximum.accumulate(np.where(is_present, np.arange(count), -1))
+    absent = ~is_present
+    prices = np.where(previous >= 0, candles[np.maximum(previous, 0), 2], temp_candles[0][1])
+    candles[absent, 1:5] = prices[absent, None]
+    candles[absent, 5] = 0
+
+    return candles
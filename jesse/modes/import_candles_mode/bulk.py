@@ -0,0 +1,240 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import zip_longest
+from typing import Dict, List, Tuple, Callable, Union
+
+import arrow
+import click
+import numpy as np
+
+import jesse.helpers as jh
+from jesse.modes.import_candles_mode import _validate_start_date, _fill_absent_candles, _candles_to_array
+from jesse.modes.import_candles_mode.drivers import drivers
+from jesse.modes.import_candles_mode.drivers.interface import CandleExchange
+from jesse.services import candle_coverage
+from jesse.services import import_checkpoint
+from jesse.services.candle_store import candle_store
+from jesse.services.db import store_candles_array
+from jesse.services.token_bucket import TokenBucket
+
+
+class CandleWriter:
+    """
+    Stores the candles that the fetching threads put into a bounded queue from
+    a single thread, in batches of about batch_size candles. A full queue blocks
+    the fetching threads, so memory stays bounded when the database is slower
+    than the exchanges.
+    """
+
+    def __init__(self, store: Callable[[str, str, np.ndarray], None] = None,
+                 batch_size: int = 10_000, max_queue_size: int = 50) -> None:
+        self.store = store or _store
+        self.batch_size = batch_size
+        self.queue = queue.Queue(max_queue_size)
+        self.stored_count = 0
+        self.error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def put(self, exchange: str, symbol: str, candles: np.ndarray) -> None:
+        if self.error is not None:
+            raise self.error
+
+        self.queue.put((exchange, symbol, candles))
+
+    def close(self) -> None:
+        """
+        stores what's left in the queue and waits for the writer thread to finish
+        """
+        self.queue.put(None)
+        self._thread.join()
+
+        if self.error is not None:
+            raise self.error
+
+    def _run(self) -> None:
+        # candles of each exchange and symbol are stored separately
+        batches = {}
+        count = 0
+
+        while True:
+            item = self.queue.get()
+
+            if item is not None:
+                exchange, symbol, candles = item
+                batches.setdefault((exchange, symbol), []).append(candles)
+                count += len(candles)
+
+            if item is None or count >= self.batch_size:
+                # after a failure, keep draining the queue so the fetching threads don't block forever
+                if self.error is None:
+                    try:
+                        for (exchange, symbol), arrays in batches.items():
+                            batch = np.concatenate(arrays)
+                            self.store(exchange, symbol, batch)
+                            self.stored_count += len(batch)
+                    except Exception as e:
+                        self.error = e
+                batches = {}
+                count = 0
+
+            if item is None:
+                return
+
+
+def run(pairs: List[Tuple[str, str]], start_date_str: str, workers: int = None) -> None:
+    """
+    imports candles of many exchange/symbol pairs at the same time. Requests to
+    each exchange are limited by its driver's rate_limit_per_second. Without
+    any pairs, the ones that have been imported before get updated.
+    """
+    start_timestamp = _validate_start_date(start_date_str)
+
+    if not len(pairs):
+        pairs = import_checkpoint.pairs()
+        if not len(pairs):
+            raise ValueError('No candles have been imported before. Enter the pairs to import.')
+
+    exchange_drivers = {}
+    jobs = []
+    for exchange, symbol in pairs:
+        # We just call this to throw a exception in case of a symbol without dash
+        jh.quote_asset(symbol)
+        symbol = symbol.upper()
+
+        if exchange not in exchange_drivers:
+            try:
+                exchange_drivers[exchange] = drivers[exchange]()
+            except KeyError:
+                raise ValueError(f'{exchange} is not a supported exchange')
+            except TypeError:
+                raise FileNotFoundError('You are missing the "plugins.py" file')
+
+        jobs.append((
+            exchange_drivers[exchange], symbol, candle_coverage.get(exchange, symbol),
+            import_checkpoint.get(exchange, symbol)
+        ))
+
+    begin_time = time.time()
+    writer = CandleWriter()
+    writer.start()
+    imported_count, failures = import_pairs(jobs, start_timestamp, writer, workers)
+    writer.close()
+
+    print(
+        f'Imported {imported_count} candles of {len(pairs) - len(failures)} pairs in '
+        f'{round(time.time() - begin_time, 2)} seconds'
+    )
+    for (exchange, symbol), error in failures.items():
+        print(jh.color(f'Failed to import {exchange} {symbol}: {error}', 'red'))
+
+
+def import_pairs(jobs: List[Tuple[CandleExchange, str, List[Tuple[int, int]], Union[dict, None]]],
+                 start_timestamp: int, writer: CandleWriter,
+                 workers: int = None) -> Tuple[int, Dict[Tuple[str, str], str]]:
+    """
+    :param jobs: the driver, the symbol, the ranges of candles that already exist and the import checkpoint of each pair
+    :return: the number of imported candles and the errors of the pairs that failed
+    """
+    if workers is None:
+        workers = min(32, 4 * len(jobs))
+
+    buckets = {}
+    for driver, _, _, _ in jobs:
+        if driver.name not in buckets:
+            buckets[driver.name] = TokenBucket(driver.rate_limit_per_second)
+
+    imported_count = 0
+    failures = {}
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        # first, find out which chunks of each pair have to be fetched
+        futures = {
+            executor.submit(
+                _chunks, driver, buckets[driver.name], symbol, start_timestamp, existing_ranges, checkpoint
+            ): (driver, symbol)
+            for driver, symbol, existing_ranges, checkpoint in jobs
+        }
+        chunks_of_pairs = []
+        for future in as_completed(futures):
+            driver, symbol = futures[future]
+            try:
+                chunks_of_pairs.append([(driver, symbol, chunk) for chunk in future.result()])
+            except Exception as e:
+                failures[(driver.name, symbol)] = str(e)
+
+        # take turns between pairs so that the requests are spread over all the exchanges
+        chunks = [c for round_ in zip_longest(*chunks_of_pairs) for c in round_ if c is not None]
+
+        futures = {
+            executor.submit(_import_chunk, driver, buckets[driver.name], symbol, chunk, writer): (driver, symbol)
+            for driver, symbol, chunk in chunks
+        }
+        with click.progressbar(length=len(futures), label='Importing candles...') as progressbar:
+            for future in as_completed(futures):
+                driver, symbol = futures[future]
+                try:
+                    imported_count += future.result()
+                except Exception as e:
+                    failures.setdefault((driver.name, symbol), str(e))
+                progressbar.update(1)
+
+    return imported_count, failures
+
+
+def _chunks(driver: CandleExchange, bucket: TokenBucket, symbol: str, start_timestamp: int,
+            existing_ranges: List[Tuple[int, int]], checkpoint: Union[dict, None]) -> List[int]:
+    """
+    returns the start timestamps of the chunks that aren't in the database yet
+    """
+    # start from the first day the market has candles for, which the checkpoint might know already
+    if checkpoint is None or checkpoint['first_timestamp'] is None:
+        bucket.acquire()
+        first_existing_timestamp = driver.get_starting_time(symbol)
+        if first_existing_timestamp is not None and first_existing_timestamp > start_timestamp:
+            start_timestamp = jh.timestamp_to_arrow(first_existing_timestamp).floor('day').int_timestamp * 1000
+            import_checkpoint.save_first_timestamp(driver.name, symbol, start_timestamp)
+
+    # continue from where the last import stopped
+    start_timestamp = import_checkpoint.resume_timestamp(checkpoint, start_timestamp, existing_ranges)
+
+    now = jh.now_to_timestamp()
+    chunks = []
+    for chunk_start in range(start_timestamp, now, driver.count * 60_000):
+        chunk_end = chunk_start + (driver.count - 1) * 60_000
+        if not candle_coverage.covers(existing_ranges, chunk_start, chunk_end):
+            chunks.append(chunk_start)
+
+    return chunks
+
+
+def _import_chunk(driver: CandleExchange, bucket: TokenBucket, symbol: str, start_timestamp: int,
+                  writer: CandleWriter) -> int:
+    end_timestamp = start_timestamp + (driver.count - 1) * 60_000
+    # it's today's candles if end_timestamp < now
+    if end_timestamp > jh.now_to_timestamp():
+        end_timestamp = arrow.utcnow().floor('minute').int_timestamp * 1000 - 60_000
+
+    bucket.acquire()
+    candles = _candles_to_array(driver.fetch(symbol, start_timestamp))
+
+    # the market might not have candles for this chunk
+    if not len(candles):
+        return 0
+
+    candles = _fill_absent_candles(candles, start_timestamp, end_timestamp)
+    writer.put(driver.name, symbol, candles)
+
+    return len(candles)
+
+
+def _store(exchange: str, symbol: str, candles: np.ndarray) -> None:
+    store_candles_array(exchange, symbol, candles)
+    # chunks are stored out of order, but resume_timestamp() makes sure no gap is skipped
+    import_checkpoint.save_progress(exchange, symbol, candles[:, 0].max())
+    # keep a copy in the candle store which is much faster to load than the database
+    candle_store.store(exchange, symbol, candles)
@@ -0,0 +1,144 @@
+import glob
+import os
+import time
+import zipfile
+from typing import IO, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+import jesse.helpers as jh
+from jesse.modes.import_candles_mode import _fill_absent_candles
+from jesse.services.candle_store import candle_store
+from jesse.services.db import copy_candles
+
+
+def run(exchange: str, symbol: str, paths: List[str], chunk_rows: int = 100_000) -> None:
+    """
+    imports 1m klines from CSV files (or ZIP files of CSV files) like the ones
+    on data.binance.vision. Directories are searched for .csv and .zip files.
+    Files are read chunk_rows rows at a time, so memory usage doesn't depend on
+    their size.
+    """
+    # We just call this to throw a exception in case of a symbol without dash
+    jh.quote_asset(symbol)
+    symbol = symbol.upper()
+
+    files = find_files(paths)
+    if not len(files):
+        raise FileNotFoundError('No .csv or .zip files were found')
+
+    begin_time = time.time()
+    total_rows = 0
+    for path in files:
+        file_begin_time = time.time()
+        file_rows = 0
+
+        for candles in read_candles(path, chunk_rows):
+            copy_candles(exchange, symbol, candles)
+            # keep a copy in the candle store which is much faster to load than the database
+            candle_store.store(exchange, symbol, candles)
+            file_rows += len(candles)
+
+        total_rows += file_rows
+        print(f'{os.path.basename(path)}: {file_rows} candles ({_rate(file_rows, file_begin_time)} rows/sec)')
+
+    print(
+        jh.color(
+            f'Imported {total_rows} candles of {exchange} {symbol} from {len(files)} files in '
+            f'{round(time.time() - begin_time, 2)} seconds ({_rate(total_rows, begin_time)} rows/sec)',
+            'green'
+        )
+    )
+
+
+def find_files(paths: List[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += glob.glob(os.path.join(path, '*.csv')) + glob.glob(os.path.join(path, '*.zip'))
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            raise FileNotFoundError(f'{path} does not exist')
+
+    # the names of Binance's dumps end with the date, so sorting puts them in order
+    return sorted(set(files))
+
+
+def read_candles(path: str, chunk_rows: int = 100_000) -> Iterator[np.ndarray]:
+    """
+    yields the candles of a CSV or ZIP file in chunks of up to chunk_rows rows.
+    Candles that don't start at a minute or that come before a previous one are
+    dropped, and absent candles are filled in (also between chunks).
+    """
+    previous_candle = None
+
+    for f in _open_csv_files(path):
+        with f:
+            for rows in _read_rows(f, chunk_rows):
+                candles = _rows_to_candles(rows)
+
+                if previous_candle is not None:
+                    candles = candles[candles[:, 0] > previous_candle[0]]
+                if not len(candles):
+                    continue
+
+                # include the last candle of the previous chunk so that gaps between chunks get filled too
+                if previous_candle is not None and candles[0][0] > previous_candle[0] + 60_000:
+                    candles = _fill_absent_candles(
+                        np.concatenate(([previous_candle], candles)), previous_candle[0], candles[-1][0]
+                    )[1:]
+                else:
+                    candles = _fill_absent_candles(candles, candles[0][0], candles[-1][0])
+
+                previous_candle = candles[-1].copy()
+                yield candles
+
+
+def _open_csv_files(path: str) -> Iterator[IO[bytes]]:
+    if not zipfile.is_zipfile(path):
+        yield open(path, 'rb')
+        return
+
+    with zipfile.ZipFile(path) as z:
+        for name in sorted(z.namelist()):
+            if name.lower().endswith('.csv'):
+                yield z.open(name)
+
+
+def _read_rows(f: IO[bytes], chunk_rows: int) -> Iterator[np.ndarray]:
+    """
+    yields the first six columns (open time, open, high, low, close, volume)
+    """
+    # newer dumps come with a header
+    first_line = f.readline()
+    if not len(first_line.strip()):
+        return
+    f.seek(0)
+    has_header = not first_line.split(b',')[0].strip().isdigit()
+
+    for chunk in pd.read_csv(f, header=None, skiprows=1 if has_header else 0, usecols=range(6), dtype=np.float64,
+                             chunksize=chunk_rows):
+        yield chunk.to_numpy()
+
+
+def _rows_to_candles(rows: np.ndarray) -> np.ndarray:
+    # Binance's columns are open time, open, high, low and close; jesse's are timestamp, open, close, high and low
+    candles = rows[:, [0, 1, 4, 2, 3, 5]]
+
+    # newer dumps use microseconds instead of milliseconds
+    candles[candles[:, 0] > 1e14, 0] //= 1000
+
+    candles = candles[(candles[:, 0] % 60_000 == 0) & ~np.isnan(candles).any(axis=1)]
+
+    # keep the rows in order; files are normally already sorted, so this is cheap
+    if len(candles) > 1 and np.any(np.diff(candles[:, 0]) <= 0):
+        candles = candles[np.argsort(candles[:, 0], kind='stable')]
+        candles = candles[np.concatenate(([True], np.diff(candles[:, 0]) > 0))]
+
+    return candles
+
+
+def _rate(rows: int, begin_time: float) -> int:
+    return round(rows / max(time.time() - begin_time, 1e-6))
@@ -5,7 +5,7 @@ from abc import ABC, abstractmethod
 from random import randint, choices, choice
 
 # for macOS only
-from typing import Dict, Union, Any, List
+from typing import Dict, Union, Any, List, Callable
 
 if sys.platform == 'darwin':
     multiprocessing.set_start_method('fork')
@@ -44,7 +44,7 @@ class Genetics(ABC):
 
         self.options = {} if options is None else options
         os.makedirs('./storage/temp/optimize', exist_ok=True)
-        self.temp_path = f"./storage/temp/optimize/{self.options['strategy_name']}-{self.options['exchange']}-{self.options['symbol']}-{self.options['timeframe']}-{self.options['start_date']}-{self.options['finish_date']}.pickle"
+        self.temp_path = f"./storage/temp/optimize/{self.study_name}.pickle"
 
         if fitness_goal > 1 or fitness_goal < 0:
             raise ValueError('fitness scores must be between 0 and 1')
@@ -55,76 +55,127 @@ class Genetics(ABC):
         ):
             self.load_progress()
 
+    @property
+    def study_name(self) -> str:
+        """
+        the name of the files the session is stored in
+        """
+        if 'study_name' in self.options:
+            return self.options['study_name']
+
+        return f"{self.options['strategy_name']}-{self.options['exchange']}-{self.options['symbol']}-{self.options['timeframe']}-{self.options['start_date']}-{self.options['finish_date']}"
+
     @abstractmethod
     def fitness(self, dna: str) -> tuple:
         """
-        calculates and returns the fitness score the the DNA
+        calculates and returns the fitness score the the DNA. The testing log can be
+        returned as None in which case testing() is called later on if the DNA
+        makes it to the top of the population.
         """
         pass
 
-    def generate_initial_population(self) -> None:
+    def dna_to_hp(self, dna: str) -> Union[dict, list]:
         """
-        generates the initial population
+        decodes the DNA into hyperparameters
         """
-        loop_length = int(self.population_size / self.cpu_cores)
+        return jh.dna_to_hp(self.options['strategy_hp'], dna)
 
-        with click.progressbar(length=loop_length, label='Generating initial population...') as progressbar:
-            for i in range(loop_length):
-                people = []
-                with Manager() as manager:
-                    dna_bucket = manager.list([])
-                    workers = []
-
-                    def get_fitness(dna: str, dna_bucket: list) -> None:
-                        try:
-                            # check if the DNA is already in the list
-                            if all(dna_tuple[0] != dna for dna_tuple in dna_bucket):
-                                fitness_score, fitness_log_training, fitness_log_testing = self.fitness(dna)
-                                dna_bucket.append((dna, fitness_score, fitness_log_training, fitness_log_testing))
-                            else:
-                                raise ValueError(f"Initial Population: Double DNA: {dna}")
-                        except Exception as e:
-                            proc = os.getpid()
-                            logger.error(f'process failed - ID: {str(proc)}')
-                            logger.error("".join(traceback.TracebackException.from_exception(e).format()))
-                            raise e
+    def testing(self, dna: str) -> Dict[str, Any]:
+        """
+        returns the testing log of the DNA
+        """
+        return {'win_rate': None, 'total': None, 'net_profit_percentage': None}
 
-                    try:
-                        for _ in range(self.cpu_cores):
-                            dna = ''.join(choices(self.charset, k=self.solution_len))
-                            w = Process(target=get_fitness, args=(dna, dna_bucket))
-                            w.start()
-                            workers.append(w)
-
-                        # join workers
-                        for w in workers:
-                            w.join()
-                            if w.exitcode > 0:
-                                logger.error(f'a process exited with exitcode: {str(w.exitcode)}')
-                    except KeyboardInterrupt:
-                        print(
-                            jh.color('Terminating session...', 'red')
-                        )
+    @staticmethod
+    def run_workers(target: Callable, args_list: List[tuple]) -> list:
+        """
+        runs target(*args, bucket) for each of the args in a separate process and
+        returns what the processes have appended to the shared bucket
+        """
+        with Manager() as manager:
+            bucket = manager.list([])
+            workers = []
+
+            def run(args: tuple, bucket: list) -> None:
+                try:
+                    target(*args, bucket)
+                except Exception as e:
+                    proc = os.getpid()
+                    logger.error(f'process failed - ID: {str(proc)}')
+                    logger.error("".join(traceback.TracebackException.from_exception(e).format()))
+                    raise e
+
+            try:
+                for args in args_list:
+                    w = Process(target=run, args=(args, bucket))
+                    w.start()
+                    workers.append(w)
+
+                for w in workers:
+                    w.join()
+                    if w.exitcode > 0:
+                        logger.error(f'a process exited with exitcode: {str(w.exitcode)}')
+            except KeyboardInterrupt:
+                print(
+                    jh.color('Terminating session...', 'red')
+                )
+
+                # terminate all workers
+                for w in workers:
+                    w.terminate()
+
+                # shutdown the manager process manually since garbage collection cannot won't get to do it for us
+                manager.shutdown()
+
+                # now we can terminate the main session safely
+                jh.terminate_app()
 
-                        # terminate all workers
-                        for w in workers:
-                            w.terminate()
+            return list(bucket)
 
-                        # shutdown the manager process manually since garbage collection cannot won't get to do it for us
-                        manager.shutdown()
+    def evaluate_testing(self, people: List[Dict[str, Union[str, Any]]]) -> None:
+        """
+        fills the testing logs of the individuals that don't have one yet; as many
+        at a time as there are CPU cores. Individuals that were only scored on a
+        portion of the training candles are never backtested on the testing ones.
+        """
+        people = [p for p in people if p.get('fidelity', 1) == 1]
+        dnas = list(dict.fromkeys(p['dna'] for p in people if p['testing_log'] is None))
+        testing_logs = {}
 
-                        # now we can terminate the main session safely
-                        jh.terminate_app()
-                    except:
-                        raise
+        def get_testing_log(dna: str, log_bucket: list) -> None:
+            log_bucket.append((dna, self.testing(dna)))
+
+        for i in range(0, len(dnas), self.cpu_cores):
+            log_bucket = self.run_workers(get_testing_log, [(dna,) for dna in dnas[i:i + self.cpu_cores]])
+            for dna, testing_log in log_bucket:
+                testing_logs[dna] = testing_log
 
-                    for d in dna_bucket:
-                        people.append({
-                            'dna': d[0],
-                            'fitness': d[1],
-                            'training_log': d[2],
-                            'testing_log': d[3]
-                        })
+        for p in people:
+            if p['dna'] in testing_logs:
+                p['testing_log'] = testing_logs[p['dna']]
+
+    def generate_initial_population(self) -> None:
+        """
+        generates the initial population
+        """
+        loop_length = int(self.population_size / self.cpu_cores)
+
+        def get_fitness(dna: str, dna_bucket: list) -> None:
+            # check if the DNA is already in the list
+            if any(dna_tuple[0] == dna for dna_tuple in dna_bucket):
+                raise ValueError(f"Initial Population: Double DNA: {dna}")
+
+            fitness_score, fitness_log_training, fitness_log_testing = self.fitness(dna)
+            dna_bucket.append((dna, fitness_score, fitness_log_training, fitness_log_testing))
+
+        with click.progressbar(length=loop_length, label='Generating initial population...') as progressbar:
+            for i in range(loop_length):
+                dnas = [''.join(choices(self.charset, k=self.solution_len)) for _ in range(self.cpu_cores)]
+                dna_bucket = self.run_workers(get_fitness, [(dna,) for dna in dnas])
+                people = [
+                    {'dna': d[0], 'fitness': d[1], 'training_log': d[2], 'testing_log': d[3]}
+                    for d in dna_bucket
+                ]
 
                 # update dashboard
                 click.clear()
@@ -135,7 +186,7 @@ class Genetics(ABC):
                     ['Started at', jh.timestamp_to_arrow(self.start_time).humanize()],
                     ['Index', f'{len(self.population)}/{self.population_size}'],
                     ['errors/info', f'{len(store.logs.errors)}/{len(store.logs.info)}'],
-                    ['Trading Route', f'{router.routes[0].exchange}, {router.routes[0].symbol}, {router.routes[0].timeframe}, {router.routes[0].strategy_name}'],
+                    *self.routes_table_items(),
                     # TODO: add generated DNAs?
                     # ['-'*10, '-'*10],
                     # ['DNA', people[0]['dna']],
@@ -228,154 +279,118 @@ class Genetics(ABC):
 
         loop_length = int(self.iterations / self.cpu_cores)
 
+        def get_baby(people: List) -> None:
+            # let's make a baby together LOL
+            baby = self.make_love()
+            # let's mutate baby's genes, who knows, maybe we create a x-man or something
+            baby = self.mutate(baby)
+            people.append(baby)
+
         i = self.started_index
         with click.progressbar(length=loop_length, label='Evolving...') as progressbar:
             while i < loop_length:
-                with Manager() as manager:
-                    people = manager.list([])
-                    workers = []
-
-                    def get_baby(people: List) -> None:
-                        try:
-                            # let's make a baby together LOL
-                            baby = self.make_love()
-                            # let's mutate baby's genes, who knows, maybe we create a x-man or something
-                            baby = self.mutate(baby)
-                            people.append(baby)
-                        except Exception as e:
-                            proc = os.getpid()
-                            logger.error(f'process failed - ID: {str(proc)}')
-                            logger.error("".join(traceback.TracebackException.from_exception(e).format()))
-                            raise e
-
-                    try:
-                        for _ in range(self.cpu_cores):
-                            w = Process(target=get_baby, args=[people])
-                            w.start()
-                            workers.append(w)
-
-                        for w in workers:
-                            w.join()
-                            if w.exitcode > 0:
-                                logger.error(f'a process exited with exitcode: {str(w.exitcode)}')
-                    except KeyboardInterrupt:
-                        print(
-                            jh.color('Terminating session...', 'red')
-                        )
+                people = self.run_workers(get_baby, [()] * self.cpu_cores)
 
-                        # terminate all workers
-                        for w in workers:
-                            w.terminate()
+                # update dashboard
+                click.clear()
+                progressbar.update(1)
+                print('\n')
 
-                        # shutdown the manager process manually since garbage collection cannot won't get to do it for us
-                        manager.shutdown()
+                table_items = [
+                    ['Started At', jh.timestamp_to_arrow(self.start_time).humanize()],
+                    ['Index/Total', f'{(i + 1) * self.cpu_cores}/{self.iterations}'],
+                    ['errors/info', f'{len(store.logs.errors)}/{len(store.logs.info)}'],
+                    *self.routes_table_items()
+                ]
+                if jh.is_debugging():
+                    table_items.insert(
+                        3,
+                        ['Population Size, Solution Length',
+                         f'{self.population_size}, {self.solution_len}']
+                    )
 
-                        # now we can terminate the main session safely
-                        jh.terminate_app()
-                    except:
-                        raise
+                table.key_value(table_items, 'info', alignments=('left', 'right'))
 
-                    # update dashboard
-                    click.clear()
-                    progressbar.update(1)
+                # errors
+                if jh.is_debugging() and len(report.errors()):
                     print('\n')
+                    table.key_value(report.errors(), 'Error Logs')
+
+                print('\n')
+                print('Best DNA candidates:')
+                print('\n')
+
+                # print fittest individuals
+                if jh.is_debugging():
+                    fittest_list = [['Rank', 'DNA', 'Fitness', 'Training log || Testing log'], ]
+                else:
+                    fittest_list = [['Rank', 'DNA', 'Training log || Testing log'], ]
+                if self.population_size > 50:
+                    number_of_ind_to_show = 15
+                elif self.population_size > 20:
+                    number_of_ind_to_show = 10
+                elif self.population_size > 9:
+                    number_of_ind_to_show = 9
+                else:
+                    raise ValueError('self.population_size cannot be less than 10')
+
+                # only the individuals that are shown need to be backtested on the testing candles
+                self.evaluate_testing(self.population[:number_of_ind_to_show])
 
-                    table_items = [
-                        ['Started At', jh.timestamp_to_arrow(self.start_time).humanize()],
-                        ['Index/Total', f'{(i + 1) * self.cpu_cores}/{self.iterations}'],
-                        ['errors/info', f'{len(store.logs.errors)}/{len(store.logs.info)}'],
-                        ['Route', f'{router.routes[0].exchange}, {router.routes[0].symbol}, {router.routes[0].timeframe}, {router.routes[0].strategy_name}']
-                    ]
+                for j in range(number_of_ind_to_show):
+                    log = self.individual_log(self.population[j])
                     if jh.is_debugging():
-                        table_items.insert(
-                            3,
-                            ['Population Size, Solution Length',
-                             f'{self.population_size}, {self.solution_len}']
+                        fittest_list.append(
+                            [
+                                j + 1,
+                                self.population[j]['dna'],
+                                self.population[j]['fitness'],
+                                log
+                            ],
+                        )
+                    else:
+                        fittest_list.append(
+                            [
+                                j + 1,
+                                self.population[j]['dna'],
+                                log
+                            ],
                         )
 
-                    table.key_value(table_items, 'info', alignments=('left', 'right'))
+                if jh.is_debugging():
+                    table.multi_value(fittest_list, with_headers=True, alignments=('left', 'left', 'right', 'left'))
+                else:
+                    table.multi_value(fittest_list, with_headers=True, alignments=('left', 'left', 'left'))
+
+                # one person has to die and be replaced with the newborn baby
+                for baby in people:
+                    random_index = randint(1, len(self.population) - 1)  # never kill our best perforemr
+                    try:
+                        self.population[random_index] = baby
+                    except IndexError:
+                        print('=============')
+                        print(f'self.population_size: {self.population_size}')
+                        print(f'self.population length: {len(self.population)}')
+                        jh.terminate_app()
+
+                    self.population = list(sorted(self.population, key=lambda x: x['fitness'], reverse=True))
 
-                    # errors
-                    if jh.is_debugging() and len(report.errors()):
+                    # reaching the fitness goal could also end the process
+                    if baby['fitness'] >= self.fitness_goal:
+                        progressbar.update(self.iterations - i)
                         print('\n')
-                        table.key_value(report.errors(), 'Error Logs')
+                        print(f'fitness goal reached after iteration {i}')
+                        return baby
 
-                    print('\n')
-                    print('Best DNA candidates:')
-                    print('\n')
+                # save progress after every n iterations
+                if i != 0 and int(i * self.cpu_cores) % 50 == 0:
+                    self.save_progress(i)
 
-                    # print fittest individuals
-                    if jh.is_debugging():
-                        fittest_list = [['Rank', 'DNA', 'Fitness', 'Training log || Testing log'], ]
-                    else:
-                        fittest_list = [['Rank', 'DNA', 'Training log || Testing log'], ]
-                    if self.population_size > 50:
-                        number_of_ind_to_show = 15
-                    elif self.population_size > 20:
-                        number_of_ind_to_show = 10
-                    elif self.population_size > 9:
-                        number_of_ind_to_show = 9
-                    else:
-                        raise ValueError('self.population_size cannot be less than 10')
-
-                    for j in range(number_of_ind_to_show):
-                        log = f"win_rate: {round(self.population[j]['training_log']['win_rate'], 2) if self.population[j]['training_log']['win_rate'] else None}, total: {self.population[j]['training_log']['total']}, net_profit_percentage: {round(self.population[j]['training_log']['net_profit_percentage'], 2) if self.population[j]['training_log']['net_profit_percentage'] else None }% || win_rate: {round(self.population[j]['testing_log']['win_rate'], 2) if self.population[j]['testing_log']['win_rate'] else None}, total: {self.population[j]['testing_log']['total']}, net_profit_percentage: {round(self.population[j]['testing_log']['net_profit_percentage'], 2) if self.population[j]['testing_log']['net_profit_percentage'] else None}%"
-                        if self.population[j]['testing_log']['net_profit_percentage'] is not None and self.population[j]['training_log'][
-                            'net_profit_percentage'] > 0 and self.population[j]['testing_log'][
-                            'net_profit_percentage'] > 0:
-                            log = jh.style(log, 'bold')
-                        if jh.is_debugging():
-                            fittest_list.append(
-                                [
-                                    j + 1,
-                                    self.population[j]['dna'],
-                                    self.population[j]['fitness'],
-                                    log
-                                ],
-                            )
-                        else:
-                            fittest_list.append(
-                                [
-                                    j + 1,
-                                    self.population[j]['dna'],
-                                    log
-                                ],
-                            )
+                # store a take_snapshot of the fittest individuals of the population
+                if i != 0 and i % int(100 / self.cpu_cores) == 0:
+                    self.take_snapshot(i * self.cpu_cores)
 
-                    if jh.is_debugging():
-                        table.multi_value(fittest_list, with_headers=True, alignments=('left', 'left', 'right', 'left'))
-                    else:
-                        table.multi_value(fittest_list, with_headers=True, alignments=('left', 'left', 'left'))
-
-                    # one person has to die and be replaced with the newborn baby
-                    for baby in people:
-                        random_index = randint(1, len(self.population) - 1)  # never kill our best perforemr
-                        try:
-                            self.population[random_index] = baby
-                        except IndexError:
-                            print('=============')
-                            print(f'self.population_size: {self.population_size}')
-                            print(f'self.population length: {len(self.population)}')
-                            jh.terminate_app()
-
-                        self.population = list(sorted(self.population, key=lambda x: x['fitness'], reverse=True))
-
-                        # reaching the fitness goal could also end the process
-                        if baby['fitness'] >= self.fitness_goal:
-                            progressbar.update(self.iterations - i)
-                            print('\n')
-                            print(f'fitness goal reached after iteration {i}')
-                            return baby
-
-                    # save progress after every n iterations
-                    if i != 0 and int(i * self.cpu_cores) % 50 == 0:
-                        self.save_progress(i)
-
-                    # store a take_snapshot of the fittest individuals of the population
-                    if i != 0 and i % int(100 / self.cpu_cores) == 0:
-                        self.take_snapshot(i * self.cpu_cores)
-
-                    i += 1
+                i += 1
 
         print('\n\n')
         print(f'Finished {self.iterations} iterations.')
@@ -384,6 +399,30 @@ class Genetics(ABC):
     def run(self) -> List[Any]:
         return self.evolve()
 
+    @staticmethod
+    def routes_table_items() -> List[List[str]]:
+        return [
+            ['Route' if len(router.routes) == 1 else f'Route {i + 1}', f'{r.exchange}, {r.symbol}, {r.timeframe}, {r.strategy_name}']
+            for i, r in enumerate(router.routes)
+        ]
+
+    @staticmethod
+    def individual_log(individual: Dict[str, Union[str, Any]], highlight: bool = True) -> str:
+        """
+        formats the training and testing logs of an individual for the dashboard
+        """
+        training_log = individual['training_log']
+        # the ones that didn't make it to the top are never backtested on the testing candles
+        testing_log = individual['testing_log'] or {'win_rate': None, 'total': None, 'net_profit_percentage': None}
+        log = f"win_rate: {round(training_log['win_rate'], 2) if training_log['win_rate'] else None}, total: {training_log['total']}, net_profit_percentage: {round(training_log['net_profit_percentage'], 2) if training_log['net_profit_percentage'] else None}% || win_rate: {round(testing_log['win_rate'], 2) if testing_log['win_rate'] else None}, total: {testing_log['total']}, net_profit_percentage: {round(testing_log['net_profit_percentage'], 2) if testing_log['net_profit_percentage'] else None}%"
+
+        if highlight and testing_log['net_profit_percentage'] is not None and training_log[
+            'net_profit_percentage'] is not None and training_log['net_profit_percentage'] > 0 and testing_log[
+            'net_profit_percentage'] > 0:
+            log = jh.style(log, 'bold')
+
+        return log
+
     def save_progress(self, iterations_index: int) -> None:
         """
         pickles data so we can later resume optimizing
@@ -422,14 +461,19 @@ class Genetics(ABC):
         """
         stores a snapshot of the fittest population members into a file.
         """
-        study_name = f"{self.options['strategy_name']}-{self.options['exchange']}-{ self.options['symbol']}-{self.options['timeframe']}-{self.options['start_date']}-{self.options['finish_date']}"
+        study_name = self.study_name
+
+        self.evaluate_testing(self.population[:30])
 
         dnas_json = {'snapshot': []}
         for i in range(30):
-            dnas_json['snapshot'].append(
-                {'iteration': index, 'dna': self.population[i]['dna'], 'fitness': self.population[i]['fitness'],
-                 'training_log': self.population[i]['training_log'], 'testing_log': self.population[i]['testing_log'],
-                 'parameters': jh.dna_to_hp(self.options['strategy_hp'], self.population[i]['dna'])})
+            row = {'iteration': index, 'dna': self.population[i]['dna'], 'fitness': self.population[i]['fitness'],
+                   'training_log': self.population[i]['training_log'], 'testing_log': self.population[i]['testing_log'],
+                   'parameters': self.dna_to_hp(self.population[i]['dna'])}
+            # search engines that score on a portion of the training candles tag their individuals
+            if 'fidelity' in self.population[i]:
+                row['fidelity'] = self.population[i]['fidelity']
+            dnas_json['snapshot'].append(row)
 
         path = f'./storage/genetics/{study_name}.txt'
         os.makedirs('./storage/genetics', exist_ok=True)
@@ -440,10 +484,12 @@ class Genetics(ABC):
             txt += '\n'
 
             for i in range(30):
-                log = f"win_rate: {round(self.population[i]['training_log']['win_rate'], 2) if self.population[i]['training_log']['win_rate'] else None}, total: {self.population[i]['training_log']['total']}, net_profit_percentage: {round(self.population[i]['training_log']['net_profit_percentage'], 2) if self.population[i]['training_log']['net_profit_percentage'] else None}% || win_rate: {round(self.population[i]['testing_log']['win_rate'], 2) if self.population[i]['testing_log']['win_rate'] else None}, total: {self.population[i]['testing_log']['total']}, net_profit_percentage: {round(self.population[i]['testing_log']['net_profit_percentage'], 2) if self.population[i]['testing_log']['net_profit_percentage'] else None}%"
+                log = self.individual_log(self.population[i], highlight=False)
 
                 txt += '\n'
                 txt += f"{i + 1} ==  {self.population[i]['dna']}  ==  {self.population[i]['fitness']}  ==  {log}"
+                if self.population[i].get('fidelity', 1) < 1:
+                    txt += f"  ==  fidelity: {round(self.population[i]['fidelity'] * 100)}%"
 
             f.write(txt)
 
@@ -0,0 +1,112 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Union, Any, List
+
+import click
+
+import jesse.helpers as jh
+from jesse.services import table
+
+
+class SearchEngine(ABC):
+    """
+    The interface for alternatives to the genetics algorithm. An engine proposes
+    DNAs and the optimizer scores them using the same fitness() method the
+    genetics algorithm uses. The results end up in optimizer.population so that
+    exporting snapshots works the same for all engines.
+    """
+    title = ''
+
+    def __init__(self, optimizer) -> None:
+        self.optimizer = optimizer
+        self.start_time = jh.now_to_timestamp()
+        self.total_evaluations = 0
+
+    @abstractmethod
+    def run(self) -> List[Any]:
+        pass
+
+    def evaluate(self, dnas: List[str], label: str, fidelity: float = 1) -> List[Dict[str, Union[str, Any]]]:
+        """
+        runs the fitness function for all the DNAs; as many at a time as there are CPU cores
+        """
+        cpu_cores = self.optimizer.cpu_cores
+        people = []
+
+        with click.progressbar(length=len(dnas), label=label) as progressbar:
+            for i in range(0, len(dnas), cpu_cores):
+                people += self._evaluate_batch(dnas[i:i + cpu_cores], fidelity)
+                progressbar.update(len(dnas[i:i + cpu_cores]))
+
+        self.total_evaluations += len(dnas)
+
+        return self.sort_by_fitness(people)
+
+    @staticmethod
+    def sort_by_fitness(people: List[Dict[str, Union[str, Any]]]) -> List[Dict[str, Union[str, Any]]]:
+        return list(sorted(people, key=lambda x: x['fitness'], reverse=True))
+
+    @staticmethod
+    def sort_by_fidelity(people: List[Dict[str, Union[str, Any]]]) -> List[Dict[str, Union[str, Any]]]:
+        """
+        fitness scores of different fidelities are not comparable, so the ones
+        scored on more of the training candles always rank higher
+        """
+        return list(sorted(people, key=lambda x: (x['fidelity'], x['fitness']), reverse=True))
+
+    def _evaluate_batch(self, dnas: List[str], fidelity: float) -> List[Dict[str, Union[str, Any]]]:
+        def get_fitness(dna: str, dna_bucket: list) -> None:
+            fitness_score, fitness_log_training, fitness_log_testing = self.optimizer.fitness(dna, fidelity)
+            dna_bucket.append((dna, fitness_score, fitness_log_training, fitness_log_testing))
+
+        dna_bucket = self.optimizer.run_workers(get_fitness, [(dna,) for dna in dnas])
+
+        return [
+            {'dna': d[0], 'fitness': d[1], 'training_log': d[2], 'testing_log': d[3], 'fidelity': fidelity}
+            for d in dna_bucket
+        ]
+
+    def finish(self, population: List[Dict[str, Union[str, Any]]], table_items: list) -> List[Any]:
+        """
+        stores the results in the optimizer, prints them and exports a snapshot
+        """
+        self.optimizer.population = population
+
+        if not len(population) or population[0]['fitness'] == 0.0001:
+            print(jh.color('Cannot continue because no individual with the minimum fitness-score was found. '
+                           'Your strategy seems to be flawed or maybe it requires modifications. ', 'yellow'))
+            jh.terminate_app()
+
+        # only the ones that get displayed or exported, and were scored on
+        # the full training window, are backtested on the testing candles
+        self.optimizer.evaluate_testing([p for p in population[:30] if p['fidelity'] == 1])
+
+        self.print_results(table_items)
+
+        if len(population) >= 30:
+            self.optimizer.take_snapshot(self.total_evaluations)
+
+        return population
+
+    def print_results(self, table_items: list) -> None:
+        click.clear()
+        print('\n')
+
+        table_items = [
+            ['Started At', jh.timestamp_to_arrow(self.start_time).humanize()],
+            ['Evaluations', self.total_evaluations],
+            *table_items,
+            *self.optimizer.routes_table_items()
+        ]
+        table.key_value(table_items, self.title, alignments=('left', 'right'))
+
+        print('\n')
+        print('Best DNA candidates:')
+        print('\n')
+
+        fittest_list = [['Rank', 'DNA', 'Fitness', 'Fidelity', 'Training log || Testing log'], ]
+        for j, individual in enumerate(self.optimizer.population[:15]):
+            fittest_list.append([
+                j + 1, individual['dna'], round(individual['fitness'], 4), f"{round(individual['fidelity'] * 100)}%",
+                self.optimizer.individual_log(individual)
+            ])
+        table.multi_value(fittest_list, with_headers=True, alignments=('left', 'left', 'right', 'right', 'left'))
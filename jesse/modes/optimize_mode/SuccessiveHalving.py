@@ -0,0 +1,74 @@
+from random import choices
+from typing import List, Any
+
+from .SearchEngine import SearchEngine
+
+
+class SuccessiveHalving(SearchEngine):
+    """
+    Successive halving (the building block of Hyperband): every candidate DNA is
+    first backtested on a short slice of the training candles. Only the best
+    1/eta of each rung gets promoted to a longer slice, and only the finalists
+    are backtested on the full training window and the testing candles.
+
+    The eliminated candidates are kept in the results, tagged with the
+    fidelity they were last scored on, and always rank below the finalists.
+    """
+    title = 'Successive Halving'
+
+    def __init__(self, optimizer, population_size: int = None, rungs: int = 3, eta: int = 3) -> None:
+        if rungs < 1:
+            raise ValueError('rungs must be at least 1')
+        if eta < 2:
+            raise ValueError('eta must be at least 2')
+
+        super().__init__(optimizer)
+
+        if population_size is None:
+            population_size = optimizer.population_size
+
+        self.eta = eta
+
+        # there's no point in asking for more candidates than the charset can produce
+        self.population_size = min(population_size, len(optimizer.charset) ** optimizer.solution_len)
+
+        # portions of the training candles used at each rung. ex: [1/9, 1/3, 1]
+        self.fidelities = [1 / eta ** (rungs - 1 - r) for r in range(rungs)]
+
+        # how many backtests on the full training window would have cost the same
+        self.full_window_equivalents = 0
+
+    def generate_candidates(self) -> List[str]:
+        dnas = set()
+        while len(dnas) < self.population_size:
+            dnas.add(''.join(choices(self.optimizer.charset, k=self.optimizer.solution_len)))
+
+        return list(dnas)
+
+    def run(self) -> List[Any]:
+        candidates = self.generate_candidates()
+        # candidates that didn't make it to the next rung
+        eliminated = []
+        finalists = []
+
+        for rung, fidelity in enumerate(self.fidelities):
+            is_final_rung = rung == len(self.fidelities) - 1
+            people = self.evaluate(
+                candidates,
+                f'Rung {rung + 1}/{len(self.fidelities)}: {len(candidates)} candidates on {round(fidelity * 100)}% of training candles...',
+                fidelity
+            )
+            self.full_window_equivalents += len(candidates) * fidelity
+
+            if is_final_rung:
+                finalists = people
+                break
+
+            promoted_count = max(int(len(people) / self.eta), 1)
+            candidates = [p['dna'] for p in people[:promoted_count]]
+            eliminated += people[promoted_count:]
+
+        return self.finish(self.sort_by_fidelity(finalists + eliminated), [
+            ['Rungs', ', '.join(f'{round(f * 100)}%' for f in self.fidelities)],
+            ['Full-window equivalents', round(self.full_window_equivalents, 1)],
+        ])
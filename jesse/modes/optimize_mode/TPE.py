@@ -0,0 +1,131 @@
+from math import ceil
+from typing import Any, List, Iterable
+
+import click
+import numpy as np
+
+from .SearchEngine import SearchEngine
+
+
+def parzen_log_density(points: np.ndarray, samples: np.ndarray, bandwidth: np.ndarray, width: int) -> np.ndarray:
+    """
+    log-density of a Parzen estimator (one Gaussian per sample mixed with a
+    uniform prior over the charset) at each point. Genes are treated as
+    independent so the densities of all genes are multiplied.
+
+    :param points: (m, solution_len) charset indexes to evaluate
+    :param samples: (n, solution_len) charset indexes of observed DNAs
+    :param bandwidth: (solution_len,) standard deviation of the Gaussians
+    :param width: length of the charset
+    """
+    z = (points[:, None, :] - samples[None, :, :]) / bandwidth
+    kernels = np.exp(-0.5 * z ** 2) / (np.sqrt(2 * np.pi) * bandwidth)
+    density = (kernels.sum(axis=1) + 1 / width) / (len(samples) + 1)
+    return np.log(density).sum(axis=1)
+
+
+class TPE(SearchEngine):
+    """
+    Tree-structured Parzen Estimator. After a few random trials, the observed
+    DNAs are split into a "good" group (the best gamma portion) and a "bad" one.
+    New DNAs are sampled around the good ones and the ones that are the most
+    likely under the good group's density compared to the bad group's get
+    backtested next. Each round proposes as many DNAs as there are CPU cores.
+    """
+    title = 'Tree-structured Parzen Estimator'
+
+    def __init__(self, optimizer, trials: int = None, startup_trials: int = None, gamma: float = 0.25,
+                 candidates_count: int = 24, seed: int = None) -> None:
+        if not 0 < gamma < 1:
+            raise ValueError('gamma must be between 0 and 1')
+
+        super().__init__(optimizer)
+
+        self.width = len(optimizer.charset)
+        # there's no point in asking for more trials than the charset can produce
+        space = self.width ** optimizer.solution_len
+        # the genetics algorithm runs 2000 * solution_len iterations on top of the initial population
+        self.trials = min(trials or 100 * optimizer.solution_len, space)
+        self.startup_trials = min(startup_trials or max(10, 2 * optimizer.solution_len), self.trials)
+        self.gamma = gamma
+        # number of samples drawn from the "good" density per proposed DNA
+        self.candidates_count = candidates_count
+        self.rng = np.random.default_rng(seed)
+
+        self.population = []
+        self.seen = set()
+
+    def dna_to_indexes(self, dna: str) -> List[int]:
+        return [self.optimizer.charset.index(c) for c in dna]
+
+    def indexes_to_dna(self, indexes: np.ndarray) -> str:
+        return ''.join(self.optimizer.charset[int(i)] for i in indexes)
+
+    def random_dnas(self, count: int, exclude: Iterable[str] = ()) -> List[str]:
+        """
+        returns count random DNAs that haven't been seen, and aren't in exclude
+        """
+        exclude = set(exclude)
+        dnas = []
+        while len(dnas) < count:
+            dna = self.indexes_to_dna(self.rng.integers(0, self.width, self.optimizer.solution_len))
+            if dna not in self.seen and dna not in exclude and dna not in dnas:
+                dnas.append(dna)
+
+        return dnas
+
+    def propose(self, count: int) -> List[str]:
+        """
+        returns the DNAs to backtest next
+        """
+        # at least one good and one bad DNA are needed to build the densities
+        if len(self.population) < max(self.startup_trials, 2):
+            return self.random_dnas(count)
+
+        # self.population is sorted by fitness
+        observed = np.array([self.dna_to_indexes(p['dna']) for p in self.population], dtype=float)
+        good_count = min(max(ceil(self.gamma * len(observed)), 1), len(observed) - 1)
+        good, bad = observed[:good_count], observed[good_count:]
+
+        # Scott's rule, but never narrower than one step of the charset
+        bandwidth = np.maximum(1.06 * observed.std(axis=0) * len(observed) ** -0.2, 1)
+
+        # sample around the good DNAs; some samples come from the uniform prior instead
+        samples_count = count * self.candidates_count
+        centers = good[self.rng.integers(0, good_count, samples_count)]
+        points = centers + self.rng.normal(0, 1, centers.shape) * bandwidth
+        from_prior = self.rng.random(samples_count) < 1 / (good_count + 1)
+        points[from_prior] = self.rng.uniform(0, self.width - 1, (from_prior.sum(), observed.shape[1]))
+        points = np.clip(np.rint(points), 0, self.width - 1)
+
+        scores = (
+            parzen_log_density(points, good, bandwidth, self.width)
+            - parzen_log_density(points, bad, bandwidth, self.width)
+        )
+
+        dnas = []
+        for i in np.argsort(-scores):
+            dna = self.indexes_to_dna(points[i])
+            if dna not in self.seen and dna not in dnas:
+                dnas.append(dna)
+                if len(dnas) == count:
+                    return dnas
+
+        # the samples were all duplicates which happens when it has converged
+        return dnas + self.random_dnas(count - len(dnas), exclude=dnas)
+
+    def run(self) -> List[Any]:
+        with click.progressbar(length=self.trials, label='Running trials...') as progressbar:
+            while self.total_evaluations < self.trials:
+                dnas = self.propose(min(self.optimizer.cpu_cores, self.trials - self.total_evaluations))
+                self.seen.update(dnas)
+                self.population = self.sort_by_fitness(self.population + self._evaluate_batch(dnas, 1))
+                self.total_evaluations += len(dnas)
+                progressbar.update(len(dnas))
+
+        return self.finish(self.population, [
+            ['Trials', self.trials],
+            ['Random trials', self.startup_trials],
+            ['Gamma', self.gamma],
+        ])
+
@@ -17,27 +17,39 @@ from jesse.services import metrics as stats
 from jesse.services.validators import validate_routes
 from jesse.store import store
 from .Genetics import Genetics
+from .SuccessiveHalving import SuccessiveHalving
+from .TPE import TPE
 
 os.environ['NUMEXPR_MAX_THREADS'] = str(cpu_count())
 
+# search engines that can be used instead of the genetics algorithm
+engines = {
+    'successive-halving': SuccessiveHalving,
+    'tpe': TPE,
+}
+
 
 class Optimizer(Genetics):
     def __init__(self, training_candles: ndarray, testing_candles: ndarray, optimal_total: int, cpu_cores: int, csv: bool,
                  json: bool, start_date: str, finish_date: str) -> None:
-        if len(router.routes) != 1:
-            raise NotImplementedError('optimize_mode mode only supports one route at the moment')
-
         self.strategy_name = router.routes[0].strategy_name
         self.optimal_total = optimal_total
         self.exchange = router.routes[0].exchange
         self.symbol = router.routes[0].symbol
         self.timeframe = router.routes[0].timeframe
-        StrategyClass = jh.get_strategy_class(self.strategy_name)
-        self.strategy_hp = StrategyClass.hyperparameters(None)
-        solution_len = len(self.strategy_hp)
+        # with multiple routes, the DNA is made of one block of genes per route
+        self.routes_hp = [jh.get_strategy_class(r.strategy_name).hyperparameters(None) for r in router.routes]
+        self.strategy_hp = self.routes_hp[0]
+        solution_len = sum(len(hp) for hp in self.routes_hp)
 
         if solution_len == 0:
-            raise exceptions.InvalidStrategy('Targeted strategy does not implement a valid hyperparameters() method.')
+            if len(router.routes) == 1:
+                raise exceptions.InvalidStrategy('Targeted strategy does not implement a valid hyperparameters() method.')
+            raise exceptions.InvalidStrategy('None of the strategies of the routes implement a valid hyperparameters() method.')
+
+        routes_count = len(router.routes)
+        more = f"-and-{routes_count - 1}-more" if routes_count > 1 else ""
+        study_name = f'{self.strategy_name}-{self.exchange}-{self.symbol}-{self.timeframe}{more}-{start_date}-{finish_date}'
 
         super().__init__(
             iterations=2000 * solution_len,
@@ -48,7 +60,9 @@ class Optimizer(Genetics):
                 'exchange': self.exchange,
                 'symbol': self.symbol,
                 'timeframe': self.timeframe,
+                'study_name': study_name,
                 'strategy_hp': self.strategy_hp,
+                'routes_hp': self.routes_hp,
                 'csv': csv,
                 'json': json,
                 'start_date': start_date,
@@ -83,22 +97,66 @@ class Optimizer(Genetics):
                 required_candles.load_required_candles(c[0], c[1], testing_candles_start_date,
                                                        testing_candles_finish_date))
 
-    def fitness(self, dna: str) -> tuple:
-        hp = jh.dna_to_hp(self.strategy_hp, dna)
+        # inject the warm-up candles once and keep a copy of the candle store for each
+        # period. The workers are forked from this process so they all inherit them.
+        self.training_candles_snapshot = self.warm_up_candles_snapshot(self.training_initial_candles)
+        self.testing_candles_snapshot = self.warm_up_candles_snapshot(self.testing_initial_candles)
 
-        # init candle store
+    @staticmethod
+    def warm_up_candles_snapshot(initial_candles: list) -> dict:
         store.candles.init_storage(5000)
-        # inject required TRAINING candles to the candle store
 
         for num, c in enumerate(config['app']['considering_candles']):
-            required_candles.inject_required_candles_to_store(
-                self.training_initial_candles[num],
-                c[0],
-                c[1]
-            )
+            required_candles.inject_required_candles_to_store(initial_candles[num], c[0], c[1])
+
+        snapshot = store.candles.snapshot()
+        store.reset()
+        return snapshot
+
+    def training_candles_slice(self, fidelity: float) -> Dict[str, Dict[str, Union[str, ndarray]]]:
+        """
+        returns the beginning of the training candles that is as long as the
+        fidelity (a number between 0 and 1) requires. The slice always starts at
+        the same timestamp as the full window, so the same warm-up candles apply.
+        """
+        if fidelity >= 1:
+            return self.training_candles
+
+        key = jh.key(self.exchange, self.symbol)
+        days_count = len(self.training_candles[key]['candles']) // 1440
+        slice_length = max(int(days_count * fidelity), 1) * 1440
+
+        return {
+            k: {
+                'exchange': v['exchange'],
+                'symbol': v['symbol'],
+                'candles': v['candles'][:slice_length],
+            } for k, v in self.training_candles.items()
+        }
+
+    def dna_to_hp(self, dna: str) -> Union[dict, list]:
+        """
+        the hyperparameters of the strategy, or with multiple routes, a list
+        with the hyperparameters of each route
+        """
+        if len(self.routes_hp) == 1:
+            return jh.dna_to_hp(self.strategy_hp, dna)
+
+        return jh.dna_to_routes_hp(self.routes_hp, dna)
+
+    def fitness(self, dna: str, fidelity: float = 1) -> tuple:
+        """
+        :param dna: str
+        :param fidelity: the portion of the training candles to backtest on. Anything
+        below 1 is a cheap estimation used by the successive halving mode.
+        """
+        hp = self.dna_to_hp(dna)
+
+        # candle store with the required TRAINING candles already injected
+        store.candles.restore(self.training_candles_snapshot)
 
         # run backtest simulation
-        simulator(self.training_candles, hp)
+        simulator(self.training_candles_slice(fidelity), hp)
 
         training_data = {'win_rate': None, 'total': None,
                         'net_profit_percentage': None}
@@ -109,8 +167,13 @@ class Optimizer(Genetics):
         # I'm guessing we should accept "optimal" total from command line
         if store.completed_trades.count > 5:
             training_data = stats.trades(store.completed_trades.trades, store.app.daily_balance)
-            total_effect_rate = log10(training_data['total']) / log10(self.optimal_total)
-            total_effect_rate = min(total_effect_rate, 1)
+            # a shorter training period is expected to have fewer trades
+            optimal_total = self.optimal_total * min(fidelity, 1)
+            if optimal_total > 1:
+                total_effect_rate = log10(training_data['total']) / log10(optimal_total)
+                total_effect_rate = min(total_effect_rate, 1)
+            else:
+                total_effect_rate = 1
             ratio_config = jh.get_config('env.optimization.ratio', 'sharpe')
             if ratio_config == 'sharpe':
                 ratio = training_data['sharpe_ratio']
@@ -140,42 +203,54 @@ class Optimizer(Genetics):
             if ratio < 0:
                 score = 0.0001
                 # reset store
-                store.reset()
+                store.reset_simulation()
                 return score, training_data, testing_data
 
             score = total_effect_rate * ratio_normalized
+            # the testing candles are only backtested for the DNAs that make it to the
+            # top of the population. See testing() and Genetics.evaluate_testing()
+            testing_data = None
 
-            # perform backtest with testing data. this is using data
-            # model hasn't trained for. if it works well, there is
-            # high change it will do good with future data too.
-            store.reset()
-            store.candles.init_storage(5000)
-            # inject required TESTING candles to the candle store
+        else:
+            score = 0.0001
 
-            for num, c in enumerate(config['app']['considering_candles']):
-                required_candles.inject_required_candles_to_store(
-                    self.testing_initial_candles[num],
-                    c[0],
-                    c[1]
-                )
+        # reset store
+        store.reset_simulation()
 
-            # run backtest simulation
-            simulator(self.testing_candles, hp)
+        return score, training_data, testing_data
 
-            # log for debugging/monitoring
-            if store.completed_trades.count > 0:
-                testing_data = stats.trades(store.completed_trades.trades, store.app.daily_balance)
+    def testing(self, dna: str) -> dict:
+        """
+        performs backtest with testing data. this is using data
+        model hasn't trained for. if it works well, there is
+        high change it will do good with future data too.
+        """
+        hp = self.dna_to_hp(dna)
 
-        else:
-            score = 0.0001
+        testing_data = {'win_rate': None, 'total': None,
+                        'net_profit_percentage': None}
+
+        # candle store with the required TESTING candles already injected
+        store.candles.restore(self.testing_candles_snapshot)
+
+        # run backtest simulation
+        simulator(self.testing_candles, hp)
+
+        # log for debugging/monitoring
+        if store.completed_trades.count > 0:
+            testing_data = stats.trades(store.completed_trades.trades, store.app.daily_balance)
 
         # reset store
-        store.reset()
+        store.reset_simulation()
+
+        return testing_data
 
-        return score, training_data, testing_data
 
+def optimize_mode(start_date: str, finish_date: str, optimal_total: int, cpu_cores: int, csv: bool, json: bool,
+                  engine: str = 'genetics') -> None:
+    if engine != 'genetics' and engine not in engines:
+        raise ValueError(f'Unknown optimization engine `{engine}`. Choose between genetics, {", ".join(engines)}.')
 
-def optimize_mode(start_date: str, finish_date: str, optimal_total: int, cpu_cores: int, csv: bool, json: bool) -> None:
     # clear the screen
     click.clear()
     print('loading candles...')
@@ -192,7 +267,10 @@ def optimize_mode(start_date: str, finish_date: str, optimal_total: int, cpu_cor
 
     optimizer = Optimizer(training_candles, testing_candles, optimal_total, cpu_cores, csv, json, start_date, finish_date)
 
-    optimizer.run()
+    if engine == 'genetics':
+        optimizer.run()
+    else:
+        engines[engine](optimizer).run()
 
     # TODO: store hyper parameters into each strategies folder per each Exchange-symbol-timeframe
 
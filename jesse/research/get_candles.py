@@ -3,7 +3,7 @@ import numpy as np
 
 def get_candles(exchange: str, symbol: str, timeframe: str, start_date: str, finish_date: str) -> np.ndarray:
     """
-    Returns candles from the database in numpy format
+    Returns candles from the candle store or the database in numpy format
 
     :param exchange: str
     :param symbol: str
@@ -19,9 +19,10 @@ def get_candles(exchange: str, symbol: str, timeframe: str, start_date: str, fin
     import arrow
 
     import jesse.helpers as jh
-    from jesse.models import Candle
     from jesse.exceptions import CandleNotFoundInDatabase
     from jesse.services.candle import generate_candle_from_one_minutes
+    from jesse.services.candle_store import candle_store
+    from jesse.services.db import fetch_candles
 
     start_date = jh.arrow_to_timestamp(arrow.get(start_date, 'YYYY-MM-DD'))
     finish_date = jh.arrow_to_timestamp(arrow.get(finish_date, 'YYYY-MM-DD')) - 60000
@@ -34,20 +35,18 @@ def get_candles(exchange: str, symbol: str, timeframe: str, start_date: str, fin
     if finish_date > arrow.utcnow().int_timestamp * 1000:
         raise ValueError('Can\'t backtest the future!')
 
-    # fetch from database
-    candles_tuple = Candle.select(
-        Candle.timestamp, Candle.open, Candle.close, Candle.high, Candle.low,
-        Candle.volume
-    ).where(
-        Candle.timestamp.between(start_date, finish_date),
-        Candle.exchange == exchange,
-        Candle.symbol == symbol).order_by(Candle.timestamp.asc()).tuples()
+    # the candle store is much faster than the database
+    candles = candle_store.get(exchange, symbol, start_date, finish_date)
 
-    candles = np.array(tuple(candles_tuple))
+    if candles is None:
+        # fetch from database
+        candles = fetch_candles(exchange, symbol, start_date, finish_date)
 
-    # validate that there are enough candles for selected period
-    if len(candles) == 0 or candles[-1][0] != finish_date or candles[0][0] != start_date:
-        raise CandleNotFoundInDatabase(f'Not enough candles for {symbol}. Try running "jesse import-candles"')
+        # validate that there are enough candles for selected period
+        if len(candles) == 0 or candles[-1][0] != finish_date or candles[0][0] != start_date:
+            raise CandleNotFoundInDatabase(f'Not enough candles for {symbol}. Try running "jesse import-candles"')
+
+        candle_store.store(exchange, symbol, candles)
 
     if timeframe == '1m':
         return candles
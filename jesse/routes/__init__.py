@@ -1,5 +1,5 @@
 import sys
-from typing import List, Any
+from typing import List, Any, Union
 
 import jesse.helpers as jh
 from jesse import exceptions
@@ -12,11 +12,14 @@ class RouterClass:
         self.routes = []
         self.extra_candles = []
         self.market_data = []
+        # (exchange, symbol) => Route
+        self._routes_by_pair = {}
 
     def _reset(self) -> None:
         self.routes = []
         self.extra_candles = []
         self.market_data = []
+        self._routes_by_pair = {}
 
     def set_routes(self, routes: List[Any]) -> None:
         self._reset()
@@ -52,6 +55,11 @@ class RouterClass:
 
             self.routes.append(Route(*r))
 
+        self._routes_by_pair = {(r.exchange, r.symbol): r for r in self.routes}
+
+    def get_route(self, exchange: str, symbol: str) -> Union[Route, None]:
+        return self._routes_by_pair.get((exchange, symbol))
+
     def set_market_data(self, routes: List[Any]) -> None:
         self.market_data = []
         for r in routes:
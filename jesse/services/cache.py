@@ -1,83 +1,155 @@
 import os
 import pickle
+import sqlite3
 from time import time
 from typing import Any
 from functools import lru_cache
 
+import numpy as np
+
 import jesse.helpers as jh
 
 
 class Cache:
+    """
+    Numpy arrays are stored in raw .npy files which are loaded as memory-mapped
+    arrays; everything else is pickled. The index is a SQLite database so that
+    each read or write only updates its own row. When the files take more than
+    env.caching.max_size_mb megabytes, the least recently used ones are removed.
+    """
+
     def __init__(self, path: str) -> None:
         self.path = path
         self.driver = jh.get_config('env.caching.driver', 'pickle')
+        self.max_size = jh.get_config('env.caching.max_size_mb', 2048) * 1024 * 1024
+        self._db = None
+        self._db_pid = None
 
-        if self.driver == 'pickle':
+        if self.driver is not None:
             # make sure path exists
             os.makedirs(path, exist_ok=True)
 
-            # if cache_database exists, load the dictionary
-            if os.path.isfile(f"{self.path}cache_database.pickle"):
-                with open(f"{self.path}cache_database.pickle", 'rb') as f:
-                    self.db = pickle.load(f)
-            # if not, create a dict object. We'll create the file when using set_value()
-            else:
-                self.db = {}
+            self._remove_pickle_database()
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        # a connection can't be shared with forked processes
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(f'{self.path}cache_database.sqlite', timeout=30, isolation_level=None)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS items ('
+                'key TEXT PRIMARY KEY, path TEXT NOT NULL, size INTEGER NOT NULL, '
+                'expire_seconds INTEGER, expire_at REAL, accessed_at REAL NOT NULL)'
+            )
+            self._db_pid = os.getpid()
+
+        return self._db
 
     def set_value(self, key: str, data: Any, expire_seconds: int = 60 * 60) -> None:
         if self.driver is None:
             return
 
+        # store file
+        if isinstance(data, np.ndarray) and data.dtype != object:
+            data_path = f"{self.path}{key}.npy"
+            np.save(data_path, data)
+        else:
+            data_path = f"{self.path}{key}.pickle"
+            with open(data_path, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # the same key might have been stored in the other format before
+        row = self.db.execute('SELECT path FROM items WHERE key = ?', (key,)).fetchone()
+        if row is not None and row[0] != data_path:
+            self._remove_file(row[0])
+
         # add record into the database
-        expire_at = None if expire_seconds is None else time() + expire_seconds
-        data_path = f"{self.path}{key}.pickle"
-        self.db[key] = {
-            'expire_seconds': expire_seconds,
-            'expire_at': expire_at,
-            'path': data_path,
-        }
-        self._update_db()
+        now = time()
+        expire_at = None if expire_seconds is None else now + expire_seconds
+        self.db.execute(
+            'INSERT OR REPLACE INTO items (key, path, size, expire_seconds, expire_at, accessed_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (key, data_path, os.path.getsize(data_path), expire_seconds, expire_at, now)
+        )
 
-        # store file
-        with open(data_path, 'wb') as f:
-            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._evict()
 
     def get_value(self, key: str) -> Any:
         if self.driver is None:
             return
 
-        try:
-            item = self.db[key]
-        except KeyError:
+        row = self.db.execute(
+            'SELECT path, expire_seconds, expire_at FROM items WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
             return False
 
-        # if expired, remove file, and database record
-        if item['expire_at'] is not None and time() > item['expire_at']:
-            os.remove(item['path'])
-            del self.db[key]
-            self._update_db()
+        path, expire_seconds, expire_at = row
+        now = time()
+
+        # if expired (or removed by hand), remove file, and database record
+        if (expire_at is not None and now > expire_at) or not os.path.exists(path):
+            self._remove_file(path)
+            self.db.execute('DELETE FROM items WHERE key = ?', (key,))
             return False
 
         # renew cache expiration time
-        if item['expire_at'] is not None:
-            item['expire_at'] = time() + item['expire_seconds']
-            self._update_db()
+        if expire_at is not None:
+            expire_at = now + expire_seconds
+        self.db.execute('UPDATE items SET expire_at = ?, accessed_at = ? WHERE key = ?', (expire_at, now, key))
 
-        with open(item['path'], 'rb') as f:
+        if path.endswith('.npy'):
+            # copy-on-write so that changing the array never changes the file
+            return np.load(path, mmap_mode='c')
+
+        with open(path, 'rb') as f:
             return pickle.load(f)
 
-    def _update_db(self) -> None:
-        # store/update database
-        with open(f"{self.path}cache_database.pickle", 'wb') as f:
-            pickle.dump(self.db, f, protocol=pickle.HIGHEST_PROTOCOL)
+    def _evict(self) -> None:
+        """
+        removes the least recently used items until the files fit in the disk budget
+        """
+        total_size = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM items').fetchone()[0]
+        if total_size <= self.max_size:
+            return
+
+        for key, path, size in self.db.execute(
+                'SELECT key, path, size FROM items ORDER BY accessed_at ASC').fetchall():
+            self._remove_file(path)
+            self.db.execute('DELETE FROM items WHERE key = ?', (key,))
+            total_size -= size
+            if total_size <= self.max_size:
+                return
+
+    def _remove_pickle_database(self) -> None:
+        """
+        the index used to be a pickled dictionary; the items of it are removed
+        """
+        if not os.path.isfile(f"{self.path}cache_database.pickle"):
+            return
+
+        with open(f"{self.path}cache_database.pickle", 'rb') as f:
+            try:
+                old_db = pickle.load(f)
+            except Exception:
+                old_db = {}
+
+        for item in old_db.values():
+            self._remove_file(item['path'])
+        os.remove(f"{self.path}cache_database.pickle")
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        if os.path.exists(path):
+            os.remove(path)
 
     def flush(self) -> None:
         if self.driver is None:
             return
 
-        for key, item in self.db.items():
-            os.remove(item['path'])
-        self.db = {}
+        for row in self.db.execute('SELECT path FROM items').fetchall():
+            self._remove_file(row[0])
+        self.db.execute('DELETE FROM items')
 
 
 cache = Cache("storage/temp/")
@@ -1,3 +1,5 @@
+from typing import List, Tuple
+
 import arrow
 import click
 import numpy as np
@@ -26,6 +28,25 @@ def generate_candle_from_one_minutes(timeframe: str,
     ])
 
 
+def generate_candles_from_one_minutes(timeframe: str, candles: np.ndarray) -> np.ndarray:
+    """
+    generates all the complete candles of the timeframe at once, the same way
+    generate_candle_from_one_minutes() generates each of them. The 1m candles
+    after the last complete candle are left out.
+    """
+    count = jh.timeframe_to_one_minutes(timeframe)
+    chunks = candles[:len(candles) // count * count].reshape(-1, count, 6)
+
+    return np.column_stack((
+        chunks[:, 0, 0],
+        chunks[:, 0, 1],
+        chunks[:, -1, 2],
+        chunks[:, :, 3].max(axis=1),
+        chunks[:, :, 4].min(axis=1),
+        chunks[:, :, 5].sum(axis=1),
+    ))
+
+
 def print_candle(candle: np.ndarray, is_partial: bool, symbol: str) -> None:
     if jh.should_execute_silently():
         return
@@ -151,3 +172,15 @@ def split_candle(candle: np.ndarray, price: float) -> tuple:
         ]), np.array([
             timestamp, price, c, h, price, v
         ])
+
+
+def find_gaps(timestamps: np.ndarray, start: int, finish: int) -> List[Tuple[int, int]]:
+    """
+    returns the first and last timestamps of each run of missing 1m candles
+    between start and finish (both included). timestamps must be sorted.
+    """
+    timestamps = timestamps[(timestamps >= start) & (timestamps <= finish)]
+    edges = np.concatenate(([start - 60_000], timestamps, [finish + 60_000]))
+    gap_indexes = np.nonzero(np.diff(edges) > 60_000)[0]
+
+    return [(int(edges[i] + 60_000), int(edges[i + 1] - 60_000)) for i in gap_indexes]
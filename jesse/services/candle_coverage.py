@@ -0,0 +1,147 @@
+import threading
+from bisect import bisect_right
+from typing import List, Tuple, Iterable
+
+import numpy as np
+
+import jesse.helpers as jh
+from jesse.services.db import db
+
+# the (first, last) timestamps of a run of contiguous 1m candles
+Range = Tuple[int, int]
+
+# candles get stored from more than one thread during imports
+_lock = threading.Lock()
+
+
+def timestamps_to_ranges(timestamps: Iterable[int]) -> List[Range]:
+    timestamps = np.unique(np.asarray(timestamps, dtype=np.int64))
+    if not len(timestamps):
+        return []
+
+    breaks = np.nonzero(np.diff(timestamps) != 60_000)[0]
+    starts = np.concatenate(([0], breaks + 1))
+    finishes = np.concatenate((breaks, [len(timestamps) - 1]))
+
+    return [(int(timestamps[s]), int(timestamps[f])) for s, f in zip(starts, finishes)]
+
+
+def merge_ranges(ranges: List[Range]) -> List[Range]:
+    """
+    merges the ranges that overlap or are adjacent to each other
+    """
+    merged = []
+    for start, finish in sorted(ranges):
+        if len(merged) and start <= merged[-1][1] + 60_000:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], finish))
+        else:
+            merged.append((start, finish))
+
+    return merged
+
+
+def missing_ranges(ranges: List[Range], start: int, finish: int) -> List[Range]:
+    """
+    returns the ranges between start and finish (both included) that are not
+    covered. ranges must be sorted and merged.
+    """
+    gaps = []
+    cursor = start
+    # skip the ranges that end before start
+    first = max(bisect_right(ranges, (start, start)) - 1, 0)
+
+    for range_start, range_finish in ranges[first:]:
+        if range_start > finish:
+            break
+        if range_finish < cursor:
+            continue
+        if range_start > cursor:
+            gaps.append((cursor, range_start - 60_000))
+        cursor = range_finish + 60_000
+        if cursor > finish:
+            break
+
+    if cursor <= finish:
+        gaps.append((cursor, finish))
+
+    return gaps
+
+
+def covers(ranges: List[Range], start: int, finish: int) -> bool:
+    return not len(missing_ranges(ranges, start, finish))
+
+
+def get(exchange: str, symbol: str) -> List[Range]:
+    """
+    returns the sorted ranges of the candles that exist in the database. The
+    ranges of candles that were stored before this index existed are built
+    from the candle table the first time they are asked for.
+    """
+    from jesse.models import CandleCoverage
+
+    ranges = list(
+        CandleCoverage.select(CandleCoverage.start, CandleCoverage.finish).where(
+            CandleCoverage.exchange == exchange,
+            CandleCoverage.symbol == symbol
+        ).order_by(CandleCoverage.start.asc()).tuples()
+    )
+
+    if not len(ranges):
+        ranges = rebuild(exchange, symbol)
+
+    return ranges
+
+
+def add(exchange: str, symbol: str, timestamps: Iterable[int]) -> None:
+    """
+    adds the timestamps of newly stored candles to the index
+    """
+    new_ranges = timestamps_to_ranges(timestamps)
+    if not len(new_ranges):
+        return
+
+    with _lock, db.atomic():
+        ranges = get(exchange, symbol)
+        merged = merge_ranges(ranges + new_ranges)
+        if merged != ranges:
+            _replace(exchange, symbol, merged)
+
+
+def rebuild(exchange: str, symbol: str) -> List[Range]:
+    """
+    finds the runs of contiguous candles ("gaps and islands") in the candle
+    table and replaces the ranges in the index with them
+    """
+    from jesse.models import Candle
+
+    cursor = db.execute_sql(
+        'SELECT MIN(timestamp), MAX(timestamp) FROM ('
+        'SELECT timestamp, timestamp - ROW_NUMBER() OVER (ORDER BY timestamp) * 60000 AS island '
+        f'FROM {Candle._meta.table_name} WHERE exchange = %s AND symbol = %s'
+        ') AS candles GROUP BY island ORDER BY 1',
+        (exchange, symbol)
+    )
+    ranges = [(int(r[0]), int(r[1])) for r in cursor.fetchall()]
+
+    _replace(exchange, symbol, ranges)
+
+    return ranges
+
+
+def _replace(exchange: str, symbol: str, ranges: List[Range]) -> None:
+    from jesse.models import CandleCoverage
+
+    with db.atomic():
+        CandleCoverage.delete().where(
+            CandleCoverage.exchange == exchange,
+            CandleCoverage.symbol == symbol
+        ).execute()
+        if not len(ranges):
+            return
+        CandleCoverage.insert_many([{
+            'id': jh.generate_unique_id(),
+            'exchange': exchange,
+            'symbol': symbol,
+            'start': r[0],
+            'finish': r[1],
+        } for r in ranges]).execute()
@@ -0,0 +1,99 @@
+import os
+from typing import List, Tuple, Union
+
+import arrow
+import numpy as np
+
+import jesse.helpers as jh
+
+
+class CandleStore:
+    """
+    Keeps 1m candles on the disk in one .npy file per exchange, symbol and month
+    which are read as memory-mapped arrays. Each file has one row for every
+    minute of the month, so the row of a candle follows from its timestamp, and
+    rows that have never been stored have a timestamp of 0. Rows have the same
+    columns as candles everywhere else: timestamp, open, close, high, low, volume
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.enabled = jh.get_config('env.data.candle_store', True)
+
+    def month_path(self, exchange: str, symbol: str, month_start: int) -> str:
+        return f"{self.path}{exchange}/{symbol}/{jh.timestamp_to_arrow(month_start).format('YYYY-MM')}.npy"
+
+    @staticmethod
+    def months(start: int, finish: int) -> List[Tuple[int, int]]:
+        """
+        returns the (start, finish) timestamps of the months between start and
+        finish. finish is the timestamp of the last minute of the month.
+        """
+        months = []
+        month = arrow.get(start / 1000).floor('month')
+        while month.int_timestamp * 1000 <= finish:
+            next_month = month.shift(months=1)
+            months.append((month.int_timestamp * 1000, next_month.int_timestamp * 1000 - 60_000))
+            month = next_month
+
+        return months
+
+    def store(self, exchange: str, symbol: str, candles: np.ndarray) -> None:
+        if not self.enabled or not len(candles):
+            return
+
+        candles = candles[np.argsort(candles[:, 0], kind='stable')]
+        timestamps = candles[:, 0]
+
+        for month_start, month_finish in self.months(timestamps[0], timestamps[-1]):
+            first = np.searchsorted(timestamps, month_start, side='left')
+            last = np.searchsorted(timestamps, month_finish, side='right')
+            if first == last:
+                continue
+
+            path = self.month_path(exchange, symbol, month_start)
+            if os.path.exists(path):
+                month = np.load(path, mmap_mode='r+')
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                month = np.lib.format.open_memmap(
+                    path, mode='w+', dtype=np.float64, shape=((month_finish - month_start) // 60_000 + 1, 6)
+                )
+
+            rows = ((timestamps[first:last] - month_start) // 60_000).astype(int)
+            month[rows] = candles[first:last]
+            month.flush()
+            del month
+
+    def get(self, exchange: str, symbol: str, start: int, finish: int) -> Union[np.ndarray, None]:
+        """
+        returns the candles from start to finish (both included) or None if any of
+        them is missing. Ranges within one month are returned without copying;
+        the arrays are copy-on-write so changing them never changes the files.
+        """
+        if not self.enabled:
+            return None
+
+        parts = []
+        for month_start, month_finish in self.months(start, finish):
+            path = self.month_path(exchange, symbol, month_start)
+            if not os.path.exists(path):
+                return None
+
+            month = np.load(path, mmap_mode='c')
+            first = (max(start, month_start) - month_start) // 60_000
+            last = (min(finish, month_finish) - month_start) // 60_000
+            part = month[int(first):int(last) + 1]
+
+            if np.count_nonzero(part[:, 0]) != len(part):
+                return None
+
+            parts.append(part)
+
+        if len(parts) == 1:
+            return parts[0]
+
+        return np.concatenate(parts)
+
+
+candle_store = CandleStore('storage/candles/')
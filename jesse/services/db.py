@@ -1,8 +1,17 @@
-from playhouse.postgres_ext import PostgresqlExtDatabase
+import io
+from itertools import repeat
 from typing import Dict, List
 
+import numpy as np
+
 import jesse.helpers as jh
 
+try:
+    from playhouse.pool import PooledPostgresqlExtDatabase
+except ImportError:
+    # newer versions of peewee moved it
+    from playhouse.postgres_ext import PooledPostgresqlExtDatabase
+
 if not jh.is_unit_testing():
 
     keepalive_kwargs = {
@@ -12,17 +21,24 @@ if not jh.is_unit_testing():
         "keepalives_count": 5
     }
 
-    # connect to the database
-    db = PostgresqlExtDatabase(database=jh.get_config('env.databases.postgres_name'),
-                               user=jh.get_config('env.databases.postgres_username'),
-                               password=jh.get_config('env.databases.postgres_password'),
-                               host=str(jh.get_config('env.databases.postgres_host')),
-                               port=int(jh.get_config('env.databases.postgres_port')),
-                               **keepalive_kwargs)
+    # connect to the database. Each thread gets its own connection from the pool
+    db = PooledPostgresqlExtDatabase(database=jh.get_config('env.databases.postgres_name'),
+                                     user=jh.get_config('env.databases.postgres_username'),
+                                     password=jh.get_config('env.databases.postgres_password'),
+                                     host=str(jh.get_config('env.databases.postgres_host')),
+                                     port=int(jh.get_config('env.databases.postgres_port')),
+                                     max_connections=jh.get_config('env.databases.postgres_max_connections', 8),
+                                     # seconds after which an idle connection is closed
+                                     stale_timeout=300,
+                                     **keepalive_kwargs)
 
 
     def close_connection() -> None:
-        db.close()
+        # store what's still waiting to be written first
+        from jesse.services.db_writer import db_writer
+        db_writer.stop()
+
+        db.close_all()
 
 
     # connect
@@ -34,4 +50,172 @@ else:
 def store_candles(candles: List[Dict]) -> None:
     from jesse.models import Candle
 
+    from jesse.services import candle_coverage
+
+    if not len(candles):
+        return
+
     Candle.insert_many(candles).on_conflict_ignore().execute()
+    candle_coverage.add(candles[0]['exchange'], candles[0]['symbol'], [c['timestamp'] for c in candles])
+
+
+def store_candles_array(exchange: str, symbol: str, candles: np.ndarray) -> None:
+    """
+    stores candles in the usual columnar layout (timestamp, open, close, high,
+    low, volume) without building a dict for each of them
+    """
+    from jesse.models import Candle
+    from jesse.services import candle_coverage
+
+    if not len(candles):
+        return
+
+    rows = zip(
+        jh.generate_unique_ids(len(candles)),
+        candles[:, 0].astype(np.int64).tolist(),
+        *(candles[:, i].tolist() for i in range(1, 6)),
+        repeat(exchange),
+        repeat(symbol)
+    )
+    Candle.insert_many(rows, fields=[
+        Candle.id, Candle.timestamp, Candle.open, Candle.close, Candle.high, Candle.low, Candle.volume,
+        Candle.exchange, Candle.symbol
+    ]).on_conflict_ignore().execute()
+    candle_coverage.add(exchange, symbol, candles[:, 0])
+
+
+# PostgreSQL's binary COPY format: an 11 bytes signature, 4 bytes of flags and
+# the 4 bytes length of the header extension, then a 2 bytes field count and a
+# 4 bytes length before each field of each row, and a 2 bytes trailer of -1.
+COPY_SIGNATURE = b'PGCOPY\n\xff\r\n\x00'
+CANDLE_COPY_ROW_DTYPE = np.dtype([
+    ('fields_count', '>i2'),
+    ('timestamp_length', '>i4'), ('timestamp', '>i8'),
+    ('open_length', '>i4'), ('open', '>f8'),
+    ('close_length', '>i4'), ('close', '>f8'),
+    ('high_length', '>i4'), ('high', '>f8'),
+    ('low_length', '>i4'), ('low', '>f8'),
+    ('volume_length', '>i4'), ('volume', '>f8'),
+])
+CANDLE_COLUMNS = ('timestamp', 'open', 'close', 'high', 'low', 'volume')
+
+
+class _CopyBuffer:
+    """
+    a file-like object that copy_expert() writes into; the bytes go into a
+    preallocated bytearray which only grows if the estimation was too small
+    """
+
+    def __init__(self, size: int) -> None:
+        self.buffer = bytearray(size)
+        self.length = 0
+
+    def write(self, data: bytes) -> None:
+        end = self.length + len(data)
+        if end > len(self.buffer):
+            self.buffer.extend(bytearray(max(end - len(self.buffer), len(self.buffer))))
+        self.buffer[self.length:end] = data
+        self.length = end
+
+    def getbuffer(self) -> memoryview:
+        return memoryview(self.buffer)[:self.length]
+
+
+def parse_candles_copy(data: memoryview) -> np.ndarray:
+    """
+    converts the output of a binary COPY of the timestamp, open, close, high, low
+    and volume columns into the usual candles array
+    """
+    if bytes(data[:11]) != COPY_SIGNATURE:
+        raise ValueError('Not a binary COPY output')
+
+    header_extension_length = int.from_bytes(data[15:19], 'big')
+    start = 19 + header_extension_length
+    # the last 2 bytes are the trailer
+    # NULL values would make the rows shorter
+    if (len(data) - 2 - start) % CANDLE_COPY_ROW_DTYPE.itemsize != 0:
+        raise ValueError('Unexpected row in the binary COPY output')
+    rows = np.frombuffer(data[start:len(data) - 2], dtype=CANDLE_COPY_ROW_DTYPE)
+
+    if not np.all(rows['fields_count'] == 6) or not all(np.all(rows[f'{name}_length'] == 8) for name in CANDLE_COLUMNS):
+        raise ValueError('Unexpected row in the binary COPY output')
+
+    candles = np.empty((len(rows), 6))
+    for i, name in enumerate(CANDLE_COLUMNS):
+        candles[:, i] = rows[name]
+
+    return candles
+
+
+def fetch_candles(exchange: str, symbol: str, start_timestamp: int, finish_timestamp: int) -> np.ndarray:
+    """
+    fetches the candles between the two timestamps (both included) using COPY
+    in binary format, which skips creating a Python object for each row
+    """
+    from jesse.models import Candle
+
+    query = (
+        'SELECT timestamp, open, close, high, low, volume FROM {} '
+        'WHERE exchange = %s AND symbol = %s AND timestamp BETWEEN %s AND %s '
+        'ORDER BY timestamp ASC'
+    ).format(Candle._meta.table_name)
+
+    cursor = db.cursor()
+    try:
+        query = cursor.mogrify(query, (exchange, symbol, int(start_timestamp), int(finish_timestamp))).decode()
+        expected_rows = int((finish_timestamp - start_timestamp) / 60_000) + 1
+        buffer = _CopyBuffer(19 + expected_rows * CANDLE_COPY_ROW_DTYPE.itemsize + 2)
+        cursor.copy_expert(f'COPY ({query}) TO STDOUT WITH (FORMAT binary)', buffer)
+    finally:
+        cursor.close()
+
+    return parse_candles_copy(buffer.getbuffer())
+
+
+def candles_to_copy(candles: np.ndarray) -> bytes:
+    """
+    the opposite of parse_candles_copy(): candles in PostgreSQL's binary COPY format
+    """
+    rows = np.empty(len(candles), dtype=CANDLE_COPY_ROW_DTYPE)
+    rows['fields_count'] = 6
+    for i, name in enumerate(CANDLE_COLUMNS):
+        rows[f'{name}_length'] = 8
+        rows[name] = candles[:, i]
+
+    return COPY_SIGNATURE + bytes(8) + rows.tobytes() + b'\xff\xff'
+
+
+def copy_candles(exchange: str, symbol: str, candles: np.ndarray) -> None:
+    """
+    stores candles using COPY in binary format. COPY can't skip duplicates, so
+    the candles are copied into a temporary table first.
+    """
+    from jesse.models import Candle
+    from jesse.services import candle_coverage
+
+    if not len(candles):
+        return
+
+    columns = ', '.join(CANDLE_COLUMNS)
+    with db.atomic():
+        cursor = db.cursor()
+        try:
+            cursor.execute(
+                'CREATE TEMP TABLE IF NOT EXISTS candle_import (timestamp BIGINT, open DOUBLE PRECISION, '
+                'close DOUBLE PRECISION, high DOUBLE PRECISION, low DOUBLE PRECISION, volume DOUBLE PRECISION) '
+                'ON COMMIT DELETE ROWS'
+            )
+            cursor.copy_expert(
+                f'COPY candle_import ({columns}) FROM STDIN WITH (FORMAT binary)', io.BytesIO(candles_to_copy(candles))
+            )
+            cursor.execute(
+                f'INSERT INTO {Candle._meta.table_name} (id, {columns}, exchange, symbol) '
+                # a random uuid that doesn't need the pgcrypto extension or PostgreSQL 13
+                f'SELECT md5(random()::text || clock_timestamp()::text)::uuid, {columns}, %s, %s FROM candle_import '
+                'ON CONFLICT DO NOTHING',
+                (exchange, symbol)
+            )
+        finally:
+            cursor.close()
+
+    candle_coverage.add(exchange, symbol, candles[:, 0])
@@ -0,0 +1,153 @@
+import atexit
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Any
+
+import jesse.helpers as jh
+
+# tells the writer thread to store what it has
+_FLUSH = object()
+# tells the writer thread to store what it has and stop
+_STOP = object()
+
+
+class DatabaseWriter:
+    """
+    Inserts the records that the store_*_into_db() helpers queue from a single
+    background thread instead of a thread per record. Records are grouped by
+    model and inserted together when batch_size of them are waiting or when
+    the oldest has waited flush_interval seconds. A full queue blocks the
+    callers instead of using more and more memory. A record that fails to be
+    inserted doesn't take the rest of its batch down with it.
+    """
+
+    def __init__(self, max_queue_size: int = 10_000, batch_size: int = 500, flush_interval: float = 1) -> None:
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(max_queue_size)
+        # functions that are called with the rows of each model after they're inserted
+        self.after_insert: Dict[Any, Callable[[List[dict]], None]] = {}
+
+        self.inserted_count = 0
+        self.batches_count = 0
+        self.failed_count = 0
+
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def put(self, model, row: dict, ignore_conflicts: bool = False) -> None:
+        self._start()
+        self.queue.put((model, ignore_conflicts, row))
+
+    def flush(self) -> None:
+        """
+        blocks until everything that's been queued so far is stored
+        """
+        if self._thread is None:
+            return
+
+        done = threading.Event()
+        self.queue.put((_FLUSH, done))
+        done.wait()
+
+    def stop(self) -> None:
+        """
+        stores everything that's queued and stops the writer thread
+        """
+        with self._lock:
+            if self._thread is None:
+                return
+
+            self.queue.put((_STOP, None))
+            self._thread.join()
+            self._thread = None
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            'queue_depth': self.queue.qsize(),
+            'max_queue_size': self.max_queue_size,
+            'inserted': self.inserted_count,
+            'batches': self.batches_count,
+            'failed': self.failed_count,
+        }
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        pending: Dict[tuple, List[dict]] = {}
+        pending_count = 0
+        oldest_at = None
+
+        while True:
+            timeout = None if oldest_at is None else max(oldest_at + self.flush_interval - time.time(), 0)
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is not None and item[0] not in (_FLUSH, _STOP):
+                model, ignore_conflicts, row = item
+                pending.setdefault((model, ignore_conflicts), []).append(row)
+                pending_count += 1
+                if oldest_at is None:
+                    oldest_at = time.time()
+
+            is_control = item is not None and item[0] in (_FLUSH, _STOP)
+            if pending_count and (
+                    is_control or item is None or pending_count >= self.batch_size
+                    or time.time() - oldest_at >= self.flush_interval
+            ):
+                self._insert(pending)
+                pending = {}
+                pending_count = 0
+                oldest_at = None
+
+            if is_control and item[0] is _FLUSH:
+                item[1].set()
+            elif is_control and item[0] is _STOP:
+                return
+
+    def _insert(self, pending: Dict[tuple, List[dict]]) -> None:
+        for (model, ignore_conflicts), rows in pending.items():
+            self._insert_rows(model, ignore_conflicts, rows)
+
+    def _insert_rows(self, model, ignore_conflicts: bool, rows: List[dict]) -> None:
+        """
+        inserts the rows in one query. If that fails, the two halves are retried
+        separately so only the rows that can't be stored are dropped.
+        """
+        try:
+            query = model.insert_many(rows)
+            if ignore_conflicts:
+                query = query.on_conflict_ignore()
+            query.execute()
+        except Exception as e:
+            if len(rows) > 1:
+                middle = len(rows) // 2
+                self._insert_rows(model, ignore_conflicts, rows[:middle])
+                self._insert_rows(model, ignore_conflicts, rows[middle:])
+                return
+
+            self.failed_count += 1
+            jh.error(f'Failed to store a {model.__name__} record: {e}', force_print=True)
+            return
+
+        if model in self.after_insert:
+            self.after_insert[model](rows)
+
+        self.inserted_count += len(rows)
+        self.batches_count += 1
+
+db_writer = DatabaseWriter()
+
+# store what's still in the queue when the app exits
+atexit.register(db_writer.stop)
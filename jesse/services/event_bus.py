@@ -0,0 +1,46 @@
+from typing import Callable, Dict
+
+from jesse.enums import route_events
+
+
+class EventBus:
+    """
+    Delivers the events of a route (see enums.route_events) to the strategies
+    of the other routes. A strategy only gets the events whose handlers it
+    overrides, and its order placeholders are only checked for modifications
+    if it has changed them since they were last checked.
+    """
+
+    def __init__(self) -> None:
+        # strategy id => (strategy, event => handler), in the order of the routes
+        self._subscribers = {}
+
+    def reset(self) -> None:
+        self._subscribers = {}
+
+    def subscribe(self, strategy, handlers: Dict[str, Callable]) -> None:
+        for event in handlers:
+            if event not in _EVENTS:
+                raise ValueError(f'Unknown route event: "{event}"')
+
+        self._subscribers[strategy.id] = (strategy, handlers)
+
+    def unsubscribe(self, strategy) -> None:
+        self._subscribers.pop(strategy.id, None)
+
+    def publish(self, event: str, sender) -> None:
+        for strategy, handlers in list(self._subscribers.values()):
+            if strategy is sender:
+                continue
+
+            handler = handlers.get(event)
+            if handler is not None:
+                handler(sender)
+
+            if strategy._placeholders_changed:
+                strategy._detect_and_handle_entry_and_exit_modifications()
+
+
+_EVENTS = {v for k, v in vars(route_events).items() if not k.startswith('_')}
+
+event_bus = EventBus()
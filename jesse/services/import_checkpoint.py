@@ -0,0 +1,82 @@
+from typing import Dict, List, Tuple, Union
+
+from peewee import fn, EXCLUDED
+
+import jesse.helpers as jh
+from jesse.services import candle_coverage
+
+
+def get(exchange: str, symbol: str) -> Union[Dict[str, Union[int, None]], None]:
+    from jesse.models import ImportCheckpoint
+
+    return ImportCheckpoint.select(
+        ImportCheckpoint.first_timestamp, ImportCheckpoint.last_timestamp
+    ).where(
+        ImportCheckpoint.exchange == exchange,
+        ImportCheckpoint.symbol == symbol
+    ).dicts().first()
+
+
+def pairs() -> List[Tuple[str, str]]:
+    """
+    the exchanges and symbols that have been imported before
+    """
+    from jesse.models import ImportCheckpoint
+
+    return list(
+        ImportCheckpoint.select(ImportCheckpoint.exchange, ImportCheckpoint.symbol).order_by(
+            ImportCheckpoint.exchange, ImportCheckpoint.symbol
+        ).tuples()
+    )
+
+
+def save_first_timestamp(exchange: str, symbol: str, first_timestamp: int) -> None:
+    from jesse.models import ImportCheckpoint
+
+    _upsert(exchange, symbol, {ImportCheckpoint.first_timestamp: EXCLUDED.first_timestamp},
+            first_timestamp=int(first_timestamp))
+
+
+def save_progress(exchange: str, symbol: str, last_timestamp: int) -> None:
+    """
+    records that the candles until last_timestamp have been stored. The
+    checkpoint only ever moves forward.
+    """
+    from jesse.models import ImportCheckpoint
+
+    _upsert(exchange, symbol, {
+        ImportCheckpoint.last_timestamp: fn.GREATEST(ImportCheckpoint.last_timestamp, EXCLUDED.last_timestamp)
+    }, last_timestamp=int(last_timestamp))
+
+
+def resume_timestamp(checkpoint: Union[Dict[str, Union[int, None]], None], start_timestamp: int,
+                     existing_ranges: List[Tuple[int, int]]) -> int:
+    """
+    returns the timestamp that an import which was asked to start from
+    start_timestamp should continue from
+    """
+    if checkpoint is None:
+        return start_timestamp
+
+    # there's no point in asking for candles from before the market existed
+    if checkpoint['first_timestamp'] is not None and checkpoint['first_timestamp'] > start_timestamp:
+        start_timestamp = checkpoint['first_timestamp']
+
+    # only if nothing is missing between the start and the checkpoint; candles might have been deleted
+    last_timestamp = checkpoint['last_timestamp']
+    if last_timestamp is not None and last_timestamp >= start_timestamp and \
+            candle_coverage.covers(existing_ranges, start_timestamp, last_timestamp):
+        return last_timestamp + 60_000
+
+    return start_timestamp
+
+
+def _upsert(exchange: str, symbol: str, update: dict, **values) -> None:
+    from jesse.models import ImportCheckpoint
+
+    ImportCheckpoint.insert(
+        id=jh.generate_unique_id(), exchange=exchange, symbol=symbol, updated_at=jh.now_to_timestamp(), **values
+    ).on_conflict(
+        conflict_target=[ImportCheckpoint.exchange, ImportCheckpoint.symbol],
+        update={**update, ImportCheckpoint.updated_at: EXCLUDED.updated_at}
+    ).execute()
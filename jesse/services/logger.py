@@ -3,8 +3,15 @@ from jesse.services.notifier import notify, notify_urgently
 import logging
 
 
-def info(msg: str) -> None:
-    msg = str(msg)
+def info(msg: str, *args) -> None:
+    """
+    :param args: if passed, the message is formatted with them (msg % args) only if it's going to be used
+    """
+    # nobody reads the info logs of optimize mode's backtests, so they're not even formatted
+    if jh.is_optimizing():
+        return
+
+    msg = str(msg) if not args else msg % args
     from jesse.store import store
 
     store.logs.info.append({'time': jh.now_to_timestamp(), 'message': msg})
@@ -17,8 +24,11 @@ def info(msg: str) -> None:
         logging.info(msg)
 
 
-def error(msg: str) -> None:
-    msg = str(msg)
+def error(msg: str, *args) -> None:
+    """
+    :param args: if passed, the message is formatted with them (msg % args)
+    """
+    msg = str(msg) if not args else msg % args
     from jesse.store import store
 
     if jh.is_live() and jh.get_config('env.notifications.events.errors', True):
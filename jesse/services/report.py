@@ -249,7 +249,7 @@ def info() -> List[List[Union[str, Any]]]:
             if len(w['message']) > 70
             else w['message'],
         ]
-        for w in store.logs.info[::-1][0:5]
+        for w in list(store.logs.info)[-5:][::-1]
     ]
 
 
@@ -277,7 +277,7 @@ def errors() -> List[List[Union[str, Any]]]:
             if len(w['message']) > 70
             else w['message'],
         ]
-        for w in store.logs.errors[::-1][0:5]
+        for w in list(store.logs.errors)[-5:][::-1]
     ]
 
 
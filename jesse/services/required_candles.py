@@ -1,12 +1,16 @@
+from typing import Tuple
+
 import arrow
 import numpy as np
 
 import jesse.helpers as jh
 from jesse.config import config
 from jesse.exceptions import CandleNotFoundInDatabase
-from jesse.models import Candle
+from jesse.services import candle_coverage
 from jesse.services.cache import cache
-from jesse.services.candle import generate_candle_from_one_minutes
+from jesse.services.candle import generate_candle_from_one_minutes, find_gaps
+from jesse.services.candle_store import candle_store
+from jesse.services.db import fetch_candles
 from jesse.store import store
 
 
@@ -26,79 +30,131 @@ def load_required_candles(exchange: str, symbol: str, start_date_str: str, finis
     if finish_date > arrow.utcnow().int_timestamp * 1000:
         raise ValueError('Can\'t backtest the future!')
 
-    max_timeframe = jh.max_timeframe(config['app']['considering_timeframes'])
-    short_candles_count = jh.get_config('env.data.warmup_candles_num', 210) * jh.timeframe_to_one_minutes(max_timeframe)
-    pre_finish_date = start_date - 60_000
-    pre_start_date = pre_finish_date - short_candles_count * 60_000
-    # make sure starting from the beginning of the day instead
-    pre_start_date = jh.timestamp_to_arrow(pre_start_date).floor('day').int_timestamp * 1000
-    # update candles_count to count from the beginning of the day instead
+    pre_start_date, pre_finish_date = warmup_period(start_date)
     short_candles_count = int((pre_finish_date - pre_start_date) / 60_000)
 
+    # the candle store is the fastest source, then comes the cache and then the database
+    candles = candle_store.get(exchange, symbol, pre_start_date, pre_finish_date)
+    if candles is not None:
+        return candles
+
     key = jh.key(exchange, symbol)
     cache_key = f'{jh.timestamp_to_date(pre_start_date)}-{jh.timestamp_to_date(pre_finish_date)}-{key}'
     cached_value = cache.get_value(cache_key)
 
     # if cache exists
-    if cached_value:
-        candles_tuple = cached_value
+    if isinstance(cached_value, np.ndarray):
+        candles = cached_value
     # not cached, get and cache for later calls in the next 5 minutes
     else:
         # fetch from database
-        candles_tuple = tuple(
-            Candle.select(
-                Candle.timestamp, Candle.open, Candle.close, Candle.high, Candle.low,
-                Candle.volume
-            ).where(
-                Candle.timestamp.between(pre_start_date, pre_finish_date),
-                Candle.exchange == exchange,
-                Candle.symbol == symbol
-            ).order_by(Candle.timestamp.asc()).tuples()
-        )
+        candles = fetch_candles(exchange, symbol, pre_start_date, pre_finish_date)
 
         # cache it for near future calls
-        cache.set_value(cache_key, candles_tuple, expire_seconds=60 * 60 * 24 * 7)
-
-    candles = np.array(candles_tuple)
+        cache.set_value(cache_key, candles, expire_seconds=60 * 60 * 24 * 7)
 
     if len(candles) < short_candles_count + 1:
-        first_existing_candle = tuple(
-            Candle.select(Candle.timestamp).where(
-                Candle.exchange == exchange,
-                Candle.symbol == symbol
-            ).order_by(Candle.timestamp.asc()).limit(1).tuples()
-        )
+        _raise_not_enough_warmup_candles(exchange, symbol, pre_start_date, pre_finish_date, start_date_str,
+                                         finish_date_str)
 
-        if not len(first_existing_candle):
-            raise CandleNotFoundInDatabase(
-                f'No candle for {exchange} {symbol} is present in the database. Try importing candles.'
-            )
+    candle_store.store(exchange, symbol, candles)
 
-        first_existing_candle = first_existing_candle[0][0]
+    return candles
 
-        last_existing_candle = tuple(
-            Candle.select(Candle.timestamp).where(
-                Candle.exchange == exchange,
-                Candle.symbol == symbol
-            ).order_by(Candle.timestamp.desc()).limit(1).tuples()
-        )[0][0]
 
-        first_backtestable_timestamp = first_existing_candle + (pre_finish_date - pre_start_date) + (60_000 * 1440)
+def warmup_period(start_date: int) -> Tuple[int, int]:
+    """
+    returns the timestamps of the first and the last warm-up candles that are
+    needed before start_date: 210 for the biggest timeframe and more for the rest
+    """
+    max_timeframe = jh.max_timeframe(config['app']['considering_timeframes'])
+    short_candles_count = jh.get_config('env.data.warmup_candles_num', 210) * jh.timeframe_to_one_minutes(max_timeframe)
+    pre_finish_date = start_date - 60_000
+    pre_start_date = pre_finish_date - short_candles_count * 60_000
+    # make sure starting from the beginning of the day instead
+    pre_start_date = jh.timestamp_to_arrow(pre_start_date).floor('day').int_timestamp * 1000
+
+    return pre_start_date, pre_finish_date
+
+
+def load_candles_with_warmup(exchange: str, symbol: str, start_date_str: str,
+                             finish_date_str: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    loads the warm-up candles and the candles of the backtest period at once (one
+    query, cache file or candle store read) and returns them separately
+    """
+    start_date = jh.date_to_timestamp(start_date_str)
+    finish_date = jh.date_to_timestamp(finish_date_str) - 60000
+    pre_start_date, pre_finish_date = warmup_period(start_date)
+
+    # the candle store is the fastest source, then comes the cache and then the database
+    candles = candle_store.get(exchange, symbol, pre_start_date, finish_date)
+
+    if candles is None:
+        cache_key = f'{jh.timestamp_to_date(pre_start_date)}-{finish_date_str}-{jh.key(exchange, symbol)}'
+        cached_value = cache.get_value(cache_key)
+
+        if isinstance(cached_value, np.ndarray):
+            candles = cached_value
+        else:
+            # the coverage index tells what's missing without querying the candles
+            gaps = candle_coverage.missing_ranges(candle_coverage.get(exchange, symbol), pre_start_date, finish_date)
+            if len(gaps):
+                # in case candles were inserted into the database without going through jesse
+                gaps = candle_coverage.missing_ranges(candle_coverage.rebuild(exchange, symbol), pre_start_date,
+                                                      finish_date)
+            if not len(gaps):
+                candles = fetch_candles(exchange, symbol, pre_start_date, finish_date)
+                # in case candles were deleted from the database by hand
+                gaps = find_gaps(candles[:, 0], pre_start_date, finish_date)
+
+            # a gap in the warm-up period is reported the same way load_required_candles() does
+            if len(gaps) and gaps[0][0] <= pre_finish_date:
+                _raise_not_enough_warmup_candles(exchange, symbol, pre_start_date, pre_finish_date, start_date_str,
+                                                 finish_date_str)
+            if len(gaps):
+                gaps_str = ', '.join(f'{jh.timestamp_to_time(g[0])} => {jh.timestamp_to_time(g[1])}' for g in gaps[:5])
+                raise CandleNotFoundInDatabase(
+                    f'There are missing candles between {start_date_str} => {finish_date_str} for {exchange} {symbol}. '
+                    f'Missing: {gaps_str}{" and more" if len(gaps) > 5 else ""}. Try running "jesse import-candles"'
+                )
+
+            # cache it for near future calls
+            cache.set_value(cache_key, candles, expire_seconds=60 * 60 * 24 * 7)
+
+        candle_store.store(exchange, symbol, candles)
 
-        # if first backtestable timestamp is in the future, that means we have some but not enough candles
-        if first_backtestable_timestamp > jh.today_to_timestamp():
-            raise CandleNotFoundInDatabase(
-                f'Not enough candle for {exchange} {symbol} is present in the database. Jesse requires "210 * biggest_timeframe" warm-up candles. '
-                'Try importing more candles from an earlier date.'
-            )
+    warmup_candles_count = int((pre_finish_date - pre_start_date) / 60_000) + 1
 
+    return candles[:warmup_candles_count], candles[warmup_candles_count:]
+
+
+def _raise_not_enough_warmup_candles(exchange: str, symbol: str, pre_start_date: int, pre_finish_date: int,
+                                     start_date_str: str, finish_date_str: str) -> None:
+    existing_ranges = candle_coverage.get(exchange, symbol)
+
+    if not len(existing_ranges):
         raise CandleNotFoundInDatabase(
-            f'Not enough candles for {exchange} {symbol} exists to run backtest from {start_date_str} => {finish_date_str}. \n'
-            f'First available date is {jh.timestamp_to_date(first_backtestable_timestamp)}\n'
-            f'Last available date is {jh.timestamp_to_date(last_existing_candle)}'
+            f'No candle for {exchange} {symbol} is present in the database. Try importing candles.'
         )
 
-    return candles
+    first_existing_candle = existing_ranges[0][0]
+    last_existing_candle = existing_ranges[-1][1]
+
+    first_backtestable_timestamp = first_existing_candle + (pre_finish_date - pre_start_date) + (60_000 * 1440)
+
+    # if first backtestable timestamp is in the future, that means we have some but not enough candles
+    if first_backtestable_timestamp > jh.today_to_timestamp():
+        raise CandleNotFoundInDatabase(
+            f'Not enough candle for {exchange} {symbol} is present in the database. Jesse requires "210 * biggest_timeframe" warm-up candles. '
+            'Try importing more candles from an earlier date.'
+        )
+
+    raise CandleNotFoundInDatabase(
+        f'Not enough candles for {exchange} {symbol} exists to run backtest from {start_date_str} => {finish_date_str}. \n'
+        f'First available date is {jh.timestamp_to_date(first_backtestable_timestamp)}\n'
+        f'Last available date is {jh.timestamp_to_date(last_existing_candle)}'
+    )
 
 
 def inject_required_candles_to_store(candles: np.ndarray, exchange: str, symbol: str) -> None:
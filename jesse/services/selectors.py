@@ -17,6 +17,11 @@ def get_orders(exchange: str, symbol: str) -> List[Any]:
     return store.orders.get_orders(exchange, symbol)
 
 
+def get_active_orders_within(exchange: str, symbol: str, low: float, high: float) -> List[Any]:
+    from jesse.store import store
+    return store.orders.get_active_orders_within(exchange, symbol, low, high)
+
+
 def get_time() -> int:
     from jesse.store import store
     return store.app.time
@@ -33,22 +38,16 @@ def get_all_exchanges() -> ValuesView[Any]:
 
 
 def get_strategy(exchange: str, symbol: str) -> Any:
-    from jesse.routes import router
-    r = next(r for r in router.routes
-             if r.exchange == exchange and r.symbol == symbol)
+    from jesse.exceptions import RouteNotFound
+    r = get_route(exchange, symbol)
+    if r is None:
+        raise RouteNotFound(f'No route was found for {exchange} {symbol}')
     return r.strategy
 
 
 def get_route(exchange: str, symbol: str) -> Optional[Any]:
     from jesse.routes import router
-    return next(
-        (
-            r
-            for r in router.routes
-            if r.exchange == exchange and r.symbol == symbol
-        ),
-        None,
-    )
+    return router.get_route(exchange, symbol)
 
 
 def get_all_trading_routes() -> List[Any]:
@@ -0,0 +1,40 @@
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """
+    A thread-safe rate limiter. Tokens are added at `rate` per second up to
+    `capacity` and acquire() takes one, blocking until one is available. With a
+    capacity of 1 the calls are spaced by 1 / rate seconds, but unlike sleeping
+    after each request, the time spent waiting for responses counts too.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        if rate <= 0:
+            raise ValueError('rate must be bigger than 0')
+
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            self._sleep(wait)
@@ -10,6 +10,7 @@ from .state_logs import LogsState
 from .state_orderbook import OrderbookState
 from .state_orders import OrdersState
 from .state_positions import PositionsState
+from .route_handle import RouteHandle
 from .state_tickers import TickersState
 from .state_trades import TradesState
 
@@ -94,6 +95,8 @@ class StoreClass:
 
     def __init__(self) -> None:
         self.vars = {}
+        # (exchange, symbol) => RouteHandle
+        self.route_handles = {}
 
     def reset(self, force_install_routes: bool = False) -> None:
         """
@@ -116,6 +119,31 @@ class StoreClass:
         self.trades = TradesState()
         self.orderbooks = OrderbookState()
 
+    def reset_simulation(self) -> None:
+        """
+        A lightweight version of reset() for running many backtests in a row with
+        the same routes (as the optimize mode does). It doesn't install the routes
+        again and leaves the candles alone; use store.candles.restore() for them.
+        """
+        self.app = AppState()
+        self.orders.reset()
+        self.orders.to_execute = []
+        self.completed_trades = CompletedTrades()
+        self.logs = LogsState()
+        self.exchanges = ExchangesState()
+        self.positions = PositionsState()
+
+    def resolve_route_handles(self) -> None:
+        """
+        Resolves a RouteHandle for each exchange-symbol pair of the candles. It has
+        to be called again after the states are replaced (by reset() for example).
+        """
+        routes = {(r.exchange, r.symbol): r for r in router.routes}
+        self.route_handles = {
+            (exchange, symbol): RouteHandle(exchange, symbol, self, routes.get((exchange, symbol)))
+            for exchange, symbol in config['app']['considering_candles']
+        }
+
 
 if not jh.is_unit_testing():
     install_routes()
@@ -0,0 +1,40 @@
+import numpy as np
+
+import jesse.helpers as jh
+from jesse.config import config
+from .state_candles import CandlesState
+
+
+class RouteHandle:
+    """
+    Direct references to the state of an exchange-symbol pair which the
+    simulation needs every minute, so hot paths don't build string keys and
+    look them up (or go through all the routes) each time. Handles are
+    resolved by store.resolve_route_handles() once the states exist, and
+    have to be resolved again if the states are replaced (like by reset()).
+    """
+    __slots__ = ('exchange_name', 'symbol', 'key', 'route', 'strategy', 'exchange', 'position', 'orders', 'candles')
+
+    def __init__(self, exchange_name: str, symbol: str, store, route=None) -> None:
+        self.exchange_name = exchange_name
+        self.symbol = symbol
+        # the key of the pair in the states which are keyed by exchange-symbol
+        self.key = jh.key(exchange_name, symbol)
+        self.route = route
+        self.strategy = None if route is None else route.strategy
+        self.exchange = store.exchanges.storage.get(exchange_name)
+        # None for the pairs of extra candles
+        self.position = store.positions.storage.get(self.key)
+        self.orders = store.orders.storage.get(self.key)
+        # timeframe => DynamicNumpyArray
+        self.candles = {}
+        for timeframe in config['app']['considering_timeframes']:
+            arr = store.candles.storage.get(jh.key(exchange_name, symbol, timeframe))
+            if arr is not None:
+                self.candles[timeframe] = arr
+
+    def get_candles(self, timeframe: str) -> np.ndarray:
+        return CandlesState.candles_of(self.candles['1m'], self.candles[timeframe], timeframe)
+
+    def get_current_candle(self, timeframe: str) -> np.ndarray:
+        return CandlesState.current_candle_of(self.candles['1m'], self.candles[timeframe], timeframe)
@@ -6,6 +6,10 @@ class AppState:
     starting_time = None
     daily_balance = []
 
+    def __init__(self) -> None:
+        # a class-level list would be shared between the backtests that run after each store reset
+        self.daily_balance = []
+
     # used as placeholders for detecting open trades metrics
     total_open_trades = 0
     total_open_pl = 0
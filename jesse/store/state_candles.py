@@ -92,6 +92,19 @@ class CandlesState:
                 total_bigger_timeframe = int((bucket_size / jh.timeframe_to_one_minutes(timeframe)) + 1)
                 self.storage[key] = DynamicNumpyArray((total_bigger_timeframe, 6))
 
+    def snapshot(self) -> dict:
+        """
+        returns a copy of the current storage which can be restored later. Used in the
+        optimize mode to inject the warm-up candles only once instead of before every backtest.
+        """
+        return {key: arr.copy() for key, arr in self.storage.items()}
+
+    def restore(self, snapshot: dict) -> None:
+        """
+        replaces the storage with a copy of a snapshot taken by snapshot()
+        """
+        self.storage = {key: arr.copy() for key, arr in snapshot.items()}
+
     def add_candle(
             self,
             candle: np.ndarray,
@@ -100,8 +113,12 @@ class CandlesState:
             timeframe: str,
             with_execution: bool = True,
             with_generation: bool = True,
-            with_skip: bool = True
+            with_skip: bool = True,
+            storage: DynamicNumpyArray = None
     ) -> None:
+        """
+        :param storage: the storage of the candles if the caller has it at hand (like from a RouteHandle)
+        """
         if jh.is_collecting_data():
             # make sure it's a complete (and not a forming) candle
             if jh.now_to_timestamp() >= (candle[0] + 60000):
@@ -113,7 +130,7 @@ class CandlesState:
                 logger.error("DEBUGGING-VALUE: please report to Saleh: candle[0] is zero")
             return
 
-        arr: DynamicNumpyArray = self.get_storage(exchange, symbol, timeframe)
+        arr: DynamicNumpyArray = storage if storage is not None else self.get_storage(exchange, symbol, timeframe)
 
         if jh.is_live():
             # ignore if candle is still being initially imported
@@ -251,19 +268,17 @@ class CandlesState:
 
     def simulate_order_execution(self, exchange: str, symbol: str, timeframe: str, new_candle: np.ndarray) -> None:
         previous_candle = self.get_current_candle(exchange, symbol, timeframe)
-        orders = selectors.get_orders(exchange, symbol)
-
         if previous_candle[2] == new_candle[2]:
             return
 
-        for o in orders:
-            # skip inactive orders
-            if not o.is_active:
-                continue
+        low, high = sorted((previous_candle[2], new_candle[2]))
+        while True:
+            # executing an order might submit new ones that are inside the range too
+            orders = selectors.get_active_orders_within(exchange, symbol, low, high)
+            if not len(orders):
+                return
 
-            if ((o.price >= previous_candle[2]) and (o.price <= new_candle[2])) or (
-                    (o.price <= previous_candle[2]) and (o.price >= new_candle[2])):
-                o.execute()
+            orders[0].execute()
 
     def batch_add_candle(self, candles: np.ndarray, exchange: str, symbol: str, timeframe: str,
                          with_generation: bool = True) -> None:
@@ -283,35 +298,44 @@ class CandlesState:
     # # # # # getters
     # # # # # # # # #
     def get_candles(self, exchange: str, symbol: str, timeframe: str) -> np.ndarray:
+        one_minute_arr = self.get_storage(exchange, symbol, '1m')
+        arr = one_minute_arr if timeframe == '1m' else self.get_storage(exchange, symbol, timeframe)
+        return self.candles_of(one_minute_arr, arr, timeframe)
+
+    @staticmethod
+    def candles_of(one_minute_arr: DynamicNumpyArray, arr: DynamicNumpyArray, timeframe: str) -> np.ndarray:
+        """
+        returns the candles of a timeframe (including the forming one) out of its
+        storage and the storage of the 1m candles of the same exchange-symbol
+        """
         # no need to worry for forming candles when timeframe == 1m
         if timeframe == '1m':
-            arr: DynamicNumpyArray = self.get_storage(exchange, symbol, '1m')
-            if len(arr) == 0:
+            if len(one_minute_arr) == 0:
                 return np.zeros((0, 6))
             else:
-                return arr[:]
+                return one_minute_arr[:]
 
         # other timeframes
-        dif, long_key, short_key = self.forming_estimation(exchange, symbol, timeframe)
-        long_count = len(self.get_storage(exchange, symbol, timeframe))
-        short_count = len(self.get_storage(exchange, symbol, '1m'))
+        short_count = len(one_minute_arr)
+        dif = short_count % jh.timeframe_to_one_minutes(timeframe)
+        long_count = len(arr)
 
         if dif == 0 and long_count == 0:
             return np.zeros((0, 6))
 
         # complete candle
-        if dif == 0 or self.storage[long_key][:long_count][-1][0] == self.storage[short_key][short_count - dif][0]:
-            return self.storage[long_key][:long_count]
+        if dif == 0 or arr[:long_count][-1][0] == one_minute_arr[short_count - dif][0]:
+            return arr[:long_count]
         # generate forming
         else:
             return np.concatenate(
                 (
-                    self.storage[long_key][:long_count],
+                    arr[:long_count],
                     np.array(
                         (
                             generate_candle_from_one_minutes(
                                 timeframe,
-                                self.storage[short_key][short_count - dif:short_count],
+                                one_minute_arr[short_count - dif:short_count],
                                 True
                             ),
                         )
@@ -320,26 +344,31 @@ class CandlesState:
             )
 
     def get_current_candle(self, exchange: str, symbol: str, timeframe: str) -> np.ndarray:
+        one_minute_arr = self.get_storage(exchange, symbol, '1m')
+        arr = one_minute_arr if timeframe == '1m' else self.get_storage(exchange, symbol, timeframe)
+        return self.current_candle_of(one_minute_arr, arr, timeframe)
+
+    @staticmethod
+    def current_candle_of(one_minute_arr: DynamicNumpyArray, arr: DynamicNumpyArray, timeframe: str) -> np.ndarray:
         # no need to worry for forming candles when timeframe == 1m
         if timeframe == '1m':
-            arr: DynamicNumpyArray = self.get_storage(exchange, symbol, '1m')
-            if len(arr) == 0:
+            if len(one_minute_arr) == 0:
                 return np.zeros((0, 6))
             else:
-                return arr[-1]
+                return one_minute_arr[-1]
 
         # other timeframes
-        dif, long_key, short_key = self.forming_estimation(exchange, symbol, timeframe)
-        long_count = len(self.get_storage(exchange, symbol, timeframe))
-        short_count = len(self.get_storage(exchange, symbol, '1m'))
+        short_count = len(one_minute_arr)
+        dif = short_count % jh.timeframe_to_one_minutes(timeframe)
+        long_count = len(arr)
 
         # complete candle
         if dif != 0:
             return generate_candle_from_one_minutes(
-                timeframe, self.storage[short_key][short_count - dif:short_count],
+                timeframe, one_minute_arr[short_count - dif:short_count],
                 True
             )
         if long_count == 0:
             return np.zeros((0, 6))
         else:
-            return self.storage[long_key][-1]
+            return arr[-1]
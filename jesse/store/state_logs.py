@@ -1,4 +1,11 @@
+from collections import deque
+
+import jesse.helpers as jh
+
+
 class LogsState:
     def __init__(self) -> None:
-        self.errors = []
-        self.info = []
+        # only the latest logs are kept, so memory doesn't grow with the length of the session
+        max_size = jh.get_config('env.logging.max_logs', 1000)
+        self.errors = deque(maxlen=max_size)
+        self.info = deque(maxlen=max_size)
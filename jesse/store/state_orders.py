@@ -1,3 +1,6 @@
+import bisect
+import itertools
+import math
 from typing import List
 
 import pydash
@@ -11,45 +14,115 @@ class OrdersState:
         # used in simulation only
         self.to_execute = []
 
+        # all the orders of each exchange-symbol in the order they were submitted
         self.storage = {}
+        # id => order, so orders can be found without going through all of them
+        self._ids = {}
+        # the orders that haven't been executed or canceled
+        self._open = {}
+        # the same orders sorted by price, so the ones inside a candle's range are a bisect away
+        self._book = {}
+        # tells which of two orders was submitted first
+        self._sequence = itertools.count()
 
         for exchange in config['app']['trading_exchanges']:
             for symbol in config['app']['trading_symbols']:
                 key = f'{exchange}-{symbol}'
                 self.storage[key] = []
+                self._ids[key] = {}
+                self._open[key] = {}
+                self._book[key] = []
 
     def reset(self) -> None:
         for key in self.storage:
-            self.storage[key].clear()
+            self._clear(key)
+
+    def clear_orders(self, exchange: str, symbol: str) -> None:
+        self._clear(f'{exchange}-{symbol}')
+
+    def _clear(self, key: str) -> None:
+        self.storage[key].clear()
+        self._ids[key].clear()
+        self._open[key].clear()
+        self._book[key].clear()
 
     def add_order(self, order: Order) -> None:
         key = f'{order.exchange}-{order.symbol}'
         self.storage[key].append(order)
+        self._ids[key][order.id] = order
+        self._open[key][order.id] = order
+
+        # an order without a price can't be inside a candle
+        if order.price is not None and not math.isnan(order.price):
+            bisect.insort(self._book[key], (order.price, next(self._sequence), order))
 
     def remove_order(self, order: Order) -> None:
         key = f'{order.exchange}-{order.symbol}'
-        self.storage[key] = [
-            o for o in self.storage[key] if o.id != order.id
-        ]
+        stored_order = self._ids[key].pop(order.id, None)
+        if stored_order is None:
+            return
+
+        self.storage[key].remove(stored_order)
+        self._open[key].pop(order.id, None)
+        self._book[key] = [item for item in self._book[key] if item[2] is not stored_order]
 
     # getters
     def get_orders(self, exchange, symbol) -> List[Order]:
         key = f'{exchange}-{symbol}'
         return self.storage.get(key, [])
 
+    def get_active_orders_within(self, exchange: str, symbol: str, low: float, high: float) -> List[Order]:
+        """
+        returns the active orders whose price is between low and high (inclusive)
+        in the order they were submitted
+        """
+        return self.active_orders_within(f'{exchange}-{symbol}', low, high)
+
+    def active_orders_within(self, key: str, low: float, high: float) -> List[Order]:
+        """
+        same as get_active_orders_within() for callers that have the key of a RouteHandle
+        """
+        # routes of extra candles can't have orders
+        if key not in self._book:
+            return []
+
+        book = self._book[key]
+        start = bisect.bisect_left(book, (low,))
+        end = bisect.bisect_right(book, (high, math.inf))
+
+        items = []
+        for i in range(end - 1, start - 1, -1):
+            order = book[i][2]
+            # executed and canceled orders can't become active again, so they leave the book
+            if order.is_executed or order.is_canceled:
+                del book[i]
+            elif order.is_active:
+                items.append(book[i])
+
+        return [order for _, _, order in sorted(items, key=lambda item: item[1])]
+
+    def get_active_orders(self, exchange: str, symbol: str) -> List[Order]:
+        return self._active_orders_of(f'{exchange}-{symbol}')
+
+    def _active_orders_of(self, key: str) -> List[Order]:
+        if key not in self._open:
+            return []
+
+        open_orders = self._open[key]
+        closed_ids = [id for id, o in open_orders.items() if o.is_executed or o.is_canceled]
+        for id in closed_ids:
+            del open_orders[id]
+
+        return [o for o in open_orders.values() if o.is_active]
+
     def count_all_active_orders(self) -> int:
         c = 0
         for key in self.storage:
-            if len(self.storage[key]):
-                for o in self.storage[key]:
-                    if o.is_active:
-                        c += 1
+            c += len(self._active_orders_of(key))
         return c
 
     def count_active_orders(self, exchange: str, symbol: str) -> int:
-        orders = self.get_orders(exchange, symbol)
-
-        return sum(bool(o.is_active) for o in orders)
+        return len(self.get_active_orders(exchange, symbol))
 
     def count(self, exchange: str, symbol: str) -> int:
         return len(self.get_orders(exchange, symbol))
@@ -57,10 +130,11 @@ class OrdersState:
     def get_order_by_id(self, exchange: str, symbol: str, id: str, use_exchange_id: bool = False) -> Order:
         key = f'{exchange}-{symbol}'
 
+        # exchange ids are set after orders are submitted, so they aren't indexed
         if use_exchange_id:
             return pydash.find(self.storage[key], lambda o: o.exchange_id == id)
 
-        return pydash.find(self.storage[key], lambda o: o.id == id)
+        return self._ids[key].get(id)
 
     def execute_pending_market_orders(self) -> None:
         if not self.to_execute:
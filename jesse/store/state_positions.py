@@ -10,6 +10,8 @@ class PositionsState:
             for symbol in config['app']['trading_symbols']:
                 key = f'{exchange}-{symbol}'
                 self.storage[key] = Position(exchange, symbol)
+                if self.storage[key].exchange is not None:
+                    self.storage[key].exchange.track_position(self.storage[key])
 
     def count_open_positions(self) -> int:
         c = 0
@@ -9,7 +9,7 @@ import jesse.helpers as jh
 import jesse.services.logger as logger
 import jesse.services.selectors as selectors
 from jesse import exceptions
-from jesse.enums import sides, trade_types, order_roles
+from jesse.enums import sides, trade_types, order_roles, route_events
 from jesse.models import CompletedTrade, Order, Route, FuturesExchange, SpotExchange, Position
 from jesse.models.utils import store_completed_trade_into_db, store_order_into_db
 from jesse.services import metrics
@@ -17,12 +17,37 @@ from jesse.services.broker import Broker
 from jesse.store import store
 from jesse.services.cache import cached
 from jesse.services import notifier
+from jesse.services.event_bus import event_bus
+
+
+class _OrderPlaceholder:
+    """
+    An order placeholder of the strategy (like self.buy) which marks the
+    strategy's placeholders as changed whenever it's assigned to, so
+    modifications are only looked for when there can be any.
+    """
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.attribute = f'_{name}_placeholder'
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance.__dict__.get(self.attribute)
+
+    def __set__(self, instance, value) -> None:
+        instance.__dict__[self.attribute] = value
+        instance._placeholders_changed = True
 
 
 class Strategy(ABC):
     """
     The parent strategy class which every strategy must extend. It is the heart of the framework!
     """
+    buy = _OrderPlaceholder()
+    sell = _OrderPlaceholder()
+    stop_loss = _OrderPlaceholder()
+    take_profit = _OrderPlaceholder()
 
     def __init__(self) -> None:
         self.id = jh.generate_unique_id()
@@ -46,6 +71,8 @@ class Strategy(ABC):
         self._stop_loss = None
         self.take_profit = None
         self._take_profit = None
+        # whether buy, sell, stop_loss or take_profit has been assigned to since modifications were last detected
+        self._placeholders_changed = False
 
         self._open_position_orders = []
         self._close_position_orders = []
@@ -59,6 +86,8 @@ class Strategy(ABC):
 
         self.position: Position = None
         self.broker = None
+        # set by the simulator so the candles and orders of the route don't have to be looked up
+        self.route_handle = None
 
         self._cached_methods = {}
         self._cached_metrics = {}
@@ -77,6 +106,18 @@ class Strategy(ABC):
             for dna in self.hyperparameters():
                 self.hp[dna['name']] = dna['default']
 
+        event_bus.subscribe(self, self._route_event_handlers())
+
+    def _route_event_handlers(self) -> dict:
+        """
+        the on_route_*() handlers that the strategy overrides, by the event they handle
+        """
+        handlers = {}
+        for event, name in _ROUTE_EVENT_HANDLERS.items():
+            if getattr(type(self), name) is not getattr(Strategy, name):
+                handlers[event] = getattr(self, name)
+        return handlers
+
     @property
     def _price_precision(self) -> int:
         """
@@ -95,27 +136,9 @@ class Strategy(ABC):
         """Broadcasts the event to all OTHER strategies
 
         Arguments:
-            msg {str} -- [the message to broadcast]
+            msg {str} -- [the message to broadcast, one of enums.route_events]
         """
-        from jesse.routes import router
-
-        for r in router.routes:
-            # skip self
-            if r.strategy.id == self.id:
-                continue
-
-            if msg == 'route-open-position':
-                r.strategy.on_route_open_position(self)
-            elif msg == 'route-close-position':
-                r.strategy.on_route_close_position(self)
-            elif msg == 'route-increased-position':
-                r.strategy.on_route_increased_position(self)
-            elif msg == 'route-reduced-position':
-                r.strategy.on_route_reduced_position(self)
-            elif msg == 'route-canceled':
-                r.strategy.on_route_canceled(self)
-
-            r.strategy._detect_and_handle_entry_and_exit_modifications()
+        event_bus.publish(msg, self)
 
     def _on_updated_position(self, order: Order) -> None:
         """
@@ -387,12 +410,12 @@ class Strategy(ABC):
 
         self._reset()
 
-        self._broadcast('route-canceled')
+        self._broadcast(route_events.CANCELED)
 
         self.on_cancel()
 
         if not jh.is_unit_testing() and not jh.is_live():
-            store.orders.storage[f'{self.exchange}-{self.symbol}'].clear()
+            store.orders.clear_orders(self.exchange, self.symbol)
 
     def _reset(self) -> None:
         self.buy = None
@@ -568,6 +591,8 @@ class Strategy(ABC):
         except:
             raise
 
+        self._placeholders_changed = False
+
         # validations: stop-loss and take-profit should not be the same
         if (
                 self.position.is_open
@@ -595,7 +620,7 @@ class Strategy(ABC):
             sleep(3)
 
         if jh.is_live() and jh.is_debugging():
-            logger.info(f'Executing  {self.name}-{self.exchange}-{self.symbol}-{self.timeframe}')
+            logger.info('Executing  %s-%s-%s-%s', self.name, self.exchange, self.symbol, self.timeframe)
 
         # for caution to make sure testing on livetrade won't bleed your account
         if jh.is_test_driving() and store.completed_trades.count >= 2:
@@ -645,7 +670,7 @@ class Strategy(ABC):
     def _on_open_position(self, order: Order) -> None:
         self.increased_count = 1
 
-        self._broadcast('route-open-position')
+        self._broadcast(route_events.OPEN_POSITION)
 
         if self.take_profit is not None:
             for o in self._take_profit:
@@ -715,7 +740,7 @@ class Strategy(ABC):
         if not jh.should_execute_silently() or jh.is_debugging():
             logger.info("A closing order has been executed")
 
-        self._broadcast('route-close-position')
+        self._broadcast(route_events.CLOSE_POSITION)
         self._execute_cancel()
         self.on_close_position(order)
 
@@ -726,7 +751,7 @@ class Strategy(ABC):
 
         self._open_position_orders = []
 
-        self._broadcast('route-increased-position')
+        self._broadcast(route_events.INCREASED_POSITION)
 
         self.on_increased_position(order)
 
@@ -748,7 +773,7 @@ class Strategy(ABC):
 
         self._open_position_orders = []
 
-        self._broadcast('route-reduced-position')
+        self._broadcast(route_events.REDUCED_POSITION)
 
         self.on_reduced_position(order)
 
@@ -842,7 +867,9 @@ class Strategy(ABC):
             store.app.total_open_trades += 1
             store.app.total_open_pl += self.position.pnl
             logger.info(
-                f"Closed open {self.exchange}-{self.symbol} position at {self.position.current_price} with PNL: {round(self.position.pnl, 4)}({round(self.position.pnl_percentage, 2)}%) because we reached the end of the backtest session."
+                'Closed open %s-%s position at %s with PNL: %s(%s%%) because we reached the end of the backtest session.',
+                self.exchange, self.symbol, self.position.current_price, round(self.position.pnl, 4),
+                round(self.position.pnl_percentage, 2)
             )
             # fake a closing (market) order so that the calculations would be correct
             self.broker.reduce_position_at(
@@ -878,6 +905,9 @@ class Strategy(ABC):
 
         :return: np.ndarray
         """
+        if self.route_handle is not None:
+            return self.route_handle.get_current_candle(self.timeframe).copy()
+
         return store.candles.get_current_candle(self.exchange, self.symbol, self.timeframe).copy()
 
     @property
@@ -937,6 +967,9 @@ class Strategy(ABC):
 
         :return: np.ndarray
         """
+        if self.route_handle is not None:
+            return self.route_handle.get_candles(self.timeframe)
+
         return store.candles.get_candles(self.exchange, self.symbol, self.timeframe)
 
     def get_candles(self, exchange: str, symbol: str, timeframe: str) -> np.ndarray:
@@ -960,6 +993,9 @@ class Strategy(ABC):
         Returns:
             [List[Order]] -- orders submitted by strategy
         """
+        if self.route_handle is not None:
+            return self.route_handle.orders
+
         return store.orders.get_orders(self.exchange, self.symbol)
 
     @property
@@ -1199,3 +1235,13 @@ class Strategy(ABC):
                 notifier.notify_urgently(msg)
         else:
             raise ValueError(f'log_type should be either "info" or "error". You passed {log_type}')
+
+
+# route event => the handler of Strategy that receives it
+_ROUTE_EVENT_HANDLERS = {
+    route_events.OPEN_POSITION: 'on_route_open_position',
+    route_events.CLOSE_POSITION: 'on_route_close_position',
+    route_events.INCREASED_POSITION: 'on_route_increased_position',
+    route_events.REDUCED_POSITION: 'on_route_reduced_position',
+    route_events.CANCELED: 'on_route_canceled',
+}
@@ -0,0 +1,24 @@
+from jesse.strategies import Strategy
+
+
+class TestHyperparameters(Strategy):
+    def should_long(self) -> bool:
+        return False
+
+    def should_short(self) -> bool:
+        return False
+
+    def go_long(self):
+        pass
+
+    def go_short(self):
+        pass
+
+    def should_cancel(self) -> bool:
+        return False
+
+    def hyperparameters(self) -> list:
+        return [
+            {'name': 'period', 'type': int, 'min': 5, 'max': 50, 'default': 20},
+            {'name': 'ratio', 'type': float, 'min': 0.1, 'max': 2, 'default': 1},
+        ]
@@ -0,0 +1,16 @@
+import numpy as np
+
+from jesse.strategies import VectorizedStrategy
+
+
+# test_vectorized_strategies_match_event_driven_ones - the vectorized version of Test01
+class TestVectorized01(VectorizedStrategy):
+    def signals(self, candles):
+        return {
+            'long_entries': np.arange(len(candles)) == 0,
+            'stop_loss': candles[:, 2] - 10,
+            'take_profit': candles[:, 2] + 10,
+        }
+
+    def entry_qty(self):
+        return 1
@@ -0,0 +1,21 @@
+import numpy as np
+
+import jesse.helpers as jh
+from jesse.strategies import VectorizedStrategy
+
+
+# test_vectorized_strategies_match_event_driven_ones - the vectorized version of Test05
+class TestVectorized05(VectorizedStrategy):
+    def signals(self, candles):
+        # the time at which the strategy is executed for each candle
+        times = candles[:, 0] + jh.timeframe_to_one_minutes(self.timeframe) * 60_000
+        long_entries = times == 1547201100000 + 60_000
+        return {
+            'long_entries': long_entries,
+            'short_entries': times == 1547203560000 + 60_000,
+            'stop_loss': np.where(long_entries, 128.35, 129.52),
+            'take_profit': np.where(long_entries, 131.29, 126.58),
+        }
+
+    def entry_qty(self):
+        return 10.204 if self.should_long() else 10
@@ -0,0 +1,17 @@
+import numpy as np
+
+from jesse.strategies import VectorizedStrategy
+
+
+# test_vectorized_strategies_match_event_driven_ones - the vectorized version of Test45
+class TestVectorized45(VectorizedStrategy):
+    def signals(self, candles):
+        index = np.arange(len(candles))
+        return {
+            'long_entries': index == 10,
+            'short_entries': index == 11,
+            'exits': index == 11,
+        }
+
+    def entry_qty(self):
+        return 1
@@ -0,0 +1,144 @@
+from abc import abstractmethod
+from typing import Dict
+
+import numpy as np
+
+from jesse import exceptions
+from .Strategy import Strategy
+
+
+class VectorizedStrategy(Strategy):
+    """
+    A strategy whose entries and exits are computed over the whole history at
+    once instead of candle by candle. signals() gets the candles of the route
+    and returns arrays with one value per candle:
+
+    - long_entries, short_entries: whether to open a position at the candle
+    - exits: whether to close the open position at the candle (optional)
+    - entry_price: the price of the entry order; NaN for a MARKET order (optional)
+    - stop_loss, take_profit: prices to exit the position at; NaN for none (optional)
+
+    The value for a candle must only depend on that candle and the ones
+    before it, just like indicators with sequential=True.
+
+    The orders are submitted the same way go_long() and go_short() of a
+    Strategy would submit them, so they are executed exactly the same. In
+    backtests, signals are computed once before the simulation starts and
+    the strategy is only executed at candles which have a signal, or while
+    an entry order is waiting; the orders are executed by the simulator in
+    between. before() and after() are therefore not called at the other
+    candles. In live trading, signals are computed at every candle.
+    """
+    _signal_names = ('long_entries', 'short_entries', 'exits', 'entry_price', 'stop_loss', 'take_profit')
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        # name => array, when the signals of the whole simulation have been computed
+        self._signals = None
+        # (index, signals) of the last candle whose signals were computed on the fly
+        self._current_signals = (None, None)
+
+    @abstractmethod
+    def signals(self, candles: np.ndarray) -> Dict[str, np.ndarray]:
+        pass
+
+    @abstractmethod
+    def entry_qty(self) -> float:
+        """
+        the qty of the position to open at the current candle
+        """
+        pass
+
+    def _prepare_signals(self, candles: np.ndarray) -> None:
+        """
+        computes the signals of all the candles that the route will have by
+        the end of the simulation
+        """
+        self._signals = self._validate_signals(self.signals(candles), len(candles))
+
+    def _validate_signals(self, signals: Dict[str, np.ndarray], length: int) -> Dict[str, np.ndarray]:
+        for name in signals:
+            if name not in self._signal_names:
+                raise exceptions.InvalidStrategy(
+                    f'"{name}" is not a valid signal. Valid signals are: {", ".join(self._signal_names)}'
+                )
+
+        validated = {}
+        for name in self._signal_names:
+            is_price = name in ('entry_price', 'stop_loss', 'take_profit')
+            if name not in signals or signals[name] is None:
+                validated[name] = np.full(length, np.nan if is_price else False)
+                continue
+
+            arr = np.asarray(signals[name], dtype=float if is_price else bool)
+            if arr.shape != (length,):
+                raise exceptions.InvalidStrategy(
+                    f'The "{name}" signal must have one value per candle ({length}) but has the shape of {arr.shape}'
+                )
+            validated[name] = arr
+
+        return validated
+
+    def _signal(self, name: str):
+        if self._signals is not None:
+            return self._signals[name][len(self.route_handle.candles[self.timeframe]) - 1]
+
+        # in live mode, the signals of the current candle are computed from the candles so far
+        if self._current_signals[0] != self.index:
+            candles = self.candles
+            self._current_signals = (self.index, self._validate_signals(self.signals(candles), len(candles)))
+        return self._current_signals[1][name][-1]
+
+    def _execute(self) -> None:
+        if self._signals is not None and not self._is_executing and not self._has_anything_to_do():
+            self.index += 1
+            return
+
+        super()._execute()
+
+    def _has_anything_to_do(self) -> bool:
+        if self._placeholders_changed and self.position.is_open:
+            return True
+        if self.position.is_open:
+            return bool(self._signal('exits'))
+        # waiting entry orders might need to be canceled
+        if len(self._open_position_orders):
+            return True
+        return bool(self._signal('long_entries') or self._signal('short_entries'))
+
+    def should_long(self) -> bool:
+        return bool(self._signal('long_entries'))
+
+    def should_short(self) -> bool:
+        return bool(self._signal('short_entries'))
+
+    def go_long(self) -> None:
+        qty = self.entry_qty()
+        self.buy = qty, self._entry_price()
+        self._set_exits(qty)
+
+    def go_short(self) -> None:
+        qty = self.entry_qty()
+        self.sell = qty, self._entry_price()
+        self._set_exits(qty)
+
+    def should_cancel(self) -> bool:
+        return False
+
+    def update_position(self) -> None:
+        if self._signal('exits'):
+            self.liquidate()
+
+    def _entry_price(self) -> float:
+        price = self._signal('entry_price')
+        return self.price if np.isnan(price) else price
+
+    def _set_exits(self, qty: float) -> None:
+        stop_loss = self._signal('stop_loss')
+        if not np.isnan(stop_loss):
+            self.stop_loss = qty, stop_loss
+
+        take_profit = self._signal('take_profit')
+        if not np.isnan(take_profit):
+            self.take_profit = qty, take_profit
@@ -1 +1,2 @@
 from .Strategy import cached, Strategy
+from .VectorizedStrategy import VectorizedStrategy
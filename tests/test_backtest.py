@@ -128,3 +128,67 @@ def test_backtesting_three_routes():
 
         # assert that the strategy has been initiated
         assert r.strategy is not None
+
+
+def test_reset_simulation_allows_repeating_backtests():
+    reset_config()
+    router.set_routes([
+        (exchanges.SANDBOX, 'BTC-USDT', timeframes.MINUTE_5, 'Test19')
+    ])
+    config['env']['exchanges'][exchanges.SANDBOX]['type'] = 'futures'
+    store.reset(True)
+
+    candles = {
+        jh.key(exchanges.SANDBOX, 'BTC-USDT'): {
+            'exchange': exchanges.SANDBOX,
+            'symbol': 'BTC-USDT',
+            'candles': fake_range_candle(5 * 20)
+        }
+    }
+    store.candles.init_storage(5000)
+    snapshot = store.candles.snapshot()
+
+    results = []
+    for _ in range(2):
+        store.candles.restore(snapshot)
+        backtest_mode.simulator(candles)
+        results.append((
+            len(store.candles.get_candles(exchanges.SANDBOX, 'BTC-USDT', '1m')),
+            store.completed_trades.count,
+            list(store.app.daily_balance),
+            selectors.get_exchange(exchanges.SANDBOX).assets['USDT'],
+        ))
+        store.reset_simulation()
+
+    assert results[0] == results[1]
+    assert results[0][0] == 100
+    assert store.completed_trades.count == 0
+    assert store.app.daily_balance == []
+
+
+def test_simulator_with_hyperparameters_of_each_route():
+    reset_config()
+    router.set_routes([
+        (exchanges.SANDBOX, 'BTC-USDT', timeframes.MINUTE_5, 'TestHyperparameters'),
+        (exchanges.SANDBOX, 'ETH-USDT', timeframes.MINUTE_5, 'TestHyperparameters'),
+        (exchanges.SANDBOX, 'XRP-USDT', timeframes.MINUTE_15, 'Test19'),
+    ])
+    config['env']['exchanges'][exchanges.SANDBOX]['type'] = 'futures'
+    store.reset(True)
+
+    candles = {}
+    for symbol in ['BTC-USDT', 'ETH-USDT', 'XRP-USDT']:
+        candles[jh.key(exchanges.SANDBOX, symbol)] = {
+            'exchange': exchanges.SANDBOX,
+            'symbol': symbol,
+            'candles': fake_range_candle(15 * 20)
+        }
+    store.candles.init_storage(5000)
+
+    backtest_mode.simulator(candles, [{'period': 10, 'ratio': 0.5}, None, None])
+
+    # the ones without hyperparameters of their own use the defaults
+    assert router.routes[0].strategy.hp == {'period': 10, 'ratio': 0.5}
+    assert router.routes[1].strategy.hp == {'period': 20, 'ratio': 1}
+    assert router.routes[2].strategy.hp is None
+    assert len(store.candles.get_candles(exchanges.SANDBOX, 'XRP-USDT', '15m')) == 20
@@ -279,3 +279,25 @@ def test_should_not_submit_reduce_only_orders_when_position_is_closed():
 
     with pytest.raises(OrderNotAllowed):
         broker.reduce_position_at(1, 20)
+
+
+def test_available_margin_is_kept_up_to_date_by_running_totals():
+    set_up_without_fee(is_futures_trading=True)
+
+    # orders that come and go don't pile up in the running totals or the arrays
+    for i in range(500):
+        order = broker.buy_at(1, 40 + i % 7, order_roles.OPEN_POSITION)
+        assert exchange.available_margin() == 1000 - (40 + i % 7)
+        order.cancel()
+        assert exchange.available_margin() == 1000
+    assert exchange.buy_orders['BTC'].array.shape == (10, 2)
+
+    open_position_order = broker.start_profit_at('buy', 1, 60, order_roles.OPEN_POSITION)
+    open_position_order.execute()
+    position.current_price = 70
+    # 1000 - 60 (cost) + 10 (PNL)
+    assert exchange.available_margin() == 950
+
+    broker.reduce_position_at(1, 80, order_roles.CLOSE_POSITION).execute()
+    assert position.is_close is True
+    assert exchange.available_margin() == 1020
@@ -0,0 +1,85 @@
+import os
+import pickle
+from time import sleep
+
+import numpy as np
+
+from jesse.services.cache import Cache
+
+
+def test_numpy_arrays_are_stored_in_raw_binary(tmp_path):
+    cache = Cache(f'{tmp_path}/')
+    candles = np.random.random((100, 6))
+    cache.set_value('candles', candles)
+
+    assert (tmp_path / 'candles.npy').exists()
+    loaded = cache.get_value('candles')
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_equal(loaded, candles)
+
+    # changing the loaded array doesn't change the cache
+    loaded[0][0] = -1
+    np.testing.assert_equal(cache.get_value('candles'), candles)
+
+
+def test_other_values_are_pickled(tmp_path):
+    cache = Cache(f'{tmp_path}/')
+    cache.set_value('value', {'a': (1, 2)})
+
+    assert (tmp_path / 'value.pickle').exists()
+    assert cache.get_value('value') == {'a': (1, 2)}
+    assert cache.get_value('missing') is False
+
+    # the same key in another format replaces the old file
+    cache.set_value('value', np.zeros(3))
+    assert not (tmp_path / 'value.pickle').exists()
+    np.testing.assert_equal(cache.get_value('value'), np.zeros(3))
+
+
+def test_expired_values_are_removed(tmp_path):
+    cache = Cache(f'{tmp_path}/')
+    cache.set_value('value', np.zeros(3), expire_seconds=0.01)
+    sleep(0.02)
+
+    assert cache.get_value('value') is False
+    assert not (tmp_path / 'value.npy').exists()
+
+
+def test_least_recently_used_values_are_evicted(tmp_path):
+    cache = Cache(f'{tmp_path}/')
+    # room for two of them
+    cache.max_size = 2.5 * 8128
+    cache.set_value('a', np.zeros(1000))
+    cache.set_value('b', np.zeros(1000))
+    cache.get_value('a')
+    cache.set_value('c', np.zeros(1000))
+
+    assert cache.get_value('b') is False
+    assert not (tmp_path / 'b.npy').exists()
+    np.testing.assert_equal(cache.get_value('a'), np.zeros(1000))
+    np.testing.assert_equal(cache.get_value('c'), np.zeros(1000))
+
+
+def test_flush(tmp_path):
+    cache = Cache(f'{tmp_path}/')
+    cache.set_value('a', np.zeros(3))
+    cache.set_value('b', 'b')
+    cache.flush()
+
+    assert cache.get_value('a') is False
+    assert cache.get_value('b') is False
+    assert not (tmp_path / 'a.npy').exists()
+    assert not (tmp_path / 'b.pickle').exists()
+
+
+def test_pickled_database_of_older_versions_is_removed(tmp_path):
+    with open(tmp_path / 'old.pickle', 'wb') as f:
+        pickle.dump((1, 2), f)
+    with open(tmp_path / 'cache_database.pickle', 'wb') as f:
+        pickle.dump({'old': {'expire_seconds': 60, 'expire_at': None, 'path': str(tmp_path / 'old.pickle')}}, f)
+
+    cache = Cache(f'{tmp_path}/')
+
+    assert not os.path.exists(tmp_path / 'old.pickle')
+    assert not os.path.exists(tmp_path / 'cache_database.pickle')
+    assert cache.get_value('old') is False
@@ -0,0 +1,34 @@
+from jesse.services.candle_coverage import timestamps_to_ranges, merge_ranges, missing_ranges, covers
+
+
+def test_timestamps_to_ranges():
+    assert timestamps_to_ranges([]) == []
+    assert timestamps_to_ranges([0, 60_000, 120_000]) == [(0, 120_000)]
+    # unsorted and duplicated timestamps
+    assert timestamps_to_ranges([300_000, 0, 60_000, 240_000, 60_000]) == [(0, 60_000), (240_000, 300_000)]
+
+
+def test_merge_ranges():
+    assert merge_ranges([]) == []
+    # overlapping
+    assert merge_ranges([(0, 180_000), (120_000, 300_000)]) == [(0, 300_000)]
+    # adjacent
+    assert merge_ranges([(240_000, 300_000), (0, 180_000)]) == [(0, 300_000)]
+    # contained
+    assert merge_ranges([(0, 300_000), (60_000, 120_000)]) == [(0, 300_000)]
+    # apart
+    assert merge_ranges([(0, 60_000), (180_000, 240_000)]) == [(0, 60_000), (180_000, 240_000)]
+
+
+def test_missing_ranges():
+    ranges = [(0, 120_000), (300_000, 420_000), (600_000, 600_000)]
+
+    assert missing_ranges(ranges, 0, 120_000) == []
+    assert missing_ranges(ranges, 60_000, 60_000) == []
+    assert missing_ranges(ranges, 0, 420_000) == [(180_000, 240_000)]
+    assert missing_ranges(ranges, 360_000, 720_000) == [(480_000, 540_000), (660_000, 720_000)]
+    assert missing_ranges(ranges, 900_000, 960_000) == [(900_000, 960_000)]
+    assert missing_ranges([], 0, 60_000) == [(0, 60_000)]
+
+    assert covers(ranges, 300_000, 420_000)
+    assert not covers(ranges, 300_000, 480_000)
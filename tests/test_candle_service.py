@@ -155,3 +155,21 @@ def test_split_candle():
             np.array([1111, 15, 20, 25, 15, 2222]),
         )
     )
+
+
+def test_find_gaps():
+    timestamps = np.arange(0, 10) * 60_000
+
+    assert find_gaps(timestamps, 0, 9 * 60_000) == []
+    # only the requested range is checked
+    assert find_gaps(timestamps, 2 * 60_000, 5 * 60_000) == []
+
+    # missing in the middle, at the beginning and at the end
+    timestamps = np.delete(timestamps, [0, 4, 5, 9])
+    assert find_gaps(timestamps, 0, 9 * 60_000) == [
+        (0, 0),
+        (4 * 60_000, 5 * 60_000),
+        (9 * 60_000, 9 * 60_000),
+    ]
+
+    assert find_gaps(np.array([]), 0, 60_000) == [(0, 60_000)]
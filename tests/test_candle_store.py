@@ -0,0 +1,75 @@
+import numpy as np
+
+import jesse.helpers as jh
+from jesse.services.candle_store import CandleStore
+
+
+def fake_candles(start_date: str, count: int) -> np.ndarray:
+    candles = np.zeros((count, 6))
+    candles[:, 0] = jh.date_to_timestamp(start_date) + np.arange(count) * 60_000
+    candles[:, 1:] = np.random.random((count, 5))
+    return candles
+
+
+def test_months():
+    start = jh.date_to_timestamp('2021-01-31')
+    finish = jh.date_to_timestamp('2021-03-01')
+
+    assert CandleStore.months(start, finish) == [
+        (jh.date_to_timestamp('2021-01-01'), jh.date_to_timestamp('2021-02-01') - 60_000),
+        (jh.date_to_timestamp('2021-02-01'), jh.date_to_timestamp('2021-03-01') - 60_000),
+        (jh.date_to_timestamp('2021-03-01'), jh.date_to_timestamp('2021-04-01') - 60_000),
+    ]
+
+
+def test_store_and_get_candles(tmp_path):
+    candle_store = CandleStore(f'{tmp_path}/')
+    # two days that belong to different months
+    candles = fake_candles('2021-01-31', 1440 * 2)
+    candle_store.store('Binance', 'BTC-USDT', candles)
+
+    assert (tmp_path / 'Binance' / 'BTC-USDT' / '2021-01.npy').exists()
+    assert (tmp_path / 'Binance' / 'BTC-USDT' / '2021-02.npy').exists()
+
+    np.testing.assert_equal(
+        candle_store.get('Binance', 'BTC-USDT', candles[0][0], candles[-1][0]), candles
+    )
+    np.testing.assert_equal(
+        candle_store.get('Binance', 'BTC-USDT', candles[10][0], candles[20][0]), candles[10:21]
+    )
+
+
+def test_get_returns_none_if_any_candle_is_missing(tmp_path):
+    candle_store = CandleStore(f'{tmp_path}/')
+    candles = fake_candles('2021-01-10', 100)
+    candle_store.store('Binance', 'BTC-USDT', np.delete(candles, 50, axis=0))
+
+    assert candle_store.get('Binance', 'BTC-USDT', candles[0][0], candles[-1][0]) is None
+    assert candle_store.get('Binance', 'BTC-USDT', candles[0][0], candles[-1][0] + 60_000) is None
+    assert candle_store.get('Binance', 'ETH-USDT', candles[0][0], candles[-1][0]) is None
+    np.testing.assert_equal(candle_store.get('Binance', 'BTC-USDT', candles[0][0], candles[49][0]), candles[:50])
+
+    # filling the gap later
+    candle_store.store('Binance', 'BTC-USDT', candles[50:51])
+    np.testing.assert_equal(candle_store.get('Binance', 'BTC-USDT', candles[0][0], candles[-1][0]), candles)
+
+
+def test_changing_loaded_candles_does_not_change_the_store(tmp_path):
+    candle_store = CandleStore(f'{tmp_path}/')
+    candles = fake_candles('2021-01-10', 100)
+    candle_store.store('Binance', 'BTC-USDT', candles)
+
+    loaded = candle_store.get('Binance', 'BTC-USDT', candles[0][0], candles[-1][0])
+    loaded[5][1] = -1
+
+    np.testing.assert_equal(candle_store.get('Binance', 'BTC-USDT', candles[0][0], candles[-1][0]), candles)
+
+
+def test_disabled_candle_store(tmp_path):
+    candle_store = CandleStore(f'{tmp_path}/')
+    candle_store.enabled = False
+    candles = fake_candles('2021-01-10', 100)
+    candle_store.store('Binance', 'BTC-USDT', candles)
+
+    assert not (tmp_path / 'Binance').exists()
+    assert candle_store.get('Binance', 'BTC-USDT', candles[0][0], candles[-1][0]) is None
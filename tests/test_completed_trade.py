@@ -1,6 +1,7 @@
 import jesse.helpers as jh
 from jesse.config import config
 from jesse.models import CompletedTrade
+from jesse.models.CompletedTrade import CompletedTradeModel
 from jesse.store import store
 from .utils import set_up, single_route_backtest
 
@@ -184,3 +185,44 @@ def test_trade_size():
 
 def test_completed_trade_after_exiting_the_trade():
     single_route_backtest('TestCompletedTradeAfterExitingTrade', leverage=2)
+
+
+def test_completed_trades_map_onto_the_completed_trades_table():
+    trade = CompletedTrade({
+        'id': jh.generate_unique_id(),
+        'strategy_name': 'Test19',
+        'type': 'long',
+        'exchange': 'Sandbox',
+        'timeframe': '5m',
+        'entry_price': 10,
+        'exit_price': 20,
+        'qty': 1,
+        'symbol': 'BTC-USD',
+        'opened_at': 1552309186171,
+        'closed_at': 1552309186171 + 60000,
+        'entry_candle_timestamp': 1552309186171,
+        'exit_candle_timestamp': 1552309186171 + 60000,
+        'leverage': 1,
+        # unknown keys, ex: the extra columns of a database row, are ignored
+        'session_id': jh.generate_unique_id(),
+    })
+    assert not hasattr(trade, 'session_id')
+
+    # every column of the table can be filled from the in-memory trade when it's stored
+    columns = CompletedTradeModel._meta.fields
+    assert set(columns) <= set(CompletedTrade.__slots__)
+    record = CompletedTradeModel(**{c: getattr(trade, c) for c in columns})
+    assert record.id == trade.id
+    assert record.exit_price == 20
+    assert record.closed_at == 1552309186171 + 60000
+
+
+def test_completed_trade_to_json():
+    single_route_backtest('TestCompletedTradeAfterExitingTrade', leverage=2)
+
+    trade = store.completed_trades.trades[0]
+    json_trade = trade.toJSON()
+
+    assert json_trade['id'] == trade.id
+    assert len(json_trade['orders'])
+    assert json_trade['orders'] == [o.to_dict() for o in trade.orders]
@@ -0,0 +1,101 @@
+import struct
+
+import numpy as np
+import peewee
+import pytest
+from playhouse.postgres_ext import PostgresqlExtDatabase
+
+import jesse.helpers as jh
+import jesse.services.candle_coverage as candle_coverage
+import jesse.services.db as db
+from jesse.factories import fake_range_candle
+from jesse.models import Candle, CandleCoverage
+from jesse.services.db import parse_candles_copy, _CopyBuffer
+
+
+def binary_copy_output(candles: list) -> bytes:
+    data = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)
+    for c in candles:
+        data += struct.pack('>h', 6)
+        data += struct.pack('>iq', 8, c[0])
+        for value in c[1:]:
+            data += struct.pack('>id', 8, value)
+    return data + struct.pack('>h', -1)
+
+
+def test_parse_candles_copy():
+    candles = [
+        [1609459200000, 100, 101, 102, 99, 10.5],
+        [1609459260000, 101, 100.5, 101.5, 100, 3],
+    ]
+    buffer = _CopyBuffer(10)
+    # written in small chunks like copy_expert() does
+    data = binary_copy_output(candles)
+    for i in range(0, len(data), 7):
+        buffer.write(data[i:i + 7])
+
+    np.testing.assert_equal(parse_candles_copy(buffer.getbuffer()), np.array(candles, dtype=float))
+
+
+def test_parse_candles_copy_without_rows():
+    assert parse_candles_copy(memoryview(binary_copy_output([]))).shape == (0, 6)
+
+
+def test_parse_candles_copy_rejects_other_formats():
+    with pytest.raises(ValueError):
+        parse_candles_copy(memoryview(b'1609459200000,100,101,102,99,10.5\n'))
+
+    # a NULL field has a length of -1 and no data
+    data = binary_copy_output([[1609459200000, 100, 101, 102, 99, 10.5]])
+    data = data[:-14] + struct.pack('>i', -1) + struct.pack('>h', -1)
+    with pytest.raises(ValueError):
+        parse_candles_copy(memoryview(data))
+
+
+@pytest.fixture
+def postgres(monkeypatch):
+    """
+    the Postgres database of the config; the tests that need it are skipped if it's not running
+    """
+    database = PostgresqlExtDatabase(
+        jh.get_config('env.databases.postgres_name'),
+        user=jh.get_config('env.databases.postgres_username'),
+        password=jh.get_config('env.databases.postgres_password'),
+        host=str(jh.get_config('env.databases.postgres_host')),
+        port=int(jh.get_config('env.databases.postgres_port')),
+    )
+    try:
+        database.connect()
+    except peewee.OperationalError:
+        pytest.skip('Postgres is not available')
+
+    monkeypatch.setattr(db, 'db', database)
+    monkeypatch.setattr(candle_coverage, 'db', database)
+    with database.bind_ctx([Candle, CandleCoverage]):
+        database.create_tables([Candle, CandleCoverage])
+        try:
+            yield database
+        finally:
+            Candle.delete().where(Candle.exchange == 'Test COPY').execute()
+            CandleCoverage.delete().where(CandleCoverage.exchange == 'Test COPY').execute()
+            database.close()
+
+
+def test_copy_and_select_return_the_same_candles(postgres):
+    candles = fake_range_candle(3000)
+    db.copy_candles('Test COPY', 'BTC-USDT', candles)
+
+    start, finish = int(candles[100][0]), int(candles[-100][0])
+    copied = db.fetch_candles('Test COPY', 'BTC-USDT', start, finish)
+    # the SELECT that fetch_candles() replaced
+    selected = np.array(tuple(Candle.select(
+        Candle.timestamp, Candle.open, Candle.close, Candle.high, Candle.low, Candle.volume
+    ).where(
+        Candle.timestamp.between(start, finish),
+        Candle.exchange == 'Test COPY',
+        Candle.symbol == 'BTC-USDT'
+    ).order_by(Candle.timestamp.asc()).tuples()))
+
+    np.testing.assert_equal(copied, selected)
+    np.testing.assert_equal(copied, candles[100:-99])
+    assert db.fetch_candles('Test COPY', 'ETH-USDT', start, finish).shape == (0, 6)
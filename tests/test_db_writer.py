@@ -0,0 +1,103 @@
+import time
+
+import peewee
+
+from jesse.services.db_writer import DatabaseWriter
+
+# each thread gets its own connection, so the database has to be a file
+database = peewee.SqliteDatabase(None)
+
+
+class Record(peewee.Model):
+    key = peewee.CharField(unique=True)
+    value = peewee.IntegerField()
+
+    class Meta:
+        database = database
+
+
+def set_up(tmp_path) -> None:
+    database.init(str(tmp_path / 'records.sqlite'))
+    database.create_tables([Record])
+
+
+def test_db_writer_inserts_in_batches(tmp_path):
+    set_up(tmp_path)
+    inserted = []
+    writer = DatabaseWriter(batch_size=3, flush_interval=60)
+    writer.after_insert[Record] = inserted.append
+
+    for i in range(4):
+        writer.put(Record, {'key': str(i), 'value': i})
+    writer.flush()
+
+    assert Record.select().count() == 4
+    assert [len(rows) for rows in inserted] == [3, 1]
+    assert writer.metrics() == {'queue_depth': 0, 'max_queue_size': 10_000, 'inserted': 4, 'batches': 2, 'failed': 0}
+
+    writer.stop()
+
+
+def test_db_writer_flushes_after_the_interval(tmp_path):
+    set_up(tmp_path)
+    writer = DatabaseWriter(batch_size=100, flush_interval=0.05)
+    writer.put(Record, {'key': 'a', 'value': 1})
+
+    for _ in range(100):
+        if Record.select().count():
+            break
+        time.sleep(0.01)
+
+    assert Record.select().count() == 1
+    writer.stop()
+
+
+def test_db_writer_stores_everything_on_stop(tmp_path):
+    set_up(tmp_path)
+    writer = DatabaseWriter(batch_size=100, flush_interval=60)
+    writer.put(Record, {'key': 'a', 'value': 1})
+    writer.put(Record, {'key': 'b', 'value': 2})
+    writer.stop()
+
+    assert Record.select().count() == 2
+    # stopping twice is fine
+    writer.stop()
+
+
+def test_db_writer_conflicts(tmp_path):
+    set_up(tmp_path)
+    writer = DatabaseWriter(batch_size=100, flush_interval=60)
+    writer.put(Record, {'key': 'a', 'value': 1})
+    writer.put(Record, {'key': 'a', 'value': 2}, ignore_conflicts=True)
+    writer.flush()
+
+    assert Record.select().count() == 1
+    assert writer.metrics()['failed'] == 0
+
+    # without ignoring conflicts the batch fails and the writer keeps going
+    writer.put(Record, {'key': 'a', 'value': 3})
+    writer.put(Record, {'key': 'b', 'value': 4}, ignore_conflicts=True)
+    writer.stop()
+
+    assert writer.metrics()['failed'] == 1
+    assert Record.select().count() == 2
+
+
+def test_db_writer_only_drops_the_rows_that_fail(tmp_path):
+    set_up(tmp_path)
+    inserted = []
+    writer = DatabaseWriter(batch_size=100, flush_interval=60)
+    writer.after_insert[Record] = lambda rows: inserted.extend(r['key'] for r in rows)
+
+    for i in range(5):
+        writer.put(Record, {'key': str(i), 'value': i})
+    # value is NOT NULL
+    writer.put(Record, {'key': 'invalid', 'value': None})
+    for i in range(5, 10):
+        writer.put(Record, {'key': str(i), 'value': i})
+    writer.stop()
+
+    assert sorted(r.key for r in Record.select()) == [str(i) for i in range(10)]
+    assert sorted(inserted) == [str(i) for i in range(10)]
+    assert writer.metrics()['inserted'] == 10
+    assert writer.metrics()['failed'] == 1
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from jesse.libs import DynamicNumpyArray
+
+
+def test_delete():
+    a = DynamicNumpyArray((3, 2))
+    for i in range(1, 6):
+        a.append(np.array([i, i * 10]))
+
+    a.delete(1)
+    assert len(a) == 4
+    np.testing.assert_equal(a[:], [[1, 10], [3, 30], [4, 40], [5, 50]])
+
+    a.delete(-1)
+    np.testing.assert_equal(a[:], [[1, 10], [3, 30], [4, 40]])
+
+    # the freed space is used by the next append
+    a.append(np.array([6, 60]))
+    np.testing.assert_equal(a[:], [[1, 10], [3, 30], [4, 40], [6, 60]])
+
+    with pytest.raises(IndexError):
+        a.delete(4)
+
+
+def test_append_after_delete_reuses_the_free_space():
+    a = DynamicNumpyArray((10, 2))
+    for i in range(9):
+        a.append(np.array([i, i]))
+
+    for i in range(1000):
+        a.append(np.array([i, i]))
+        a.delete(0)
+
+    assert len(a) == 9
+    assert a.array.shape == (20, 2)
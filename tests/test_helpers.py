@@ -104,6 +104,20 @@ def test_dna_to_hp():
     assert jh.dna_to_hp(strategy_hp, dna) == {'hp1': 0.08518987341772151, 'hp2': 3}
 
 
+def test_dna_to_routes_hp():
+    strategy_hp = [
+        {'name': 'hp1', 'type': float, 'min': 0.01, 'max': 1.0, 'default': 0.09},
+        {'name': 'hp2', 'type': int, 'min': 1, 'max': 10, 'default': 2},
+    ]
+    other_strategy_hp = [
+        {'name': 'hp1', 'type': int, 'min': 1, 'max': 10, 'default': 2},
+    ]
+    dna = ".66"
+    assert jh.dna_to_routes_hp([strategy_hp, [], other_strategy_hp], dna) == [
+        {'hp1': 0.08518987341772151, 'hp2': 3}, None, {'hp1': 3}
+    ]
+
+
 def test_dump_exception():
     # uses database, which is not existing during testing
     pass
@@ -174,9 +188,32 @@ def test_format_currency():
 
 
 def test_generate_unique_id():
+    from jesse.config import config
+
     assert jh.is_valid_uuid(jh.generate_unique_id()) is True
     assert jh.is_valid_uuid('asdfasdfasdfasfsadfsd') is False
 
+    # outside of live trading, ids share a prefix and are counted
+    first, second = jh.generate_unique_id(), jh.generate_unique_id()
+    assert first[:24] == second[:24]
+    assert int(second[24:], 16) == int(first[24:], 16) + 1
+
+    config['app']['trading_mode'] = 'livetrade'
+    try:
+        first, second = jh.generate_unique_id(), jh.generate_unique_id()
+    finally:
+        config['app']['trading_mode'] = 'backtest'
+    assert jh.is_valid_uuid(first) is True
+    assert first[:24] != second[:24]
+
+
+def test_generate_unique_ids():
+    ids = jh.generate_unique_ids(1000)
+
+    assert len(set(ids)) == 1000
+    assert all(jh.is_valid_uuid(id) for id in ids)
+    assert jh.generate_unique_ids(0) == []
+
 
 def test_get_candle_source():
     candle = np.array(([1575547200000, 146.51, 147.03, 149.02, 146.51, 64788.46651],
@@ -238,6 +275,27 @@ def test_is_backtesting():
     assert jh.is_backtesting() is True
 
 
+def test_frozen_runtime_context():
+    from jesse.config import config
+    from jesse.store import store
+
+    with jh.frozen_runtime_context():
+        # the config is read once, so changing it has no effect until the context is unfrozen
+        config['app']['trading_mode'] = 'livetrade'
+        assert jh.is_backtesting() is True
+        assert jh.is_live() is False
+        assert jh.is_unit_testing() is True
+        assert jh.should_execute_silently() is True
+        assert jh.is_debuggable('order_submission') is False
+        assert jh.now_to_timestamp() == store.app.time
+        assert jh.get_config('env.logging.order_submission', 2020) is True
+
+    assert jh.is_backtesting() is False
+    assert jh.is_livetrading() is True
+    config['app']['trading_mode'] = 'backtest'
+    assert jh.is_backtesting() is True
+
+
 def test_is_collecting_data():
     assert jh.is_collecting_data() is False
 
@@ -1,35 +1,26 @@
-import jesse.helpers as jh
+import numpy as np
+import pytest
+
 import jesse.modes.import_candles_mode as importer
+from jesse.exceptions import CandleNotFoundInExchange
 from tests.data import test_candles_0
 
-test_object_candles = []
-for c in test_candles_0:
-    test_object_candles.append({
-        'id': jh.generate_unique_id(),
-        'symbol': 'BTC-USD',
-        'exchange': 'Sandbox',
-        'timestamp': c[0],
-        'open': c[1],
-        'high': c[2],
-        'low': c[3],
-        'close': c[4],
-        'volume': c[5]
-    })
+test_array_candles = np.array(test_candles_0, dtype=float)
 
-smaller_data_set = test_object_candles[0:7].copy()
+smaller_data_set = test_array_candles[0:7].copy()
 
 
 def test_fill_absent_candles():
-    assert len(test_object_candles) == 1382
+    assert len(test_array_candles) == 1382
 
     start = 1553817600000
     end = 1553817600000 + (1440 - 1) * 60000
 
-    fixed_candles = importer._fill_absent_candles(test_object_candles, start, end)
+    fixed_candles = importer._fill_absent_candles(test_array_candles, start, end)
 
     assert len(fixed_candles) == 1440
-    assert fixed_candles[0]['timestamp'] == start
-    assert fixed_candles[-1]['timestamp'] == end
+    assert fixed_candles[0][0] == start
+    assert fixed_candles[-1][0] == end
 
 
 def test_fill_absent_candles_beginning_middle_end():
@@ -37,42 +28,68 @@ def test_fill_absent_candles_beginning_middle_end():
     candles = smaller_data_set[2:7]
     assert len(smaller_data_set) == 7
     assert len(candles) == 5
-    start = smaller_data_set[0]['timestamp']
-    end = smaller_data_set[-1]['timestamp']
+    start = smaller_data_set[0][0]
+    end = smaller_data_set[-1][0]
     candles = importer._fill_absent_candles(candles, start, end)
     assert len(candles) == 7
-    assert candles[0]['timestamp'] == smaller_data_set[0]['timestamp']
-    assert candles[-1]['timestamp'] == smaller_data_set[-1]['timestamp']
+    assert candles[0][0] == smaller_data_set[0][0]
+    assert candles[-1][0] == smaller_data_set[-1][0]
 
     # Should fill if candles in the middle are absent
-    candles = smaller_data_set[0:3] + smaller_data_set[5:7]
+    candles = np.concatenate((smaller_data_set[0:3], smaller_data_set[5:7]))
     assert len(candles) == 5
     candles = importer._fill_absent_candles(candles, start, end)
     assert len(candles) == 7
-    assert candles[0]['timestamp'] == smaller_data_set[0]['timestamp']
-    assert candles[-1]['timestamp'] == smaller_data_set[-1]['timestamp']
+    assert candles[0][0] == smaller_data_set[0][0]
+    assert candles[-1][0] == smaller_data_set[-1][0]
 
     # Should fill if candles in the ending are absent
     candles = smaller_data_set[0:5]
     assert len(candles) == 5
     candles = importer._fill_absent_candles(candles, start, end)
     assert len(candles) == 7
-    assert candles[0]['timestamp'] == smaller_data_set[0]['timestamp']
-    assert candles[-1]['timestamp'] == smaller_data_set[-1]['timestamp']
+    assert candles[0][0] == smaller_data_set[0][0]
+    assert candles[-1][0] == smaller_data_set[-1][0]
 
 
 def test_more_than_one_set_of_candles_in_the_middle_are_absent():
-    candles = [
-                  smaller_data_set[0],
-              ] + smaller_data_set[2:3] + smaller_data_set[5:7]
+    candles = np.concatenate((smaller_data_set[0:1], smaller_data_set[2:3], smaller_data_set[5:7]))
     assert len(smaller_data_set) == 7
     assert len(candles) == 4
 
-    start = smaller_data_set[0]['timestamp']
-    end = smaller_data_set[-1]['timestamp']
+    start = smaller_data_set[0][0]
+    end = smaller_data_set[-1][0]
 
     candles = importer._fill_absent_candles(candles, start, end)
 
     assert len(candles) == 7
-    assert candles[0]['timestamp'] == start
-    assert candles[-1]['timestamp'] == end
+    assert candles[0][0] == start
+    assert candles[-1][0] == end
+
+
+def test_fill_absent_candles_prices():
+    start = smaller_data_set[0][0]
+    end = smaller_data_set[-1][0]
+    candles = np.concatenate((smaller_data_set[1:3], smaller_data_set[4:5]))
+
+    candles = importer._fill_absent_candles(candles, start, end)
+
+    np.testing.assert_equal(candles[:, 0], smaller_data_set[:, 0])
+    # present candles are kept as they are
+    np.testing.assert_equal(candles[[1, 2, 4]], smaller_data_set[[1, 2, 4]])
+    # before the first candle, the open of the first candle is used
+    np.testing.assert_equal(candles[0, 1:], [smaller_data_set[1][1]] * 4 + [0])
+    # after that, the close of the previous candle
+    np.testing.assert_equal(candles[3, 1:], [smaller_data_set[2][2]] * 4 + [0])
+    np.testing.assert_equal(candles[5, 1:], [smaller_data_set[4][2]] * 4 + [0])
+    np.testing.assert_equal(candles[6, 1:], [smaller_data_set[4][2]] * 4 + [0])
+
+
+def test_fill_absent_candles_without_candles():
+    start = smaller_data_set[0][0]
+    end = smaller_data_set[-1][0]
+
+    # what an exchange, or the backup exchange, returns when it doesn't have the candles
+    for candles in (None, np.empty((0, 6))):
+        with pytest.raises(CandleNotFoundInExchange):
+            importer._fill_absent_candles(candles, start, end)
@@ -0,0 +1,151 @@
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import requests
+
+import jesse.helpers as jh
+from jesse.config import config
+from jesse.modes.import_candles_mode.bulk import CandleWriter, import_pairs
+from jesse.modes.import_candles_mode.drivers.interface import CandleExchange
+from jesse.services.token_bucket import TokenBucket
+
+
+class FakeExchangeHandler(BaseHTTPRequestHandler):
+    """
+    returns 1m candles like Binance's klines endpoint does, slowly
+    """
+    active_requests = 0
+    max_active_requests = 0
+    lock = threading.Lock()
+
+    def do_GET(self) -> None:
+        cls = FakeExchangeHandler
+        with cls.lock:
+            cls.active_requests += 1
+            cls.max_active_requests = max(cls.max_active_requests, cls.active_requests)
+
+        query = parse_qs(urlparse(self.path).query)
+        start = int(query['startTime'][0])
+        limit = int(query['limit'][0])
+        time.sleep(0.02)
+        data = [[start + i * 60_000, 1, 2, 0.5, 1.5, 10] for i in range(limit)]
+
+        with cls.lock:
+            cls.active_requests -= 1
+
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class FakeExchange(CandleExchange):
+    def __init__(self, endpoint: str) -> None:
+        super().__init__(name='Fake', count=100, rate_limit_per_second=1000, backup_exchange_class=None)
+        self.endpoint = endpoint
+
+    def get_starting_time(self, symbol: str) -> None:
+        return None
+
+    def fetch(self, symbol: str, start_timestamp: int) -> list:
+        response = requests.get(self.endpoint, params={'startTime': start_timestamp, 'limit': self.count})
+        return [{
+            'id': jh.generate_unique_id(),
+            'symbol': symbol,
+            'exchange': self.name,
+            'timestamp': d[0],
+            'open': d[1],
+            'close': d[4],
+            'high': d[2],
+            'low': d[3],
+            'volume': d[5],
+        } for d in response.json()]
+
+
+def test_token_bucket():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0], sleep=sleep)
+
+    # the bucket starts full
+    bucket.acquire()
+    bucket.acquire()
+    assert sleeps == []
+
+    bucket.acquire()
+    assert sleeps == [0.5]
+
+    # time spent elsewhere counts
+    now[0] += 10
+    bucket.acquire()
+    bucket.acquire()
+    assert sleeps == [0.5]
+
+
+def test_candle_writer_stores_in_batches_per_pair():
+    stored = []
+    writer = CandleWriter(store=lambda exchange, symbol, candles: stored.append((exchange, symbol, candles)),
+                          batch_size=3)
+    writer.start()
+    writer.put('A', 'BTC-USDT', np.array([[0, 1, 1, 1, 1, 1]]))
+    writer.put('B', 'BTC-USDT', np.array([[0, 2, 2, 2, 2, 2]]))
+    writer.put('A', 'BTC-USDT', np.array([[60_000, 3, 3, 3, 3, 3]]))
+    writer.put('A', 'ETH-USDT', np.array([[0, 4, 4, 4, 4, 4]]))
+    writer.close()
+
+    assert [(exchange, symbol, candles.tolist()) for exchange, symbol, candles in stored] == [
+        ('A', 'BTC-USDT', [[0, 1, 1, 1, 1, 1], [60_000, 3, 3, 3, 3, 3]]),
+        ('B', 'BTC-USDT', [[0, 2, 2, 2, 2, 2]]),
+        ('A', 'ETH-USDT', [[0, 4, 4, 4, 4, 4]]),
+    ]
+    assert writer.stored_count == 4
+
+
+def test_import_pairs_concurrently():
+    # so that jh.now_to_timestamp() returns the real time
+    trading_mode = config['app']['trading_mode']
+    config['app']['trading_mode'] = 'import-candles'
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeExchangeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    driver = FakeExchange(f'http://127.0.0.1:{server.server_address[1]}/klines')
+
+    stored = []
+    writer = CandleWriter(store=lambda exchange, symbol, candles: stored.append((symbol, candles)), batch_size=1)
+    writer.start()
+
+    # four completed chunks of 100 candles for each symbol
+    start = jh.now_to_timestamp() // 60_000 * 60_000 - 400 * 60_000
+    symbols = ['BTC-USDT', 'ETH-USDT', 'LTC-USDT', 'XRP-USDT']
+    # the first chunk of BTC-USDT is in the database already
+    jobs = [(driver, s, [(start, start + 99 * 60_000)] if s == 'BTC-USDT' else [], None) for s in symbols]
+    try:
+        imported_count, failures = import_pairs(jobs, start, writer, workers=8)
+    finally:
+        writer.close()
+        server.shutdown()
+        config['app']['trading_mode'] = trading_mode
+
+    assert failures == {}
+    assert imported_count == 1500
+    assert writer.stored_count == 1500
+    assert FakeExchangeHandler.max_active_requests > 1
+
+    for symbol in symbols:
+        timestamps = sorted(int(c[0]) for s, candles in stored if s == symbol for c in candles)
+        first = start + 100 * 60_000 if symbol == 'BTC-USDT' else start
+        assert timestamps == list(range(first, start + 400 * 60_000, 60_000))
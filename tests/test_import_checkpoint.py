@@ -0,0 +1,30 @@
+from jesse.services.import_checkpoint import resume_timestamp
+
+
+def test_resume_timestamp_without_checkpoint():
+    assert resume_timestamp(None, 0, [(0, 600_000)]) == 0
+
+
+def test_resume_timestamp_continues_after_the_checkpoint():
+    checkpoint = {'first_timestamp': None, 'last_timestamp': 600_000}
+
+    assert resume_timestamp(checkpoint, 0, [(0, 600_000)]) == 660_000
+    # the checkpoint is before the requested start
+    assert resume_timestamp(checkpoint, 720_000, [(0, 600_000)]) == 720_000
+
+
+def test_resume_timestamp_does_not_skip_missing_candles():
+    checkpoint = {'first_timestamp': None, 'last_timestamp': 600_000}
+
+    # candles were deleted or a chunk was never stored
+    assert resume_timestamp(checkpoint, 0, [(0, 120_000), (300_000, 600_000)]) == 0
+    # only the requested period matters
+    assert resume_timestamp(checkpoint, 300_000, [(0, 120_000), (300_000, 600_000)]) == 660_000
+
+
+def test_resume_timestamp_starts_from_the_first_candle_of_the_market():
+    checkpoint = {'first_timestamp': 300_000, 'last_timestamp': None}
+    assert resume_timestamp(checkpoint, 0, []) == 300_000
+
+    checkpoint = {'first_timestamp': 300_000, 'last_timestamp': 600_000}
+    assert resume_timestamp(checkpoint, 0, [(300_000, 600_000)]) == 660_000
@@ -0,0 +1,66 @@
+import zipfile
+
+import numpy as np
+
+import jesse.helpers as jh
+from jesse.modes.import_file_mode import read_candles, find_files
+from jesse.services.db import candles_to_copy, parse_candles_copy
+
+start = jh.date_to_timestamp('2021-01-01')
+
+
+def kline_rows(timestamps: list) -> list:
+    # open time, open, high, low, close, volume, close time, quote volume, trades, taker buy volumes, ignore
+    return [f'{t},{i + 1},{i + 3},{i},{i + 2},10,{t + 59_999},100,5,4,40,0' for i, t in enumerate(timestamps)]
+
+
+def test_read_candles_from_csv(tmp_path):
+    # the 4th and 5th minutes are absent
+    timestamps = [start + i * 60_000 for i in [0, 1, 2, 5, 6]]
+    path = tmp_path / 'BTCUSDT-1m-2021-01.csv'
+    path.write_text('\n'.join(kline_rows(timestamps)) + '\n')
+
+    # the gap is between two chunks
+    chunks = list(read_candles(str(path), chunk_rows=3))
+    candles = np.concatenate(chunks)
+
+    assert [len(c) for c in chunks] == [3, 4]
+    np.testing.assert_equal(candles[:, 0], start + np.arange(7) * 60_000)
+    # timestamp, open, close, high, low, volume
+    np.testing.assert_equal(candles[0], [start, 1, 2, 3, 0, 10])
+    # absent candles get the close of the previous one
+    np.testing.assert_equal(candles[3], [start + 3 * 60_000, 4, 4, 4, 4, 0])
+    np.testing.assert_equal(candles[5], [start + 5 * 60_000, 4, 5, 6, 3, 10])
+
+
+def test_read_candles_from_zip_with_header_and_microseconds(tmp_path):
+    timestamps = [(start + i * 60_000) * 1000 for i in range(3)]
+    path = tmp_path / 'BTCUSDT-1m-2021-01.zip'
+    with zipfile.ZipFile(path, 'w') as z:
+        z.writestr(
+            'BTCUSDT-1m-2021-01.csv',
+            'open_time,open,high,low,close,volume,close_time,quote_volume,count,'
+            'taker_buy_volume,taker_buy_quote_volume,ignore\n' + '\n'.join(kline_rows(timestamps))
+        )
+
+    candles = np.concatenate(list(read_candles(str(path))))
+
+    np.testing.assert_equal(candles[:, 0], start + np.arange(3) * 60_000)
+    np.testing.assert_equal(candles[:, 1], [1, 2, 3])
+
+
+def test_find_files(tmp_path):
+    (tmp_path / 'b.zip').write_bytes(b'')
+    (tmp_path / 'a.csv').write_text('')
+    (tmp_path / 'notes.txt').write_text('')
+
+    assert find_files([str(tmp_path)]) == [str(tmp_path / 'a.csv'), str(tmp_path / 'b.zip')]
+
+
+def test_candles_to_copy():
+    candles = np.array([
+        [start, 1, 2, 3, 0.5, 10],
+        [start + 60_000, 2, 3, 4, 1.5, 20],
+    ])
+
+    np.testing.assert_equal(parse_candles_copy(memoryview(candles_to_copy(candles))), candles)
@@ -0,0 +1,186 @@
+import numpy as np
+
+from jesse.config import reset_config
+from jesse.enums import exchanges, timeframes
+from jesse.modes.optimize_mode.Genetics import Genetics
+from jesse.modes.optimize_mode.SuccessiveHalving import SuccessiveHalving
+from jesse.modes.optimize_mode.TPE import TPE, parzen_log_density
+from jesse.routes import router
+
+
+class FakeOptimizer:
+    """
+    scores DNAs by the sum of their characters so the best candidates are known in advance
+    """
+    charset = 'ABCDEFGHIJ'
+    solution_len = 2
+    cpu_cores = 4
+    individual_log = staticmethod(Genetics.individual_log)
+    evaluate_testing = Genetics.evaluate_testing
+    run_workers = staticmethod(Genetics.run_workers)
+    routes_table_items = staticmethod(Genetics.routes_table_items)
+
+    def __init__(self) -> None:
+        self.population = []
+        self.snapshots = []
+
+    def fitness(self, dna: str, fidelity: float = 1) -> tuple:
+        empty_log = {'win_rate': None, 'total': None, 'net_profit_percentage': None}
+        score = sum(ord(c) for c in dna) / 1000
+        return score, empty_log, None
+
+    def testing(self, dna: str) -> dict:
+        return {'win_rate': 0.5, 'total': len(dna), 'net_profit_percentage': 10}
+
+    def take_snapshot(self, index: int) -> None:
+        self.snapshots.append(index)
+
+
+class SmoothFakeOptimizer(FakeOptimizer):
+    """
+    uses the real charset and scores DNAs by how close they are to 'PaP'
+    """
+    charset = Genetics.__init__.__defaults__[0]
+    solution_len = 3
+
+    def fitness(self, dna: str, fidelity: float = 1) -> tuple:
+        empty_log = {'win_rate': None, 'total': None, 'net_profit_percentage': None}
+        distance = sum(abs(ord(a) - ord(b)) for a, b in zip(dna, 'PaP'))
+        return 1 / (1 + distance), empty_log, None
+
+
+def set_up():
+    reset_config()
+    router.set_routes([(exchanges.SANDBOX, 'BTC-USDT', timeframes.MINUTE_5, 'Test19')])
+
+
+def test_successive_halving_fidelities():
+    set_up()
+
+    assert SuccessiveHalving(FakeOptimizer(), 50).fidelities == [1 / 9, 1 / 3, 1]
+    assert SuccessiveHalving(FakeOptimizer(), 50, rungs=2, eta=2).fidelities == [1 / 2, 1]
+    assert SuccessiveHalving(FakeOptimizer(), 50, rungs=1).fidelities == [1]
+
+
+def test_successive_halving_promotes_the_best_candidates():
+    set_up()
+
+    optimizer = FakeOptimizer()
+    # the charset can only produce 100 unique DNAs, so all of them get evaluated
+    sh = SuccessiveHalving(optimizer, 200)
+    population = sh.run()
+
+    # 100 on the first rung, 33 on the second, 11 on the full window
+    assert sh.total_evaluations == 100 + 33 + 11
+    assert round(sh.full_window_equivalents, 6) == round(100 / 9 + 33 / 3 + 11, 6)
+    assert len(population) == 100
+    assert population[0]['dna'] == 'JJ'
+    assert optimizer.snapshots == [144]
+
+    # the eliminated ones are tagged with the fidelity they were scored on and rank below the finalists
+    assert [p['fidelity'] for p in population] == [1] * 11 + [1 / 3] * 22 + [1 / 9] * 67
+    for fidelity in (1, 1 / 3, 1 / 9):
+        scores = [p['fitness'] for p in population if p['fidelity'] == fidelity]
+        assert scores == sorted(scores, reverse=True)
+
+    # only the finalists are backtested on the testing candles
+    assert all(p['testing_log'] == {'win_rate': 0.5, 'total': 2, 'net_profit_percentage': 10} for p in population[:11])
+    assert all(p['testing_log'] is None for p in population[11:])
+
+
+def test_parzen_log_density_prefers_points_near_the_samples():
+    samples = np.array([[10., 10.], [12., 11.]])
+    points = np.array([[11., 10.], [40., 70.]])
+    densities = parzen_log_density(points, samples, np.array([1., 1.]), 80)
+
+    assert densities[0] > densities[1]
+    # far away from all samples only the uniform prior is left
+    assert round(densities[1], 6) == round(2 * np.log(1 / 80 / 3), 6)
+
+
+def test_tpe_default_budget():
+    set_up()
+
+    tpe = TPE(SmoothFakeOptimizer())
+    assert tpe.trials == 300
+    assert tpe.startup_trials == 10
+
+    # never more than the charset can produce
+    assert TPE(FakeOptimizer(), trials=500).trials == 100
+
+
+def test_tpe_finds_the_best_region_with_few_trials():
+    set_up()
+
+    optimizer = SmoothFakeOptimizer()
+    tpe = TPE(optimizer, trials=60, seed=1)
+    population = tpe.run()
+
+    # out of 512000 possible DNAs
+    assert tpe.total_evaluations == 60
+    assert len(population) == 60
+    assert len({p['dna'] for p in population}) == 60
+    assert population[0]['fitness'] >= 1 / 11
+    assert population == optimizer.population
+    assert optimizer.snapshots == [60]
+
+
+def test_tpe_random_dnas_exclude_the_ones_already_picked():
+    set_up()
+
+    tpe = TPE(FakeOptimizer(), seed=1)
+    tpe.seen = {a + b for a in 'ABCDEFGHIJ' for b in 'ABCDEFGHI'}
+    picked = ['AJ', 'BJ', 'CJ']
+
+    assert sorted(tpe.random_dnas(7, exclude=picked)) == ['DJ', 'EJ', 'FJ', 'GJ', 'HJ', 'IJ', 'JJ']
+
+
+def test_evaluate_testing_skips_the_ones_already_tested():
+    optimizer = FakeOptimizer()
+    tested_log = {'win_rate': 0.1, 'total': 1, 'net_profit_percentage': -5}
+    people = [
+        {'dna': 'AB', 'fitness': 0.2, 'training_log': {}, 'testing_log': None},
+        {'dna': 'CD', 'fitness': 0.1, 'training_log': {}, 'testing_log': tested_log},
+        {'dna': 'AB', 'fitness': 0.2, 'training_log': {}, 'testing_log': None},
+        # scored on a portion of the training candles only
+        {'dna': 'EF', 'fitness': 0.3, 'training_log': {}, 'testing_log': None, 'fidelity': 1 / 3},
+    ]
+
+    optimizer.evaluate_testing(people)
+
+    assert people[0]['testing_log'] == {'win_rate': 0.5, 'total': 2, 'net_profit_percentage': 10}
+    assert people[1]['testing_log'] is tested_log
+    assert people[2]['testing_log'] == people[0]['testing_log']
+    assert people[3]['testing_log'] is None
+
+
+def test_individual_log_of_an_untested_individual():
+    individual = {
+        'dna': 'AB', 'fitness': 0.2, 'testing_log': None,
+        'training_log': {'win_rate': 0.5, 'total': 10, 'net_profit_percentage': 20},
+    }
+
+    assert Genetics.individual_log(individual) == 'win_rate: 0.5, total: 10, net_profit_percentage: 20% || ' \
+                                                  'win_rate: None, total: None, net_profit_percentage: None%'
+
+
+def _append_square(number: int, bucket: list) -> None:
+    bucket.append(number ** 2)
+
+
+def test_run_workers_collects_what_every_process_appends():
+    assert sorted(Genetics.run_workers(_append_square, [(1,), (2,), (3,)])) == [1, 4, 9]
+    assert Genetics.run_workers(_append_square, []) == []
+
+
+def test_study_name():
+    optimizer = FakeOptimizer()
+    optimizer.options = {
+        'strategy_name': 'Test19', 'exchange': 'Sandbox', 'symbol': 'BTC-USDT', 'timeframe': '5m',
+        'start_date': '2019-04-01', 'finish_date': '2019-04-02',
+    }
+    assert Genetics.study_name.fget(optimizer) == 'Test19-Sandbox-BTC-USDT-5m-2019-04-01-2019-04-02'
+
+    # sessions of multiple routes have their own name; the timeframe option stays a valid timeframe
+    optimizer.options['study_name'] = 'Test19-Sandbox-BTC-USDT-5m-and-1-more-2019-04-01-2019-04-02'
+    assert Genetics.study_name.fget(optimizer) == optimizer.options['study_name']
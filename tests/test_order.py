@@ -1,6 +1,8 @@
 import jesse.helpers as jh
+from jesse.config import config
 from jesse.enums import sides, order_statuses
 from jesse.models import Order
+from jesse.models.Order import OrderModel
 from jesse.enums import order_types
 from .utils import set_up
 
@@ -50,3 +52,80 @@ def test_execute_order():
 
     assert order.is_executed is True
     assert order.executed_at == jh.now_to_timestamp()
+
+
+def test_orders_are_slotted():
+    set_up()
+
+    order = Order({
+        'id': jh.generate_unique_id(),
+        'symbol': 'BTC-USDT',
+        'exchange': 'Sandbox',
+        'type': order_types.LIMIT,
+        'price': 129.33,
+        'qty': 10.2041,
+        'side': sides.BUY,
+    })
+
+    assert not hasattr(order, '__dict__')
+    assert order.status == order_statuses.ACTIVE
+    assert order.created_at == jh.now_to_timestamp()
+    assert order.vars == {}
+    assert order.to_dict()['price'] == 129.33
+
+
+def test_orders_ignore_unknown_attributes():
+    set_up()
+
+    # ex: an order rebuilt from a database row or an exchange's payload
+    order = Order({
+        'id': jh.generate_unique_id(),
+        'symbol': 'BTC-USDT',
+        'exchange': 'Sandbox',
+        'type': order_types.LIMIT,
+        'price': 129.33,
+        'qty': 10.2041,
+        'side': sides.BUY,
+        'session_id': jh.generate_unique_id(),
+    }, reduce_only=True)
+
+    assert order.price == 129.33
+    assert not hasattr(order, 'session_id')
+    assert not hasattr(order, 'reduce_only')
+
+
+def test_live_orders_map_onto_the_orders_table():
+    set_up()
+    config['app']['trading_mode'] = 'livetrade'
+    config['env']['notifications'] = {
+        'enable_notifications': False,
+        'events': {
+            'submitted_orders': True, 'cancelled_orders': True, 'executed_orders': True, 'updated_position': True
+        },
+    }
+
+    try:
+        order = Order({
+            'id': jh.generate_unique_id(),
+            'trade_id': jh.generate_unique_id(),
+            'exchange_id': '1234',
+            'symbol': 'BTC-USDT',
+            'exchange': 'Sandbox',
+            'type': order_types.LIMIT,
+            'price': 129.33,
+            'qty': 10.2041,
+            'side': sides.BUY,
+        })
+        order.execute()
+    finally:
+        config['app']['trading_mode'] = 'backtest'
+        del config['env']['notifications']
+
+    # every column of the table can be filled from the in-memory order when it's stored
+    columns = OrderModel._meta.fields
+    assert set(columns) <= set(Order.__slots__)
+    record = OrderModel(**{c: getattr(order, c) for c in columns})
+    assert record.id == order.id
+    assert record.status == order_statuses.EXECUTED
+    assert record.executed_at == order.executed_at
+    assert record.price == 129.33
@@ -7,12 +7,13 @@ import jesse.helpers as jh
 import jesse.services.selectors as selectors
 from jesse import exceptions
 from jesse.config import reset_config
-from jesse.enums import exchanges, timeframes, order_roles, order_types
+from jesse.enums import exchanges, timeframes, order_roles, order_types, route_events
 from jesse.factories import fake_range_candle, fake_range_candle_from_range_prices
 from jesse.models import CompletedTrade
 from jesse.models import Order
 from jesse.modes import backtest_mode
 from jesse.routes import router
+from jesse.services.event_bus import event_bus
 from jesse.store import store
 from jesse.strategies import Strategy
 from tests.data import test_candles_0
@@ -154,6 +155,28 @@ def test_forming_candles():
         1382 / 15)
 
 
+def test_backtest_with_extra_candles_of_a_symbol_that_is_not_traded():
+    routes = [(exchanges.SANDBOX, 'BTC-USDT', timeframes.MINUTE_1, 'Test01')]
+
+    candles = get_btc_and_eth_candles()
+    btc_key = jh.key(exchanges.SANDBOX, 'BTC-USDT')
+
+    set_up(routes)
+    backtest_mode.run('2019-04-01', '2019-04-02', {btc_key: {**candles[btc_key], 'candles': candles[btc_key]['candles'].copy()}})
+    expected = [(t.entry_price, t.exit_price, t.qty) for t in store.completed_trades.trades]
+
+    set_up(routes)
+    router.set_extra_candles([
+        (exchanges.SANDBOX, 'ETH-USDT', timeframes.MINUTE_5)
+    ])
+    store.reset(True)
+    backtest_mode.run('2019-04-01', '2019-04-02', candles)
+
+    assert len(expected)
+    assert [(t.entry_price, t.exit_price, t.qty) for t in store.completed_trades.trades] == expected
+    assert len(store.candles.get_candles(exchanges.SANDBOX, 'ETH-USDT', timeframes.MINUTE_5)) == math.ceil(99 / 5)
+
+
 def test_increasing_position_size_after_opening():
     set_up([
         (exchanges.SANDBOX, 'BTC-USDT', timeframes.MINUTE_1, 'Test16'),
@@ -509,6 +532,35 @@ def test_on_route_stop_loss():
     assert t1.qty == 1
 
 
+def test_route_events_only_reach_the_strategies_that_handle_them():
+    set_up([
+        (exchanges.SANDBOX, 'BTC-USDT', timeframes.MINUTE_1, 'Test25'),
+        (exchanges.SANDBOX, 'ETH-USDT', timeframes.MINUTE_1, 'Test26'),
+    ])
+
+    backtest_mode.run('2019-04-01', '2019-04-02', get_btc_and_eth_candles())
+
+    btc_strategy = router.routes[0].strategy
+    eth_strategy = router.routes[1].strategy
+    assert list(btc_strategy._route_event_handlers()) == [route_events.CLOSE_POSITION]
+    assert list(eth_strategy._route_event_handlers()) == []
+
+    # modifications are only looked for after the placeholders are assigned to
+    btc_strategy._placeholders_changed = False
+    btc_strategy.take_profit = 1, 200
+    assert btc_strategy._placeholders_changed is True
+    assert btc_strategy.take_profit == (1, 200)
+
+    detected = []
+    btc_strategy._detect_and_handle_entry_and_exit_modifications = lambda: detected.append(btc_strategy)
+    eth_strategy._detect_and_handle_entry_and_exit_modifications = lambda: detected.append(eth_strategy)
+    event_bus.publish(route_events.OPEN_POSITION, eth_strategy)
+    assert detected == [btc_strategy]
+    eth_strategy._placeholders_changed = False
+    event_bus.publish(route_events.OPEN_POSITION, btc_strategy)
+    assert detected == [btc_strategy]
+
+
 def test_on_route_take_profit():
     set_up([
         (exchanges.SANDBOX, 'BTC-USDT', timeframes.MINUTE_1, 'Test23'),
@@ -846,6 +898,9 @@ def test_liquidation_in_isolated_mode_for_short_trades():
         leverage_mode='isolated'
     )
 
+    assert store.app.total_liquidations == 1
+    assert store.completed_trades.trades[0].exit_price == 15
+
 
 def test_liquidation_in_isolated_mode_for_long_trades():
     single_route_backtest(
@@ -853,6 +908,9 @@ def test_liquidation_in_isolated_mode_for_long_trades():
         leverage_mode='isolated', trend='down'
     )
 
+    assert store.app.total_liquidations == 1
+    assert store.completed_trades.trades[0].exit_price == 40
+
 
 def test_mark_price():
     single_route_backtest(
@@ -863,7 +921,7 @@ def test_mark_price():
 def test_log_method():
     single_route_backtest('TestLogMethodInStrategyClass')
 
-    assert store.logs.info[1]['message'] == 'test info log'
+    assert store.logs.info[0]['message'] == 'test info log'
     assert store.logs.errors[0]['message'] == 'test error log'
 
 
@@ -0,0 +1,20 @@
+import numpy as np
+
+from jesse.factories import fake_range_candle
+from jesse.libs import PriceTriggerIndex
+
+
+def test_next_low_at_or_below_and_next_high_at_or_above():
+    candles = fake_range_candle(1000)
+    index = PriceTriggerIndex(candles, block_size=16)
+    lows, highs = candles[:, 4], candles[:, 3]
+
+    for start in [0, 5, 15, 16, 17, 500, 999, 1000]:
+        for price in np.percentile(candles[:, 1], [0, 5, 30, 50, 70, 95, 100]):
+            below = np.flatnonzero(lows[start:] <= price)
+            above = np.flatnonzero(highs[start:] >= price)
+            assert index.next_low_at_or_below(start, price) == (start + below[0] if len(below) else 1000)
+            assert index.next_high_at_or_above(start, price) == (start + above[0] if len(above) else 1000)
+
+    assert index.next_low_at_or_below(0, -1) == 1000
+    assert index.next_high_at_or_above(0, np.nan) == 1000
@@ -27,3 +27,32 @@ def test_routes():
     assert set(config['app']['considering_symbols']) == set(['BTC-USD', 'ETH-USD', 'EOS-USD'])
     assert set(config['app']['considering_timeframes']) == set(
         [timeframes.MINUTE_1, timeframes.HOUR_3, timeframes.MINUTE_15, timeframes.HOUR_1])
+
+
+def test_route_handles():
+    router.set_routes([
+        (exchanges.SANDBOX, 'BTC-USD', timeframes.MINUTE_15, 'Test19'),
+    ])
+    router.set_extra_candles([
+        (exchanges.SANDBOX, 'ETH-USD', timeframes.HOUR_1),
+    ])
+    store.reset(True)
+    store.candles.init_storage()
+    store.resolve_route_handles()
+
+    assert router.get_route(exchanges.SANDBOX, 'BTC-USD') is router.routes[0]
+    assert router.get_route(exchanges.SANDBOX, 'ETH-USD') is None
+
+    handle = store.route_handles[(exchanges.SANDBOX, 'BTC-USD')]
+    assert handle.route is router.routes[0]
+    assert handle.position is store.positions.storage['Sandbox-BTC-USD']
+    assert handle.orders is store.orders.get_orders(exchanges.SANDBOX, 'BTC-USD')
+    assert handle.exchange is store.exchanges.storage[exchanges.SANDBOX]
+    assert handle.candles[timeframes.MINUTE_15] is store.candles.get_storage(
+        exchanges.SANDBOX, 'BTC-USD', timeframes.MINUTE_15)
+
+    # the pairs of extra candles only have candles
+    extra_handle = store.route_handles[(exchanges.SANDBOX, 'ETH-USD')]
+    assert extra_handle.route is None
+    assert extra_handle.position is None
+    assert extra_handle.candles['1m'] is store.candles.get_storage(exchanges.SANDBOX, 'ETH-USD', '1m')
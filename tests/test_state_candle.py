@@ -127,3 +127,23 @@ def test_get_forming_candle():
     assert forming_candle[2] == candles_to_add[12][2]
 
 
+
+
+def test_snapshot_and_restore():
+    set_up()
+
+    all_candles = fake_range_candle(15)
+    candles = all_candles[:10]
+    store.candles.batch_add_candle(candles, 'Sandbox', 'BTC-USD', '1m')
+    snapshot = store.candles.snapshot()
+
+    store.candles.batch_add_candle(all_candles[10:], 'Sandbox', 'BTC-USD', '1m')
+    assert len(store.candles.get_candles('Sandbox', 'BTC-USD', '1m')) == 15
+
+    store.candles.restore(snapshot)
+    np.testing.assert_equal(store.candles.get_candles('Sandbox', 'BTC-USD', '1m'), candles)
+
+    # changes after restoring don't touch the snapshot, so it can be restored again
+    store.candles.get_storage('Sandbox', 'BTC-USD', '1m')[-1] = fake_candle()
+    store.candles.restore(snapshot)
+    np.testing.assert_equal(store.candles.get_candles('Sandbox', 'BTC-USD', '1m'), candles)
@@ -1,5 +1,6 @@
 import jesse.helpers as jh
 import jesse.services.logger as logger
+from jesse.config import config
 from jesse.store import store
 
 
@@ -17,13 +18,13 @@ def test_can_log_error_by_firing_event():
     logger.error('first error!!!!!')
     first_logged_error = {'time': jh.now_to_timestamp(), 'message': 'first error!!!!!'}
 
-    assert store.logs.errors == [first_logged_error]
+    assert list(store.logs.errors) == [first_logged_error]
 
     # fire second error event
     logger.error('second error!!!!!')
     second_logged_error = {'time': jh.now_to_timestamp(), 'message': 'second error!!!!!'}
 
-    assert store.logs.errors == [first_logged_error, second_logged_error]
+    assert list(store.logs.errors) == [first_logged_error, second_logged_error]
 
 
 def test_can_log_info_by_firing_event():
@@ -33,7 +34,7 @@ def test_can_log_info_by_firing_event():
     logger.info('first info!!!!!')
     first_logged_info = {'time': jh.now_to_timestamp(), 'message': 'first info!!!!!'}
 
-    assert store.logs.info == [first_logged_info]
+    assert list(store.logs.info) == [first_logged_info]
 
     # fire second info event
     logger.info('second info!!!!!')
@@ -42,4 +43,34 @@ def test_can_log_info_by_firing_event():
         'message': 'second info!!!!!'
     }
 
-    assert store.logs.info == [first_logged_info, second_logged_info]
+    assert list(store.logs.info) == [first_logged_info, second_logged_info]
+
+
+def test_logs_are_kept_in_a_ring_buffer():
+    config['env']['logging']['max_logs'] = 3
+    try:
+        set_up()
+    finally:
+        del config['env']['logging']['max_logs']
+
+    assert store.logs.info.maxlen == 3
+    assert store.logs.errors.maxlen == 3
+
+    for i in range(5):
+        logger.info('info %s', i)
+        logger.error('error %s', i)
+
+    assert [log['message'] for log in store.logs.info] == ['info 2', 'info 3', 'info 4']
+    assert [log['message'] for log in store.logs.errors] == ['error 2', 'error 3', 'error 4']
+
+
+def test_info_logs_are_skipped_when_optimizing():
+    set_up()
+    config['app']['trading_mode'] = 'optimize'
+
+    try:
+        logger.info('%s', 'formatted')
+    finally:
+        config['app']['trading_mode'] = 'backtest'
+
+    assert len(store.logs.info) == 0
@@ -1,5 +1,5 @@
 from jesse.config import config, reset_config
-from jesse.enums import exchanges
+from jesse.enums import exchanges, order_statuses
 from jesse.factories import fake_order
 from jesse.store import store
 
@@ -67,3 +67,30 @@ def test_state_order_get_orders():
     assert store.orders.get_orders(exchanges.SANDBOX,'ETH-USD') == [o1, o2]
 
 
+
+
+def test_state_order_get_active_orders_within():
+    set_up()
+
+    o1 = fake_order({'exchange': exchanges.SANDBOX, 'symbol': 'ETH-USD', 'price': 60})
+    o2 = fake_order({'exchange': exchanges.SANDBOX, 'symbol': 'ETH-USD', 'price': 40})
+    o3 = fake_order({'exchange': exchanges.SANDBOX, 'symbol': 'ETH-USD', 'price': 50})
+    o4 = fake_order({'exchange': exchanges.SANDBOX, 'symbol': 'ETH-USD', 'price': 90})
+    for o in [o1, o2, o3, o4]:
+        store.orders.add_order(o)
+
+    # in the order they were submitted, not by price
+    assert store.orders.get_active_orders_within(exchanges.SANDBOX, 'ETH-USD', 40, 60) == [o1, o2, o3]
+    assert store.orders.get_active_orders_within(exchanges.SANDBOX, 'ETH-USD', 45, 55) == [o3]
+    assert store.orders.get_active_orders_within(exchanges.SANDBOX, 'ETH-USD', 91, 100) == []
+
+    o1.status = order_statuses.EXECUTED
+    o2.status = order_statuses.CANCELED
+    assert store.orders.get_active_orders_within(exchanges.SANDBOX, 'ETH-USD', 0, 100) == [o3, o4]
+    assert store.orders.count_active_orders(exchanges.SANDBOX, 'ETH-USD') == 2
+    # executed and canceled orders are still returned by get_orders()
+    assert store.orders.get_orders(exchanges.SANDBOX, 'ETH-USD') == [o1, o2, o3, o4]
+
+    store.orders.remove_order(o3)
+    assert store.orders.get_active_orders_within(exchanges.SANDBOX, 'ETH-USD', 0, 100) == [o4]
+    assert store.orders.get_order_by_id(exchanges.SANDBOX, 'ETH-USD', o3.id) is None
@@ -0,0 +1,137 @@
+import numpy as np
+import pytest
+
+import jesse.helpers as jh
+from jesse import exceptions
+from jesse.enums import exchanges, timeframes
+from jesse.factories import fake_range_candle, fake_range_candle_from_range_prices
+from jesse.modes import backtest_mode
+from jesse.modes.backtest_mode import _get_fixed_jumped_candle, _get_fixed_jumped_candles
+from jesse.routes import router
+from jesse.services.candle import generate_candle_from_one_minutes, generate_candles_from_one_minutes
+from jesse.store import store
+from jesse.strategies.TestVectorized01 import TestVectorized01
+from tests.data import test_candles_1
+from .utils import set_up
+
+
+def _backtest(strategy_name: str, timeframe: str, candles: np.ndarray, leverage_mode: str = 'cross') -> dict:
+    set_up([(exchanges.SANDBOX, 'ETH-USDT', timeframe, strategy_name)], leverage_mode=leverage_mode)
+
+    backtest_mode.run('2019-04-01', '2019-04-02', {
+        jh.key(exchanges.SANDBOX, 'ETH-USDT'): {
+            'exchange': exchanges.SANDBOX,
+            'symbol': 'ETH-USDT',
+            # the simulator modifies the candles
+            'candles': candles.copy(),
+        }
+    })
+
+    return {
+        'trades': [
+            (
+                t.type, t.entry_price, t.exit_price, t.qty, t.fee, t.opened_at, t.closed_at,
+                t.entry_candle_timestamp, t.exit_candle_timestamp, [(o.type, o.side, o.price) for o in t.orders]
+            ) for t in store.completed_trades.trades
+        ],
+        'balance': store.exchanges.storage[exchanges.SANDBOX].assets['USDT'],
+        'index': router.routes[0].strategy.index,
+    }
+
+
+@pytest.mark.parametrize('strategy_name, timeframe, candles, leverage_mode', [
+    ('01', timeframes.MINUTE_1, fake_range_candle_from_range_prices(range(101, 200)), 'cross'),
+    ('01', timeframes.MINUTE_5, fake_range_candle(5 * 3 * 20), 'cross'),
+    ('02', timeframes.MINUTE_5, fake_range_candle(5 * 3 * 20), 'cross'),
+    ('05', timeframes.MINUTE_1, test_candles_1, 'cross'),
+    ('06', timeframes.MINUTE_5, test_candles_1, 'cross'),
+    ('45', timeframes.MINUTE_1, fake_range_candle_from_range_prices(range(1, 100)), 'isolated'),
+])
+def test_vectorized_strategies_match_event_driven_ones(strategy_name, timeframe, candles, leverage_mode):
+    event_driven = _backtest(f'Test{strategy_name}', timeframe, candles, leverage_mode)
+    vectorized = _backtest(f'TestVectorized{strategy_name}', timeframe, candles, leverage_mode)
+
+    assert len(event_driven['trades'])
+    assert vectorized == event_driven
+
+
+def test_generate_candles_from_one_minutes():
+    candles = fake_range_candle(5 * 3 + 2)
+
+    generated = generate_candles_from_one_minutes(timeframes.MINUTE_5, candles)
+
+    assert generated.shape == (3, 6)
+    for i in range(3):
+        np.testing.assert_equal(
+            generated[i], generate_candle_from_one_minutes(timeframes.MINUTE_5, candles[i * 5:(i + 1) * 5])
+        )
+    assert generate_candles_from_one_minutes(timeframes.MINUTE_5, candles[:4]).shape == (0, 6)
+
+
+def _get_fixed_jumped_candles_one_by_one(candles: np.ndarray) -> np.ndarray:
+    # the way the simulator fixes the candles as it adds them
+    candles = candles.copy()
+    for i in range(1, len(candles)):
+        _get_fixed_jumped_candle(candles[i - 1], candles[i])
+    return candles
+
+
+def test_get_fixed_jumped_candles():
+    candles = fake_range_candle(50)
+
+    np.testing.assert_equal(_get_fixed_jumped_candles(candles), _get_fixed_jumped_candles_one_by_one(candles))
+
+
+def test_get_fixed_jumped_candles_with_gaps():
+    candles = np.array([
+        [0, 100, 101, 102, 99, 1],
+        # opens above the previous close and the low is above it too
+        [60_000, 105, 106, 107, 104, 1],
+        # opens below the previous close and the high is below it too
+        [120_000, 98, 99, 100, 97, 1],
+        # opens at the previous close
+        [180_000, 99, 103, 104, 98, 1],
+        # opens above the previous close but the low is already below it
+        [240_000, 104, 102, 105, 101, 1],
+        # opens below the previous close but the high is already above it
+        [300_000, 100, 101, 103, 99, 1],
+    ], dtype=float)
+
+    fixed = _get_fixed_jumped_candles(candles)
+
+    np.testing.assert_equal(fixed, [
+        [0, 100, 101, 102, 99, 1],
+        [60_000, 101, 106, 107, 101, 1],
+        [120_000, 106, 99, 106, 97, 1],
+        [180_000, 99, 103, 104, 98, 1],
+        [240_000, 103, 102, 105, 101, 1],
+        [300_000, 102, 101, 103, 99, 1],
+    ])
+    # the candles passed in are left alone
+    assert candles[1][1] == 105
+
+    # random gaps in both directions
+    rng = np.random.default_rng(1)
+    closes = 100 + rng.normal(0, 1, 1000).cumsum()
+    opens = np.roll(closes, 1) + rng.choice([-2, 0, 2], 1000)
+    candles = np.column_stack((
+        np.arange(1000) * 60_000, opens, closes,
+        np.maximum(opens, closes) + rng.random(1000), np.minimum(opens, closes) - rng.random(1000), np.ones(1000)
+    ))
+
+    np.testing.assert_equal(_get_fixed_jumped_candles(candles), _get_fixed_jumped_candles_one_by_one(candles))
+
+
+def test_invalid_signals():
+    strategy = TestVectorized01()
+
+    with pytest.raises(exceptions.InvalidStrategy):
+        strategy._validate_signals({'entries': np.zeros(3, dtype=bool)}, 3)
+
+    with pytest.raises(exceptions.InvalidStrategy):
+        strategy._validate_signals({'long_entries': np.zeros(2, dtype=bool)}, 3)
+
+    signals = strategy._validate_signals({'long_entries': [0, 1, 0]}, 3)
+    assert signals['long_entries'].tolist() == [False, True, False]
+    assert not signals['exits'].any()
+    assert np.isnan(signals['stop_loss']).all()